@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for build.py
+
+Times the build stages over generated corpora of several sizes, reports
+throughput and peak memory, appends the results to a local history file and
+fails when a stage is slower than the baseline by more than a threshold.
+
+The baseline is a separate file (bench-baseline.json, or --baseline FILE)
+recorded with --set-baseline on the machine that runs the comparisons; it is
+not tracked, since timings from another machine mean nothing. Without a
+readable baseline the comparison exits 2, so a CI job that lost its baseline
+fails instead of passing unchecked.
+
+Usage:
+    python bench.py                        # Sizes 10, 100, 1000; compare to baseline (required)
+    python bench.py --sizes 100,5000       # Custom corpus sizes
+    python bench.py --set-baseline         # Record this run as the new baseline
+    python bench.py --baseline ci.json     # Compare to (or --set-baseline) another file
+    python bench.py --threshold 0.10       # Fail on >10% slowdowns
+    python bench.py --stages full_build_incremental  # Only some stages
+
+Results are also written to bench_output.txt.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import build
+
+# Configuration
+REPO_DIR = Path(__file__).resolve().parent
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.20  # Fail when a stage's best time grows by more than 20%
+HISTORY_FILE = REPO_DIR / build.CACHE_DIR / "bench-history.json"  # Local trend, not tracked
+BASELINE_FILE = REPO_DIR / "bench-baseline.json"
+OUTPUT_FILE = REPO_DIR / "bench_output.txt"
+MIN_SIGNIFICANT_SECONDS = 0.002  # Differences below this are timer noise, never regressions
+CORPUS_SEED = 1234
+
+WORDS = (
+    "learning reinforcement policy gradient adversarial robust transfer quantum "
+    "lattice boltzmann mesh reconstruction point cloud embedded inference sensor "
+    "aquaculture monitoring language model chatbot education latent generative "
+    "optimization convergence benchmark dataset evaluation architecture sparse"
+).split()
+TAGS = ["Reinforcement Learning", "Computer Vision", "Robotics", "LLM", "TinyML",
+        "Quantum ML", "Adversarial ML", "Optimization", "Education", "3D Vision"]
+AUTHORS = ["Achraf Hsain", "Jane Doe", "John Smith", "Amina Benali", "Li Wei",
+           "Maria Garcia", "Yuki Tanaka", "Omar Haddad"]
+
+
+# =============================================================================
+# Corpus Generation
+# =============================================================================
+
+def generate_paper(rng, number):
+    """Return the markdown source of one synthetic paper."""
+    year = rng.randint(2015, 2025)
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+    authors = rng.sample(AUTHORS, rng.randint(1, 4))
+    tags = rng.sample(TAGS, rng.randint(1, 4))
+    abstract = " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 220)))
+    lines = [
+        "---",
+        f'slug: "bench-paper-{number}"',
+        f'title: "{title}"',
+        "authors:",
+        *[f'  - "{author}"' for author in authors],
+        f'venue: "{rng.choice(["NeurIPS", "ICML", "ICLR", "IEEE Access", "arXiv"])}"',
+        f"year: {year}",
+        f'date: "{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"',
+        f'image: "assets/images/{rng.choice(["advML.png", "QMLCFD.png", "PC3D.png", "LLMChatbot.svg"])}"',
+        f'arxiv: "https://arxiv.org/abs/{year % 100:02d}{rng.randint(1, 12):02d}.{number:05d}"',
+        "tags:",
+        *[f'  - "{tag}"' for tag in tags],
+        f"featured: {'true' if rng.random() < 0.05 else 'false'}",
+        "bibtex: |",
+        f"  @article{{bench{number},",
+        f"    title={{{title}}},",
+        f"    author={{{' and '.join(authors)}}},",
+        f"    year={{{year}}}",
+        "  }",
+        "---",
+        abstract,
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def create_corpus(root, size):
+    """Create a site under root with the repo's pages and assets plus size generated papers."""
+    for name in build.SITE_STATIC_FILES:
+        if (REPO_DIR / name).is_file():
+            shutil.copy2(REPO_DIR / name, root / name)
+    for directory in build.SITE_STATIC_DIRS:
+        if (REPO_DIR / directory).is_dir():
+            shutil.copytree(REPO_DIR / directory, root / directory)
+    shutil.copytree(REPO_DIR / "content" / "projects", root / "content" / "projects")
+    
+    papers_dir = root / "content" / "papers"
+    papers_dir.mkdir(parents=True)
+    rng = random.Random(CORPUS_SEED)
+    for number in range(size):
+        (papers_dir / f"bench-{number:05d}.md").write_text(generate_paper(rng, number), encoding="utf-8")
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+def quiet(fn, *args):
+    """Call fn with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def reset_build_state():
+    """Forget everything build.py keeps in memory between calls."""
+    build.parsed_content_cache.clear()
+    build.image_info_memo.clear()
+    build.paper_terms_memo.clear()
+    build.get_page_header.cache_clear()
+    build.get_page_footer.cache_clear()
+
+
+def full_build(cold):
+    """Run a complete build, optionally from an empty cache."""
+    if cold:
+        shutil.rmtree(build.CACHE_DIR, ignore_errors=True)
+        reset_build_state()
+    args = build.build_arg_parser().parse_args(["--no-budgets"])
+    if quiet(build.run_build, args) != 0:
+        raise RuntimeError("build failed")
+
+
+def make_stages():
+    """Return {name: callable} for the corpus in the current directory."""
+    paths = sorted(Path("content/papers").glob("*.md"))
+    texts = [path.read_text(encoding="utf-8") for path in paths]
+    papers = build.sort_papers(quiet(build.load_content_files, "papers"))
+    bodies = [paper.get("_body", "") for paper in papers]
+    revisions = iter(range(1, 1 << 30))
+    
+    def load():
+        build.parsed_content_cache.clear()
+        build.load_content_files("papers")
+    
+    def incremental_build():
+        # One edited paper: most stages are skipped and the rest only redo that item
+        paths[0].write_text(f"{texts[0]}Revision {next(revisions)}.\n", encoding="utf-8")
+        full_build(cold=False)
+    
+    return {
+        "parse_frontmatter": lambda: [build.parse_frontmatter(text) for text in texts],
+        "load_content_files": load,
+        "sort_papers": lambda: build.sort_papers(papers),
+        "generate_paper_card": lambda: [build.generate_paper_card(paper) for paper in papers],
+        "escape_html": lambda: [build.escape_html(body) for body in bodies],
+        "build_featured_index": lambda: quiet(build.build_featured_index),
+        "full_build_cold": lambda: full_build(cold=True),
+        "full_build_warm": lambda: full_build(cold=False),
+        "full_build_incremental": incremental_build,
+    }
+
+
+def measure(fn, repeat):
+    """Return (median seconds, min seconds, peak traced bytes) for fn."""
+    fn()  # Warm-up, so one-time imports and caches do not skew the first sample
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    
+    # Memory is measured on a separate run: tracing slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), min(times), peak
+
+
+def run_benchmarks(sizes, repeat, stage_names=None):
+    """Benchmark every stage for every corpus size. Returns {size: {stage: result}}."""
+    results = {}
+    original_dir = Path.cwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+            root = Path(tmp)
+            create_corpus(root, size)
+            os.chdir(root)
+            try:
+                reset_build_state()
+                stages = make_stages()
+                results[str(size)] = {}
+                for name, fn in stages.items():
+                    if stage_names and name not in stage_names:
+                        continue
+                    median, fastest, peak = measure(fn, repeat)
+                    results[str(size)][name] = {
+                        "median": median,
+                        "min": fastest,
+                        "items_per_second": size / median if median else None,
+                        "peak_kb": peak / 1024,
+                    }
+                    print(f"  {size:>6} papers  {name:<22} {median * 1000:10.2f} ms")
+            finally:
+                os.chdir(original_dir)
+                reset_build_state()
+    return results
+
+
+# =============================================================================
+# History and Regressions
+# =============================================================================
+
+def load_history(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def load_baseline(path):
+    """Return the baseline run stored at path, or None."""
+    try:
+        baseline = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return baseline if isinstance(baseline, dict) and "results" in baseline else None
+
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(results, baseline, threshold):
+    """Return (size, stage, time, baseline time) for stages slower than the baseline allows.
+    
+    Best-of-N times are compared: they are far less sensitive to a busy machine than medians.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(stage)
+            if not base:
+                continue
+            slower = result["min"] - base["min"]
+            if result["min"] > base["min"] * (1 + threshold) and slower > MIN_SIGNIFICANT_SECONDS:
+                regressions.append((size, stage, result["min"], base["min"]))
+    return regressions
+
+
+def format_report(results, baseline):
+    """Return the results table, with the change against baseline where known."""
+    lines = [f"{'papers':>7}  {'stage':<22} {'min ms':>10} {'median ms':>10} {'items/s':>12} {'peak KB':>10} {'vs base':>8}"]
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            base = (baseline or {}).get("results", {}).get(size, {}).get(stage)
+            change = f"{(result['min'] / base['min'] - 1) * 100:+.1f}%" if base and base["min"] else "-"
+            throughput = f"{result['items_per_second']:.0f}" if result["items_per_second"] else "-"
+            lines.append(
+                f"{size:>7}  {stage:<22} {result['min'] * 1000:10.2f} {result['median'] * 1000:10.2f} {throughput:>12} "
+                f"{result['peak_kb']:10.1f} {change:>8}"
+            )
+    return "\n".join(lines)
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build.py stages")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated corpus sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage")
+    parser.add_argument("--stages", help="Comma-separated stage names to run (default: all)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, e.g. 0.2 for 20%%")
+    parser.add_argument("--history", default=str(HISTORY_FILE), help="JSON history file")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="JSON baseline file to compare against")
+    parser.add_argument("--set-baseline", action="store_true", help="Write this run to the baseline file")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history")
+    args = parser.parse_args()
+    
+    # Time each corpus against its own cache, never a shared $BUILD_CACHE_DIR
+    build.BUILD_CACHE_DIR = build.CACHE_DIR
+    build.BUILD_CACHE = build.BuildCache(build.CACHE_DIR)
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    stage_names = set(args.stages.split(",")) if args.stages else None
+    history = load_history(args.history)
+    baseline = None if args.set_baseline else load_baseline(args.baseline)
+    if baseline is None and not args.set_baseline:
+        print(f"Error: no baseline in {args.baseline}; record one with --set-baseline")
+        sys.exit(2)
+    
+    print("=" * 60)
+    print("build.py benchmarks")
+    print("=" * 60)
+    results = run_benchmarks(sizes, max(1, args.repeat), stage_names)
+    
+    report = format_report(results, baseline)
+    regressions = [] if args.set_baseline else find_regressions(results, baseline, args.threshold)
+    summary = [report, ""]
+    if args.set_baseline:
+        summary.append(f"Recorded as the baseline in {args.baseline}")
+    elif regressions:
+        for size, stage, fastest, base in regressions:
+            summary.append(
+                f"REGRESSION: {stage} at {size} papers: {fastest * 1000:.2f} ms vs baseline "
+                f"{base * 1000:.2f} ms (+{(fastest / base - 1) * 100:.1f}% > {args.threshold * 100:.0f}%)"
+            )
+    else:
+        summary.append(f"No stage slower than baseline by more than {args.threshold * 100:.0f}%")
+    text = "\n".join(summary)
+    print()
+    print(text)
+    OUTPUT_FILE.write_text(text + "\n", encoding="utf-8")
+    
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.set_baseline:
+        build.atomic_write(Path(args.baseline), (json.dumps(run, indent=2) + "\n").encode("utf-8"))
+    if not args.no_save:
+        history.append(run)
+        build.atomic_write(Path(args.history), (json.dumps(history, indent=2) + "\n").encode("utf-8"))
+    
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,39 +2,313 @@
 """
 Static Site Generator for Achraf Hsain's Academic Portfolio
 
-Generates papers.html and projects.html from Markdown content files.
+Generates papers.html, projects.html, per-paper pages (papers/<slug>.html)
+BibTeX files (papers/<slug>.bib, papers.bib) and feeds (papers.json,
+projects.json, feed.xml) from Markdown content files.
 Usage:
     python build.py              # Build all
     python build.py --papers     # Build only papers page
     python build.py --projects   # Build only projects page
+    python build.py --no-cache   # Re-render every card from scratch
+    python build.py --cache-dir /mnt/ci-cache  # Share the build cache between CI runners
+    python build.py --check-budgets  # Only check page-weight budgets
+    python build.py --serve      # Preview from memory on http://127.0.0.1:8000/
+    python build.py --daemon     # Keep content warm; rebuild with --rebuild
+    python build.py --output dist --optimize-css  # Export with purged, inlined CSS
+    python build.py --output dist --self-host-fonts  # Export with subsetted local fonts
+    python build.py --output dist --fingerprint  # Export with hashed assets and _headers
+    python build.py --output dist --svg-sprite  # Export with icons in one SVG sprite
+    python build.py --output dist --service-worker  # Export with an offline cache
+    python build.py --output dist --deployed-manifest live.json  # Delta against a deploy
+    python build.py --output dist --mark-deployed  # After deploying: next delta is against this build
+    python build.py --output dist --archive site.zip  # Also pack it into a reproducible zip
+    python build.py --output dist --cdn-base https://cdn.example.com/  # Assets from a CDN, with SRI
+    python build.py --virtualize # Stream long paper lists in from JSON shards
+    python build.py --catalog    # Read content through the incremental SQLite catalog
+    python build.py --query tag=robotics year=2024  # Query the catalog
+    python build.py --import-bib refs.bib  # Add papers from a BibTeX export
+
+The pipeline can also be used without touching disk:
+    from build import render_site
+    files = render_site()        # {"papers.html": b"...", ...}
 """
 
 import os
 import re
+import json
+import time
+import hashlib
+import heapq
+import math
+import base64
+import collections
+import struct
+import io
+import sys
+import socket
+import asyncio
 import argparse
+import mimetypes
+import shutil
+import posixpath
+import contextlib
+import functools
+import threading
+import socketserver
+import sqlite3
+import traceback
+import unicodedata
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
+from html.parser import HTMLParser
 from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: cache eviction runs without the cross-process lock
+    fcntl = None
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:  # Optional: only needed for --self-host-fonts
+    font_subset = None
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:  # Optional: only needed for blurred image placeholders
+    Image = None
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Optional: vectorized related-paper similarity
+    np = sparse = None
 
 # Configuration
 CONTENT_DIR = Path("content")
 TEMPLATES_DIR = Path("templates")
 OUTPUT_DIR = Path(".")
+CACHE_DIR = Path(".build-cache")
+SOURCE_DIR = Path(".")
+
+# Hand-written site files copied into OUTPUT_DIR when building with --output
+SITE_STATIC_FILES = ["index.html", "about.html", "cv.html", "404.html", "robots.txt", "sitemap.xml"]
+SITE_STATIC_DIRS = ["styles", "scripts", "assets"]
+
+# Bump whenever generate_paper_card/generate_project_card change their markup,
+# so cards rendered by older code are never reused.
+CARD_RENDER_VERSION = 4
+CARD_CACHE_ENABLED = True
+
+# Content-addressed build cache: parsed frontmatter, rendered cards, image
+# metadata, term counts, font subsets and compressed archive entries, each
+# keyed by a hash of its inputs. Entries can never be stale, so CI runners can
+# share one directory (--cache-dir or $BUILD_CACHE_DIR). Least recently used
+# entries are evicted after each build once it grows past BUILD_CACHE_MAX_BYTES
+BUILD_CACHE_DIR = Path(os.environ.get("BUILD_CACHE_DIR", CACHE_DIR))
+BUILD_CACHE_MAX_BYTES = 512 * 1024 * 1024
+BUILD_CACHE_MAX_AGE_DAYS = 30
+BUILD_CACHE_PRUNE_INTERVAL = 3600  # Seconds between eviction passes, which stat every entry
+# The only subdirectories the cache writes to, and so the only ones pruning touches
+BUILD_CACHE_NAMESPACES = ("cards", "deflate", "fonts", "frontmatter", "images", "terms")
+FRONTMATTER_CACHE_VERSION = 3  # Bump whenever parse_frontmatter() output or the cache entries change
+
+# Pipelined file work: reads, renders and writes of per-item files overlap
+# through bounded queues. File I/O runs on a thread pool, because on network
+# filesystems per-file latency, not bandwidth, bounds the build
+PIPELINE_IO_THREADS = 16
+PIPELINE_CHUNK_SIZE = 16  # Items handed to an executor at once
+PIPELINE_QUEUE_SIZE = 8  # Chunks waiting between two steps
+
+# Machine-readable feeds (papers.json, projects.json, feed.xml)
+SITE_URL = "https://achrafhsain7.github.io/"
+SITE_AUTHOR = "Achraf Hsain"
+FEED_PAGE_SIZE = 50
+FEED_MAX_ITEMS = 1000
+ATOM_MAX_ENTRIES = 20
+
+# Page-weight budgets in bytes, checked after every full build. "default"
+# applies to every page; entries under "pages" override it per page.
+# Keys: total, html, css, js, font, image.
+PERFORMANCE_BUDGETS = {
+    "default": {
+        "total": 700 * 1024,
+        "html": 100 * 1024,
+        "css": 80 * 1024,
+        "js": 80 * 1024,
+        "font": 200 * 1024,
+        "image": 500 * 1024,
+    },
+    "pages": {},
+}
+
+# In-memory preview server (python build.py --serve)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+SERVER_RELOAD_INTERVAL = 1.0  # Seconds between checks for changed content files
+
+# CSS optimization (python build.py --output DIR --optimize-css)
+SITE_STYLESHEETS = [
+    "styles/variables.css",
+    "styles/reset.css",
+    "styles/base.css",
+    "styles/layout.css",
+    "styles/components.css",
+    "styles/utilities.css",
+    "styles/animations.css",
+]
+# Classes only ever added by JavaScript, so they never appear in the built HTML
+CSS_SAFELIST = {
+    "is-open", "nav__link--active", "nav__mobile-link--active",  # main.js
+    "is-revealed",  # scroll-reveal.js
+    "typing-cursor", "typing-cursor--blink",  # typing.js
+}
+
+# Self-hosted fonts (python build.py --output DIR --self-host-fonts). Source
+# files are TTF/OTF/WOFF2 under assets/fonts/; "preload" fonts are fetched
+# with <link rel=preload> on every page that uses the family.
+SELF_HOSTED_FONTS = [
+    {"family": "Inter", "weight": 400, "src": "assets/fonts/Inter-Regular.ttf", "preload": True},
+    {"family": "Inter", "weight": 500, "src": "assets/fonts/Inter-Medium.ttf"},
+    {"family": "Inter", "weight": 600, "src": "assets/fonts/Inter-SemiBold.ttf"},
+    {"family": "JetBrains Mono", "weight": 400, "src": "assets/fonts/JetBrainsMono-Regular.ttf"},
+    {"family": "JetBrains Mono", "weight": 500, "src": "assets/fonts/JetBrainsMono-Medium.ttf"},
+    {"family": "JetBrains Mono", "weight": 600, "src": "assets/fonts/JetBrainsMono-SemiBold.ttf"},
+    {"family": "Space Grotesk", "weight": 400, "src": "assets/fonts/SpaceGrotesk-Regular.ttf"},
+    {"family": "Space Grotesk", "weight": 500, "src": "assets/fonts/SpaceGrotesk-Medium.ttf"},
+    {"family": "Space Grotesk", "weight": 600, "src": "assets/fonts/SpaceGrotesk-SemiBold.ttf", "preload": True},
+    {"family": "Space Grotesk", "weight": 700, "src": "assets/fonts/SpaceGrotesk-Bold.ttf"},
+]
+FONT_DISPLAY = "swap"
+
+# Hosting headers, written to OUTPUT_DIR/_headers (Netlify / Cloudflare Pages
+# format) by every --output build. --fingerprint copies the assets pages load
+# to content-hashed names so they can be cached forever.
+HEADERS_FILE = "_headers"
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_CONTROL_HTML = "public, max-age=0, must-revalidate"
+CACHE_CONTROL_DEFAULT = "public, max-age=3600"
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9.]+$")
+
+# Deploy manifest (every --output build): path -> sha256/size of each published
+# file, plus a delta for upload-only-changes deploys against the manifest last
+# recorded with --mark-deployed (once the deploy succeeded) or --deployed-manifest.
+# The delta is read by the deploy step and never published: it goes to --delta
+# FILE, or next to the recorded manifest in CACHE_DIR
+DEPLOY_MANIFEST = "deploy-manifest.json"
+
+# Service worker (python build.py --output DIR --service-worker): precaches the
+# stylesheets, scripts, fonts and icons of these pages, and serves the pages
+# themselves stale-while-revalidate
+SERVICE_WORKER_FILE = "sw.js"
+SERVICE_WORKER_PAGES = ["index.html", "about.html", "papers.html", "projects.html", "cv.html", "404.html"]
+
+# SVG sprite (python build.py --output DIR --svg-sprite): the icons become
+# <symbol>s of one fingerprinted sprite, and inline SVGs matching an icon or
+# repeated across pages become <use> references to it
+SVG_ICONS_DIR = "assets/icons"
+SVG_SPRITE_NAME = "sprite"
+
+# Site archive (python build.py --output DIR --archive FILE): entries in name
+# order with a fixed timestamp, so identical builds give identical bytes.
+# Formats that are already compressed are stored as they are
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ARCHIVE_COMPRESS_LEVEL = 9
+ARCHIVE_STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".woff", ".woff2",
+    ".br", ".gz", ".zip", ".pdf", ".mp4", ".webm",
+}
+SITE_ARCHIVE = None  # SiteArchive fed by the write helpers while a --archive build runs
+
+# Asset CDN (python build.py --output DIR --cdn-base URL): stylesheets, scripts,
+# fonts and images under SITE_STATIC_DIRS load from URL + their path in DIR,
+# and scripts and stylesheets carry Subresource Integrity hashes. Pages, feeds
+# and the service worker stay on the site's own origin
+CDN_BASE_URL = None  # Set by --cdn-base, always ending in "/"
+SRI_ALGORITHM = "sha384"
+
+# Build daemon (python build.py --daemon / --rebuild)
+DAEMON_SOCKET = CACHE_DIR / "build.sock"
+# Options taking a path: --rebuild sends them absolute, as the daemon resolves
+# paths against its own working directory
+DAEMON_PATH_OPTIONS = ("--output", "--archive", "--budgets", "--deployed-manifest", "--delta", "--cache-dir")
+CARD_MEMORY_CACHE = None  # Dict of rendered cards kept in memory by long-lived processes
+CARD_MEMORY_CACHE_MAX_ENTRIES = 50000
+
+# Per-paper detail pages (papers/<slug>.html)
+PAPER_PAGES_DIR = "papers"
+DETAIL_RENDER_VERSION = 3
+BUILD_JOBS = os.cpu_count() or 1
+PARALLEL_MIN_ITEMS = 8
+
+# Related papers on detail pages: TF-IDF cosine similarity over titles, tags
+# and abstracts (vectorized with numpy + scipy when installed). Per-paper term
+# counts are cached in .build-cache/terms/ by content hash
+RELATED_PAPERS_COUNT = 3
+RELATED_MIN_SCORE = 0.05
+RELATED_MAX_DOC_FREQ = 0.5  # Terms in more than half of the papers carry no signal
+RELATED_MAX_TERMS = 32  # Highest-weighted terms kept per paper; keeps the similarity matrix sparse
+RELATED_BLOCK_CELLS = 32_000_000  # Bounds the similarity matrix rows computed at once
+RELATED_MAX_POSTINGS = 500  # Without numpy: papers walked per shared term, heaviest first
+RELATED_TERMS_VERSION = 1
+
+# Card images: intrinsic size and a blurred placeholder (placeholders need
+# Pillow), cached in .build-cache/images/ by file hash
+DEFAULT_CARD_IMAGES = {
+    "paper": "assets/images/papers/paper-placeholder.png",
+    "project": "assets/images/projects/project-placeholder.png",
+}
+IMAGE_INFO_VERSION = 1
+PLACEHOLDER_SIZE = 16  # Longest side of the placeholder in pixels
+
+# Virtualized papers listing (python build.py --virtualize): papers.html holds
+# the first shard of cards, the rest are fetched from cards/ as JSON
+VIRTUAL_LIST_ENABLED = False
+VIRTUAL_LIST_SHARD_SIZE = 50
+VIRTUAL_LIST_DIR = "cards"
+
+# SQLite content catalog (python build.py --catalog / --query), synced
+# incrementally from CONTENT_DIR and kept between runs
+CATALOG_PATH = CACHE_DIR / "catalog.sqlite3"
+CATALOG_SCHEMA_VERSION = 3  # Also bumped when parse_frontmatter() output changes
+CATALOG_KINDS = ("papers", "projects")
+CATALOG = None  # Open ContentCatalog while a --catalog build runs
+FEATURED_MAX_ITEMS = 2  # Featured papers and projects shown on index.html
+
+# BibTeX import (python build.py --import-bib FILE): entries are streamed one
+# at a time, converted in batches on --jobs processes and written by a thread pool
+BIBTEX_MAX_ENTRY_BYTES = 1024 * 1024  # Longer entries are skipped as malformed
+BIBTEX_IMPORT_BATCH = 1000
+BIBTEX_IMPORT_WRITERS = 8
 
 # =============================================================================
 # YAML Frontmatter Parser (no dependencies)
 # =============================================================================
 
+FRONTMATTER_END = re.compile(r"^---[ \t\r]*$", re.M)
+
+
+def block_scalar(lines):
+    """Join the lines of a "key: |" value, removing the indentation of its first line."""
+    indent = next((len(line) - len(line.lstrip(" ")) for line in lines if line.strip()), 0)
+    return "\n".join(line[indent:] if line[:indent].isspace() else line.lstrip(" ") for line in lines)
+
+
 def parse_frontmatter(content):
     """Parse YAML frontmatter from markdown content."""
     if not content.startswith("---"):
         return {}, content
     
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    # Only a line of its own closes the frontmatter: values such as BibTeX
+    # entries may contain "---" (an em dash in LaTeX)
+    end = FRONTMATTER_END.search(content, 3)
+    if not end:
         return {}, content
     
-    frontmatter_str = parts[1].strip()
-    body = parts[2].strip()
+    frontmatter_str = content[3:end.start()].strip()
+    body = content[end.end():].strip()
     
     # Simple YAML parser for our use case
     data = {}
@@ -47,7 +321,7 @@ def parse_frontmatter(content):
         # Handle multiline values (like bibtex)
         if multiline_key:
             if line and not line[0].isspace() and ":" in line:
-                data[multiline_key] = "\n".join(multiline_value)
+                data[multiline_key] = block_scalar(multiline_value)
                 multiline_key = None
                 multiline_value = []
             else:
@@ -110,58 +384,675 @@ def parse_frontmatter(content):
     
     # Handle any remaining multiline value
     if multiline_key:
-        data[multiline_key] = "\n".join(multiline_value)
+        data[multiline_key] = block_scalar(multiline_value)
     
     return data, body
 
 
+# =============================================================================
+# Content-Addressed Build Cache
+# =============================================================================
+
+CACHE_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")  # sha256 hex digests
+CACHE_SHARD_PATTERN = re.compile(r"[0-9a-f]{2}")
+CACHE_TMP_PATTERN = re.compile(r"\.[0-9a-f]{64}\.[0-9a-f]{12}\.tmp")
+
+
+class BuildCache:
+    """Entries stored under root/<namespace>/<key[:2]>/<key>, keyed by content hash.
+    
+    Safe to share between concurrent builds: entries are written under a
+    unique temporary name and renamed into place, so readers see nothing or
+    a complete file, and only one build at a time evicts (under a file lock).
+    Hits and misses are counted per namespace in stats.
+    """
+    
+    def __init__(self, root, max_bytes=BUILD_CACHE_MAX_BYTES, max_age_days=BUILD_CACHE_MAX_AGE_DAYS):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.stats = collections.Counter()  # "<namespace>:hits" / "<namespace>:misses"
+        self.directories = set()  # Shard directories known to exist
+        self.written = 0  # Bytes added by this process since the last eviction pass
+        self.lock = threading.Lock()  # Entries are read and written from pipeline threads
+    
+    def path(self, namespace, key):
+        if namespace not in BUILD_CACHE_NAMESPACES or not CACHE_KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"bad build cache entry {namespace}/{key}")
+        return self.root / namespace / key[:2] / key
+    
+    def own_files(self):
+        """Yield entries and temporary files this cache wrote, skipping anything else in root."""
+        for namespace in BUILD_CACHE_NAMESPACES:
+            for shard in (self.root / namespace).glob("??"):
+                if not CACHE_SHARD_PATTERN.fullmatch(shard.name):
+                    continue
+                try:
+                    paths = list(shard.iterdir())
+                except OSError:
+                    continue
+                for path in paths:
+                    if path.name.startswith(shard.name) and CACHE_KEY_PATTERN.fullmatch(path.name):
+                        yield path
+                    elif CACHE_TMP_PATTERN.fullmatch(path.name) and path.name[1:3] == shard.name:
+                        yield path
+    
+    def get(self, namespace, key):
+        """Return the bytes stored under key, or None."""
+        path = self.path(namespace, key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self.lock:
+                self.stats[f"{namespace}:misses"] += 1
+            return None
+        with self.lock:
+            self.stats[f"{namespace}:hits"] += 1
+        with contextlib.suppress(OSError):
+            os.utime(path)  # Reads count as use, so hot entries survive eviction
+        return data
+    
+    def put(self, namespace, key, data):
+        path = self.path(namespace, key)
+        tmp_path = path.with_name(f".{key}.{os.urandom(6).hex()}.tmp")
+        try:
+            if path.parent not in self.directories:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.directories.add(path.parent)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self.lock:
+                self.written += len(data)
+        except OSError as e:
+            self.directories.discard(path.parent)
+            with contextlib.suppress(OSError):
+                tmp_path.unlink()
+            print(f"  Warning: could not write {namespace} cache entry ({e})")
+    
+    def get_json(self, namespace, key):
+        data = self.get(namespace, key)
+        try:
+            return json.loads(data) if data is not None else None
+        except ValueError:
+            return None
+    
+    def put_json(self, namespace, key, value):
+        self.put(namespace, key, json.dumps(value, sort_keys=True).encode("utf-8"))
+    
+    def prune(self):
+        """Evict entries unused for max_age_days, then least recently used ones down to max_bytes.
+        
+        Runs at most every BUILD_CACHE_PRUNE_INTERVAL seconds across all builds
+        sharing the cache, unless this process alone wrote a tenth of max_bytes.
+        Returns the number of files removed; 0 when skipped or another build is pruning.
+        """
+        stamp = self.root / ".pruned"
+        try:
+            recent = time.time() - stamp.stat().st_mtime < BUILD_CACHE_PRUNE_INTERVAL
+        except OSError:
+            recent = not self.root.is_dir()
+        if recent and self.written < self.max_bytes // 10:
+            return 0
+        with open(self.root / ".lock", "a") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return 0
+            
+            now = time.time()
+            cutoff = now - self.max_age_days * 86400
+            entries = []
+            doomed = []
+            for path in self.own_files():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.name.startswith("."):
+                    # Temporary files this old were left behind by a build that crashed mid-write
+                    if stat.st_mtime < now - 3600:
+                        doomed.append(path)
+                elif stat.st_mtime < cutoff:
+                    doomed.append(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                doomed.append(path)
+                total -= size
+            
+            removed = 0
+            for path in doomed:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                    removed += 1
+            stamp.touch()
+            self.written = 0
+            return removed
+    
+    def summary(self):
+        """Return hit counts per namespace, e.g. "cards 9/10, images 5/5"."""
+        namespaces = sorted({name.partition(":")[0] for name in self.stats})
+        return ", ".join(
+            f"{namespace} {self.stats[f'{namespace}:hits']}/"
+            f"{self.stats[f'{namespace}:hits'] + self.stats[f'{namespace}:misses']}"
+            for namespace in namespaces
+        )
+
+
+BUILD_CACHE = BuildCache(BUILD_CACHE_DIR)
+
+
+# =============================================================================
+# Pipelined File Work
+# =============================================================================
+
+def apply_to_chunk(function, chunk):
+    return [function(item) for item in chunk]
+
+
+async def run_pipeline_async(items, steps, chunk_size, queue_size):
+    loop = asyncio.get_running_loop()
+    queues = [asyncio.Queue(queue_size) for _ in steps]
+    results = [None] * len(items)
+    
+    async def feed():
+        for start in range(0, len(items), chunk_size):
+            await queues[0].put((start, items[start:start + chunk_size]))
+        for _ in range(steps[0][2]):
+            await queues[0].put(None)
+    
+    async def work(position, function, executor):
+        while (entry := await queues[position].get()) is not None:
+            start, chunk = entry
+            if executor is None:
+                chunk = apply_to_chunk(function, chunk)
+            else:
+                chunk = await loop.run_in_executor(executor, apply_to_chunk, function, chunk)
+            if position + 1 < len(steps):
+                await queues[position + 1].put((start, chunk))
+            else:
+                results[start:start + len(chunk)] = chunk
+    
+    async def run_step(position, function, executor, workers):
+        await asyncio.gather(*(work(position, function, executor) for _ in range(workers)))
+        if position + 1 < len(steps):
+            for _ in range(steps[position + 1][2]):
+                await queues[position + 1].put(None)
+    
+    await asyncio.gather(feed(), *(run_step(position, *step) for position, step in enumerate(steps)))
+    return results
+
+
+def run_pipeline(items, *steps, chunk_size=PIPELINE_CHUNK_SIZE, queue_size=PIPELINE_QUEUE_SIZE):
+    """Pass items through steps so that the steps overlap. Returns the last step's results in input order.
+    
+    Each step is (function, executor, workers): `workers` tasks take chunks
+    of items from a bounded queue and map function over them on executor
+    (None runs it on the event loop thread). A chunk moves on as soon as its
+    step is done, so the first writes happen while later files are still
+    being read. Fewer than PARALLEL_MIN_ITEMS items run one after another.
+    
+    Called from inside a running event loop (render_site() in an async
+    server, say), the pipeline gets its own loop on a separate thread.
+    """
+    items = list(items)
+    if len(items) < PARALLEL_MIN_ITEMS:
+        for function, _executor, _workers in steps:
+            items = [function(item) for item in items]
+        return items
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_pipeline_async(items, steps, chunk_size, queue_size))
+    with ThreadPoolExecutor(1) as runner:
+        return runner.submit(asyncio.run, run_pipeline_async(items, steps, chunk_size, queue_size)).result()
+
+
 # =============================================================================
 # Content Loading
 # =============================================================================
 
+# Parsed files keyed by path, reused while size and mtime are unchanged
+parsed_content_cache = {}
+
+
+def read_content_file(file_path):
+    """Return (path, (size, mtime), text), with text None when the parsed copy is current."""
+    stat = file_path.stat()
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = parsed_content_cache.get(file_path)
+    if cached and cached[0] == signature:
+        return file_path, signature, None
+    with open(file_path, "r", encoding="utf-8") as f:
+        return file_path, signature, f.read()
+
+
+def parse_content_file(entry):
+    """Return (path, (size, mtime), (data, body)) for a file read by read_content_file().
+    
+    Parses are looked up in the build cache by the hash of the file's text,
+    so editing one file re-parses only that file. Files whose parsed copy is
+    current pass through with None.
+    """
+    file_path, signature, content = entry
+    if content is None:
+        return entry
+    key = hashlib.sha256(f"{FRONTMATTER_CACHE_VERSION}\0{content}".encode("utf-8")).hexdigest()
+    parsed = BUILD_CACHE.get_json("frontmatter", key)
+    if parsed is None:
+        parsed = parse_frontmatter(content)
+        BUILD_CACHE.put_json("frontmatter", key, parsed)
+    return file_path, signature, parsed
+
+
 def load_content_files(content_type):
-    """Load all markdown files from a content directory."""
+    """Load all markdown files from a content directory.
+    
+    Files are read and parsed concurrently: each chunk is parsed as soon as
+    it has been read, while later files are still being read.
+    """
     content_path = CONTENT_DIR / content_type
     if not content_path.exists():
         print(f"Warning: {content_path} does not exist")
         return []
     
-    items = []
-    for file_path in content_path.glob("*.md"):
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        data, body = parse_frontmatter(content)
-        data["_body"] = body
-        data["_filename"] = file_path.stem
-        items.append(data)
+    paths = list(content_path.glob("*.md"))
+    with ThreadPoolExecutor(PIPELINE_IO_THREADS) as readers:
+        files = run_pipeline(
+            paths,
+            (read_content_file, readers, PIPELINE_IO_THREADS),
+            (parse_content_file, readers, PIPELINE_IO_THREADS),
+        )
+    for file_path, signature, parsed in files:
+        if parsed is not None:
+            data, body = parsed
+            data["_body"] = body
+            data["_filename"] = file_path.stem
+            parsed_content_cache[file_path] = (signature, data)
     
-    return items
+    return [dict(parsed_content_cache[file_path][1]) for file_path in paths]
+
+
+def paper_date(paper):
+    """Return the publication date of a paper, falling back to its year."""
+    if "date" in paper:
+        try:
+            return datetime.strptime(paper["date"], "%Y-%m-%d")
+        except (ValueError, TypeError):
+            pass
+    if "year" in paper:
+        try:
+            return datetime(int(paper["year"]), 1, 1)
+        except (ValueError, TypeError):
+            pass
+    return datetime(1900, 1, 1)
 
 
 def sort_papers(papers):
-    """Sort papers by date (newest first)."""
-    def get_date(paper):
-        if "date" in paper:
-            try:
-                return datetime.strptime(paper["date"], "%Y-%m-%d")
-            except:
-                pass
-        if "year" in paper:
-            return datetime(paper["year"], 1, 1)
-        return datetime(1900, 1, 1)
-    
-    return sorted(papers, key=get_date, reverse=True)
+    """Sort papers by date (newest first), then by slug."""
+    by_slug = sorted(papers, key=lambda paper: (item_slug(paper), paper.get("_filename", "")))
+    return sorted(by_slug, key=paper_date, reverse=True)
 
 
 def sort_projects(projects):
-    """Sort projects by order field, then by title."""
+    """Sort projects by order field, then by title and slug."""
     def get_order(project):
-        return (project.get("order", 999), project.get("title", ""))
+        return (project.get("order", 999), project.get("title", ""), item_slug(project), project.get("_filename", ""))
     
     return sorted(projects, key=get_order)
 
 
+def load_sorted_content(content_type):
+    """Return papers or projects in listing order, from the catalog when one is open."""
+    if CATALOG:
+        return CATALOG.items(content_type)  # Already in listing order
+    items = load_content_files(content_type)
+    return sort_papers(items) if content_type == "papers" else sort_projects(items)
+
+
+def item_slug(item):
+    """Return a filesystem-safe slug for an item, falling back to its filename."""
+    slug = str(item.get("slug") or item.get("_filename", "untitled"))
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", slug).strip("-.") or "untitled"
+
+
+# =============================================================================
+# Content Catalog (SQLite)
+# =============================================================================
+
+CATALOG_SCHEMA = """
+CREATE TABLE items (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    year INTEGER,
+    featured INTEGER NOT NULL,
+    sort_order INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE item_tags (path TEXT NOT NULL, tag TEXT NOT NULL);
+CREATE TABLE item_authors (path TEXT NOT NULL, author TEXT NOT NULL);
+CREATE INDEX items_kind_date ON items (kind, date DESC, slug, path);
+CREATE INDEX items_kind_year ON items (kind, year);
+CREATE INDEX items_kind_featured ON items (kind, featured, date DESC, slug, path);
+CREATE INDEX items_kind_order ON items (kind, sort_order, title, slug, path);
+CREATE INDEX item_tags_tag ON item_tags (tag, path);
+CREATE INDEX item_tags_path ON item_tags (path);
+CREATE INDEX item_authors_author ON item_authors (author, path);
+CREATE INDEX item_authors_path ON item_authors (path);
+"""
+
+# Same orderings as sort_papers() and sort_projects()
+CATALOG_ORDER = {
+    "papers": "items.date DESC, items.slug, items.path",
+    "projects": "items.sort_order, items.title, items.slug, items.path",
+}
+
+
+def as_list(value):
+    """Return a frontmatter value as a list of non-empty strings."""
+    values = value if isinstance(value, list) else [value] if value not in (None, "") else []
+    return [str(v) for v in values if str(v)]
+
+
+class ContentCatalog:
+    """Content items in SQLite, synced from CONTENT_DIR by mtime and hash.
+    
+    Items come back as the same dicts load_content_files() returns, already in
+    listing order; featured, tag, author and year lookups use indexes.
+    """
+    
+    def __init__(self, path=CATALOG_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_SCHEMA_VERSION:
+            with self.db:
+                for table in ("items", "item_tags", "item_authors"):
+                    self.db.execute(f"DROP TABLE IF EXISTS {table}")
+                self.db.executescript(CATALOG_SCHEMA)
+                self.db.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+    
+    def close(self):
+        self.db.close()
+    
+    def sync(self):
+        """Re-read changed content files. Returns (updated, removed, unchanged) counts."""
+        known = {
+            path: (size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in self.db.execute("SELECT path, size, mtime_ns, sha256 FROM items")
+        }
+        seen = set()
+        updated = unchanged = 0
+        with self.db:
+            for kind in CATALOG_KINDS:
+                for file_path in sorted((CONTENT_DIR / kind).glob("*.md")):
+                    path = file_path.as_posix()
+                    seen.add(path)
+                    stat = file_path.stat()
+                    row = known.get(path)
+                    if row and row[:2] == (stat.st_size, stat.st_mtime_ns):
+                        unchanged += 1
+                        continue
+                    raw = file_path.read_bytes()
+                    digest = hashlib.sha256(raw).hexdigest()
+                    if row and row[2] == digest:
+                        # Touched but not edited
+                        self.db.execute(
+                            "UPDATE items SET size = ?, mtime_ns = ? WHERE path = ?",
+                            (stat.st_size, stat.st_mtime_ns, path),
+                        )
+                        unchanged += 1
+                        continue
+                    data, body = parse_frontmatter(raw.decode("utf-8"))
+                    data["_body"] = body
+                    data["_filename"] = file_path.stem
+                    self.store(path, kind, stat, digest, data)
+                    updated += 1
+            
+            removed = known.keys() - seen
+            for path in removed:
+                self.delete(path)
+        return updated, len(removed), unchanged
+    
+    def delete(self, path):
+        for table in ("items", "item_tags", "item_authors"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+    
+    def store(self, path, kind, stat, digest, data):
+        """Insert or replace one parsed item and its tag and author rows."""
+        self.delete(path)
+        try:
+            sort_order = int(data.get("order", 999))
+        except (ValueError, TypeError):
+            sort_order = 999
+        try:
+            year = int(data["year"])
+        except (KeyError, ValueError, TypeError):
+            year = None
+        self.db.execute(
+            "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, kind, stat.st_size, stat.st_mtime_ns, digest, item_slug(data),
+                str(data.get("title", "")), paper_date(data).strftime("%Y-%m-%d"), year,
+                1 if data.get("featured", False) else 0, sort_order, json.dumps(data),
+            ),
+        )
+        self.db.executemany("INSERT INTO item_tags VALUES (?, ?)", [(path, tag) for tag in as_list(data.get("tags"))])
+        self.db.executemany(
+            "INSERT INTO item_authors VALUES (?, ?)", [(path, author) for author in as_list(data.get("authors"))]
+        )
+    
+    def query(self, kind, featured=None, tag=None, author=None, year=None, limit=None):
+        """Return item dicts of a kind in listing order, filtered on indexed columns."""
+        sql = "SELECT items.data FROM items"
+        params = []
+        if tag is not None:
+            sql += " JOIN item_tags ON item_tags.path = items.path AND item_tags.tag = ?"
+            params.append(tag)
+        if author is not None:
+            sql += " JOIN item_authors ON item_authors.path = items.path AND item_authors.author = ?"
+            params.append(author)
+        where = ["items.kind = ?"]
+        params.append(kind)
+        if featured is not None:
+            where.append("items.featured = ?")
+            params.append(1 if featured else 0)
+        if year is not None:
+            where.append("items.year = ?")
+            params.append(int(year))
+        sql += " WHERE " + " AND ".join(where) + " ORDER BY " + CATALOG_ORDER[kind]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [json.loads(data) for (data,) in self.db.execute(sql, params)]
+    
+    def items(self, kind):
+        """Return every item of a kind, already sorted for its listing page."""
+        return self.query(kind)
+    
+    def featured(self, kind, limit=FEATURED_MAX_ITEMS):
+        """Return the top featured items of a kind."""
+        return self.query(kind, featured=True, limit=limit)
+
+
+def run_catalog_query(filters):
+    """Print items matching key=value filters (kind, featured, tag, author, year, limit)."""
+    options = {"kind": "papers"}
+    for spec in filters:
+        key, sep, value = spec.partition("=")
+        if not sep or key not in ("kind", "featured", "tag", "author", "year", "limit"):
+            print(f"Error: bad filter '{spec}' (expected kind=, featured=, tag=, author=, year= or limit=)")
+            return 2
+        options[key] = value
+    kind = options.pop("kind")
+    if kind not in CATALOG_KINDS:
+        print(f"Error: kind must be one of {', '.join(CATALOG_KINDS)}")
+        return 2
+    if "featured" in options:
+        options["featured"] = options["featured"].lower() in ("1", "true", "yes")
+    
+    catalog = ContentCatalog()
+    try:
+        catalog.sync()
+        items = catalog.query(kind, **options)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 2
+    finally:
+        catalog.close()
+    for item in items:
+        date = f"{paper_date(item):%Y-%m-%d}  " if kind == "papers" else ""
+        print(f"{date}{item_slug(item)}  {item.get('title', '')}")
+    print(f"{len(items)} items")
+    return 0
+
+
+# =============================================================================
+# Image Metadata
+# =============================================================================
+
+# Decoded image info keyed by (path, size, mtime), so long-lived processes hash each file once
+image_info_memo = {}
+
+
+def local_source_path(url):
+    """Map a site-relative URL to a file in the source tree, or None for remote or missing files."""
+    if re.match(r"[a-z][a-z0-9+.-]*:|//", url, re.IGNORECASE):
+        return None
+    path = SOURCE_DIR / unquote(url.split("#", 1)[0].split("?", 1)[0]).lstrip("/")
+    return path if path.is_file() else None
+
+
+def read_image_size(data):
+    """Return (width, height) of PNG, GIF, JPEG, WebP or SVG bytes, or None."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", data[6:10])
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                i += 1 if marker == 0xFF else 2
+                continue
+            # Start-of-frame markers (not DHT/JPG/DAC) carry the frame size
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[i + 5:i + 9])
+                return width, height
+            i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+        return None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if chunk == b"VP8X":
+            return 1 + int.from_bytes(data[24:27], "little"), 1 + int.from_bytes(data[27:30], "little")
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        return None
+    
+    root = re.search(rb"<svg\b[^>]*>", data[:4096])
+    if root:
+        attrs = dict(re.findall(rb'\s([\w:-]+)\s*=\s*["\']([^"\']*)["\']', root.group(0)))
+        number = rb"\s*([0-9.]+)(?:px)?\s*$"
+        width = re.match(number, attrs.get(b"width", b""))
+        height = re.match(number, attrs.get(b"height", b""))
+        if width and height:
+            return round(float(width.group(1))), round(float(height.group(1)))
+        view_box = attrs.get(b"viewBox", b"").replace(b",", b" ").split()
+        if len(view_box) == 4:
+            return round(float(view_box[2])), round(float(view_box[3]))
+    return None
+
+
+def image_placeholder(data):
+    """Return a tiny blurred JPEG data: URI for raster image bytes, or None without Pillow.
+    
+    Images with transparency get no placeholder, since it would show through.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+                return None
+            image = image.convert("RGB")
+            image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            image = image.filter(ImageFilter.GaussianBlur(1))
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=50)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def image_info(url):
+    """Return {"width", "height", "placeholder"} for a local image URL, or None.
+    
+    Each distinct file is decoded once; results live in the build cache
+    keyed by the file's hash.
+    """
+    path = local_source_path(url) if url else None
+    if path is None:
+        return None
+    stat = path.stat()
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    if memo_key in image_info_memo:
+        return image_info_memo[memo_key]
+    
+    data = path.read_bytes()
+    key_source = f"{IMAGE_INFO_VERSION}:{Image is not None}:".encode("utf-8") + data
+    key = hashlib.sha256(key_source).hexdigest()
+    info = BUILD_CACHE.get_json("images", key)
+    if info is None:
+        size = read_image_size(data)
+        info = {}
+        if size and all(size):
+            info = {"width": size[0], "height": size[1]}
+            if not data.lstrip().startswith(b"<"):
+                info["placeholder"] = image_placeholder(data)
+        BUILD_CACHE.put_json("images", key, info)
+    
+    info = info or None
+    image_info_memo[memo_key] = info
+    return info
+
+
+def image_attributes(url):
+    """Return width/height and placeholder attributes for an <img>, or "" when unknown."""
+    info = image_info(url)
+    if not info:
+        return ""
+    attributes = f' width="{info["width"]}" height="{info["height"]}"'
+    if info.get("placeholder"):
+        attributes += f' style="background-image:url({info["placeholder"]});background-size:cover"'
+    return attributes
+
+
+def prioritize_first_image(cards_html):
+    """Fetch the first card's image eagerly at high priority; it is usually the largest paint."""
+    return cards_html.replace(' loading="lazy"', ' fetchpriority="high"', 1)
+
+
 # =============================================================================
 # HTML Generation
 # =============================================================================
@@ -193,13 +1084,14 @@ def generate_paper_card(paper):
     if len(paper.get("_body", "")) > 300:
         abstract += "..."
     
-    image = paper.get("image", "assets/images/papers/paper-placeholder.png")
+    image = paper.get("image", DEFAULT_CARD_IMAGES["paper"])
     arxiv = paper.get("arxiv", "")
     pdf = paper.get("pdf", "")
     code = paper.get("code", "")
     bibtex = paper.get("bibtex", "")
     tags = paper.get("tags", [])
     featured = paper.get("featured", False)
+    detail_url = f"{PAPER_PAGES_DIR}/{item_slug(paper)}.html"
     
     # Primary link for the card (arxiv preferred, then pdf)
     primary_link = arxiv or pdf or ""
@@ -221,8 +1113,8 @@ def generate_paper_card(paper):
     if code:
         actions.append(f'<a href="{escape_html(code)}" class="btn btn--ghost btn--sm" target="_blank" rel="noopener noreferrer">Code</a>')
     if bibtex:
-        bibtex_escaped = escape_html(bibtex).replace("\n", "&#10;")
-        actions.append(f'<button class="btn btn--ghost btn--sm bibtex-btn" data-bibtex="{bibtex_escaped}">BibTeX</button>')
+        bib_url = f"{PAPER_PAGES_DIR}/{item_slug(paper)}.bib"
+        actions.append(f'<button class="btn btn--ghost btn--sm bibtex-btn" data-bibtex-src="{escape_html(bib_url)}">BibTeX</button>')
     
     actions_html = ""
     if actions:
@@ -240,9 +1132,9 @@ def generate_paper_card(paper):
     return f'''
             <article class="{card_class}"{data_link_attr}>
               {featured_badge}
-              <img src="{escape_html(image)}" alt="{title} figure" class="paper-card__image" loading="lazy">
+              <img src="{escape_html(image)}" alt="{title} figure" class="paper-card__image"{image_attributes(image)} loading="lazy">
               <div class="paper-card__content">
-                <h3 class="paper-card__title">{title}</h3>
+                <h3 class="paper-card__title"><a href="{escape_html(detail_url)}">{title}</a></h3>
                 <p class="paper-card__authors">{authors_str}</p>
                 <p class="paper-card__venue">{venue} {year}</p>
                 <p class="paper-card__abstract">{abstract}</p>
@@ -256,7 +1148,7 @@ def generate_project_card(project):
     """Generate HTML for a single project card."""
     title = escape_html(project.get("title", "Untitled"))
     description = escape_html(project.get("_body", project.get("description", "")))
-    image = project.get("image", "assets/images/projects/project-placeholder.png")
+    image = project.get("image", DEFAULT_CARD_IMAGES["project"])
     demo = project.get("demo", "")
     github = project.get("github", "")
     tags = project.get("tags", [])
@@ -286,7 +1178,7 @@ def generate_project_card(project):
     return f'''
             <article class="card project-card reveal">
               {featured_badge}
-              <img src="{escape_html(image)}" alt="{title} screenshot" class="project-card__image" loading="lazy">
+              <img src="{escape_html(image)}" alt="{title} screenshot" class="project-card__image"{image_attributes(image)} loading="lazy">
               <h3 class="project-card__title">{title}</h3>
               <p class="project-card__description">{description}</p>
               {tags_html}
@@ -294,10 +1186,113 @@ def generate_project_card(project):
             </article>'''
 
 
+# =============================================================================
+# Rendered Card Cache
+# =============================================================================
+
+card_cache_stats = {"hits": 0, "misses": 0}
+card_cache_lock = threading.Lock()  # Guards the stats while render_cards_cached() runs on threads
+
+
+def item_fingerprint(item):
+    """Return a stable hash of an item's frontmatter and body."""
+    payload = json.dumps(item, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def output_cache_key():
+    """Return a short key for OUTPUT_DIR, so state cached per output directory
+    stays incremental when alternating --output targets."""
+    return hashlib.sha256(str(OUTPUT_DIR.resolve()).encode("utf-8")).hexdigest()[:12]
+
+
+def atomic_write(path, data):
+    """Write bytes to path via a temporary file so readers never see partial output."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    if SITE_ARCHIVE is not None:
+        SITE_ARCHIVE.add(path, data)
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already has that content. Returns True if written."""
+    return write_if_changed_bytes(path, text.encode("utf-8"))
+
+
+def write_if_changed_bytes(path, data):
+    """Write bytes to path unless the file already has that content. Returns True if written."""
+    try:
+        if path.read_bytes() == data:
+            if SITE_ARCHIVE is not None:
+                SITE_ARCHIVE.add(path, data)
+            return False
+    except OSError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+def render_card_cached(kind, item, render, store=None):
+    """Render a card, reusing the on-disk cache when the item is unchanged.
+    
+    Passing a dict as store keeps the cache in memory and never touches disk.
+    """
+    if store is None and not CARD_CACHE_ENABLED:
+        return render(item)
+    
+    # Image metadata is part of the key so replacing an image file re-renders its card
+    image = json.dumps(image_info(item.get("image", DEFAULT_CARD_IMAGES.get(kind, ""))), sort_keys=True)
+    key_source = f"{kind}:{CARD_RENDER_VERSION}:{item_fingerprint(item)}:{image}"
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    if store is None and CARD_MEMORY_CACHE is not None:
+        if len(CARD_MEMORY_CACHE) > CARD_MEMORY_CACHE_MAX_ENTRIES:
+            CARD_MEMORY_CACHE.clear()
+        if key in CARD_MEMORY_CACHE:
+            card_cache_stats["hits"] += 1
+            return CARD_MEMORY_CACHE[key]
+    if store is not None:
+        if key not in store:
+            store[key] = render(item)
+            card_cache_stats["misses"] += 1
+        else:
+            card_cache_stats["hits"] += 1
+        return store[key]
+    
+    cached = BUILD_CACHE.get("cards", key)
+    if cached is not None:
+        html = cached.decode("utf-8")
+    else:
+        html = render(item)
+        BUILD_CACHE.put("cards", key, html.encode("utf-8"))
+    with card_cache_lock:
+        card_cache_stats["hits" if cached is not None else "misses"] += 1
+    
+    if CARD_MEMORY_CACHE is not None:
+        CARD_MEMORY_CACHE[key] = html
+    return html
+
+
+def render_cards_cached(kind, items, render, store=None):
+    """Return render_card_cached() for every item, in order.
+    
+    Cards cached on disk are looked up, rendered and stored on a thread pool,
+    so cache and image reads overlap instead of running one after another.
+    """
+    if store is not None or not CARD_CACHE_ENABLED or CARD_MEMORY_CACHE is not None:
+        return [render_card_cached(kind, item, render, store) for item in items]
+    with ThreadPoolExecutor(PIPELINE_IO_THREADS) as workers:
+        card = functools.partial(render_card_cached, kind, render=render)
+        return run_pipeline(items, (card, workers, PIPELINE_IO_THREADS))
+
+
 # =============================================================================
 # Page Templates
 # =============================================================================
 
+@functools.lru_cache(maxsize=None)
 def get_page_header():
     """Return the common page header HTML."""
     return '''<!DOCTYPE html>
@@ -345,6 +1340,7 @@ def get_page_header():
   
   <!-- Favicon -->
   <link rel="icon" href="assets/images/favicon.png" type="image/png">
+  <link rel="alternate" type="application/atom+xml" title="Publications" href="feed.xml">
   
   <!-- Fonts -->
   <link rel="preconnect" href="https://fonts.googleapis.com">
@@ -356,12 +1352,12 @@ def get_page_header():
   <link rel="stylesheet" href="styles/reset.css?v=6">
   <link rel="stylesheet" href="styles/base.css?v=6">
   <link rel="stylesheet" href="styles/layout.css?v=6">
-  <link rel="stylesheet" href="styles/components.css?v=6">
+  <link rel="stylesheet" href="styles/components.css?v=7">
   <link rel="stylesheet" href="styles/utilities.css?v=6">
   <link rel="stylesheet" href="styles/animations.css?v=6">
   
   <!-- Scripts -->
-  <script src="scripts/main.js?v=6" defer></script>
+  <script src="scripts/main.js?v=9" defer></script>
   <script src="scripts/scroll-reveal.js?v=6" defer></script>
 </head>
 <body>
@@ -435,6 +1431,7 @@ def get_page_header():
     <main>'''
 
 
+@functools.lru_cache(maxsize=None)
 def get_page_footer():
     """Return the common page footer HTML."""
     return '''
@@ -476,76 +1473,1937 @@ def get_page_footer():
 </html>'''
 
 
+def rebase_urls(html, prefix):
+    """Prefix relative href/src URLs so a page can live in a subdirectory."""
+    if not prefix:
+        return html
+    return re.sub(
+        r'(\s(?:href|src|data-bibtex-src)=")(?![a-z][a-z0-9+.-]*:|#|/)',
+        lambda m: m.group(1) + prefix,
+        html,
+    )
+
+
 # =============================================================================
-# Build Functions
+# Related Papers
 # =============================================================================
 
-def build_papers_page():
-    """Build the papers.html page from content files."""
-    print("Building papers.html...")
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9]{2,}")
+STOPWORDS = frozenset("""
+    about also among and are based been being between both but can could each
+    for from has have how into its more most not our over paper propose proposed
+    show such than that the their these this those through using via was were
+    which while with within without
+""".split())
+
+# Term counts keyed by cache key, so long-lived processes tokenize each paper once
+paper_terms_memo = {}
+related_stats = {"cached": 0, "computed": 0}
+related_stats_lock = threading.Lock()  # cached_paper_terms() runs on pipeline threads
+
+
+def paper_terms(paper):
+    """Return {term: count} for a paper; title words and tags count double."""
+    counts = collections.Counter()
+    for field, weight in (("title", 2), ("_body", 1)):
+        for term in TERM_PATTERN.findall(str(paper.get(field, "")).lower()):
+            if term not in STOPWORDS:
+                counts[term] += weight
+    for tag in as_list(paper.get("tags")):
+        counts["tag:" + tag.lower()] += 2
+    return dict(counts)
+
+
+def cached_paper_terms(paper):
+    """Return paper_terms(paper), cached in the build cache by content hash."""
+    key_source = f"{RELATED_TERMS_VERSION}:{item_fingerprint(paper)}"
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    terms = paper_terms_memo.get(key)
+    if terms is None:
+        terms = BUILD_CACHE.get_json("terms", key)
+    status = "cached"
+    if terms is None:
+        terms = paper_terms(paper)
+        BUILD_CACHE.put_json("terms", key, terms)
+        status = "computed"
+    with related_stats_lock:
+        related_stats[status] += 1
     
-    papers = load_content_files("papers")
-    if not papers:
-        print("  No paper content files found in content/papers/")
-        print("  Using placeholder message.")
-        cards_html = '<p class="text-secondary">No publications yet. Check back soon!</p>'
+    if len(paper_terms_memo) > CARD_MEMORY_CACHE_MAX_ENTRIES:
+        paper_terms_memo.clear()
+    paper_terms_memo[key] = terms
+    return terms
+
+
+def tfidf_rows(documents):
+    """Weight term counts by TF-IDF. Returns one {term index: weight} row per document.
+    
+    Rows keep their RELATED_MAX_TERMS heaviest terms and are L2-normalized, so
+    dot products are cosine similarities. Terms that appear in one paper only,
+    or in most of them, are dropped.
+    """
+    doc_freq = collections.Counter()
+    for terms in documents:
+        doc_freq.update(terms.keys())
+    max_freq = max(2, RELATED_MAX_DOC_FREQ * len(documents))
+    vocabulary = sorted(term for term, freq in doc_freq.items() if 2 <= freq <= max_freq)
+    index = {term: i for i, term in enumerate(vocabulary)}
+    idf = [math.log(len(documents) / doc_freq[term]) + 1 for term in vocabulary]
+    
+    rows = []
+    for terms in documents:
+        row = [(idf[index[term]] * (1 + math.log(count)), index[term]) for term, count in terms.items() if term in index]
+        row = heapq.nlargest(RELATED_MAX_TERMS, row)
+        norm = math.sqrt(sum(weight * weight for weight, _ in row)) or 1.0
+        rows.append({i: weight / norm for weight, i in sorted(row, key=lambda pair: pair[1])})
+    return rows, len(vocabulary)
+
+
+def top_similar_sparse(rows, vocabulary_size, count, min_score):
+    """Top-`count` rows scoring at least min_score against each row, as [(score, index), ...] lists.
+    
+    The similarity matrix is computed as sparse products, a block of rows at a
+    time, and each row's best matches are picked with one vectorized sort.
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter((i for row in rows for i in row), dtype=np.int32, count=indptr[-1])
+    weights = np.fromiter((w for row in rows for w in row.values()), dtype=np.float64, count=indptr[-1])
+    matrix = sparse.csr_matrix((weights, indices, indptr), shape=(len(rows), vocabulary_size))
+    transposed = matrix.T.tocsr()
+    
+    n = len(rows)
+    block = max(1, RELATED_BLOCK_CELLS // n)
+    results = []
+    for start in range(0, n, block):
+        scores = (matrix[start:start + block] @ transposed).tocoo()
+        rows_in_block = scores.shape[0]
+        keep = (scores.data >= min_score) & (scores.row + start != scores.col)  # Never related to itself
+        row, col, score = scores.row[keep], scores.col[keep], scores.data[keep]
+        # Best first within each row, ties to the lower index, then the first `count` of each row
+        order = np.lexsort((col, -score, row))
+        row, col, score = row[order], col[order], score[order]
+        row_starts = np.searchsorted(row, np.arange(rows_in_block))
+        rank = np.arange(len(row)) - row_starts[row]
+        top = rank < count
+        row, col, score = row[top], col[top], score[top]
+        bounds = np.searchsorted(row, np.arange(rows_in_block + 1))
+        for i in range(rows_in_block):
+            results.append(list(zip(score[bounds[i]:bounds[i + 1]].tolist(), col[bounds[i]:bounds[i + 1]].tolist())))
+    return results
+
+
+def top_similar_python(rows, count, min_score, max_postings=RELATED_MAX_POSTINGS):
+    """Same as top_similar_sparse() with an inverted index, for installs without numpy.
+    
+    Each term only scores the max_postings papers weighting it most, so a term
+    shared by most papers costs a bounded walk instead of one per pair. Results
+    match top_similar_sparse() until a term is in more papers than that.
+    """
+    postings = collections.defaultdict(list)
+    for doc, row in enumerate(rows):
+        for term, weight in row.items():
+            postings[term].append((doc, weight))
+    for term, entries in postings.items():
+        if len(entries) > max_postings:
+            postings[term] = heapq.nsmallest(max_postings, entries, key=lambda entry: (-entry[1], entry[0]))
+    
+    results = []
+    for doc, row in enumerate(rows):
+        scores = collections.defaultdict(float)
+        for term, weight in row.items():
+            for other, other_weight in postings[term]:
+                scores[other] += weight * other_weight
+        scores.pop(doc, None)
+        matches = ((score, other) for other, score in scores.items() if score >= min_score)
+        results.append(heapq.nlargest(count, matches, key=lambda match: (match[0], -match[1])))
+    return results
+
+
+def related_papers(papers, count=RELATED_PAPERS_COUNT, min_score=RELATED_MIN_SCORE):
+    """Return {slug: [{"slug", "title", "venue", "year"}, ...]} of each paper's closest papers."""
+    if len(papers) < 2 or count < 1:
+        return {}
+    # Term counts are looked up in the build cache concurrently; weighting them needs all of them
+    with ThreadPoolExecutor(PIPELINE_IO_THREADS) as readers:
+        documents = run_pipeline(papers, (cached_paper_terms, readers, PIPELINE_IO_THREADS))
+    rows, vocabulary_size = tfidf_rows(documents)
+    if sparse is not None:
+        similar = top_similar_sparse(rows, vocabulary_size, count, min_score)
     else:
-        papers = sort_papers(papers)
-        cards_html = "\n".join(generate_paper_card(p) for p in papers)
-        print(f"  Found {len(papers)} papers")
+        similar = top_similar_python(rows, count, min_score)
+    
+    related = {}
+    for paper, matches in zip(papers, similar):
+        # Both backends break ties towards the paper listed first
+        related[item_slug(paper)] = [
+            {
+                "slug": item_slug(papers[index]),
+                "title": papers[index].get("title", ""),
+                "venue": papers[index].get("venue", ""),
+                "year": papers[index].get("year", ""),
+            }
+            for _, index in matches
+        ]
+    return related
+
+
+# =============================================================================
+# Paper Detail Pages
+# =============================================================================
+
+def render_paper_detail(paper, related=()):
+    """Render the standalone detail page for a single paper and its related papers."""
+    title = escape_html(paper.get("title", "Untitled"))
+    authors = paper.get("authors", [])
+    if isinstance(authors, list):
+        authors_str = escape_html(", ".join(authors))
+    else:
+        authors_str = escape_html(str(authors))
+    
+    venue = escape_html(paper.get("venue", ""))
+    year = paper.get("year", "")
+    abstract = escape_html(paper.get("_body", ""))
+    image = paper.get("image", DEFAULT_CARD_IMAGES["paper"])
+    bibtex = paper.get("bibtex", "")
+    tags = paper.get("tags", [])
+    
+    tags_html = ""
+    if tags:
+        tags_html = '<div class="paper-card__tags tags">'
+        for tag in tags:
+            tags_html += f'<span class="tag">{escape_html(tag)}</span>'
+        tags_html += '</div>'
+    
+    actions = []
+    for key, label in (("arxiv", "Link"), ("pdf", "PDF"), ("code", "Code")):
+        if paper.get(key):
+            actions.append(f'<a href="{escape_html(paper[key])}" class="btn btn--ghost btn--sm" target="_blank" rel="noopener noreferrer">{label}</a>')
+    if bibtex:
+        bib_url = escape_html(f"{PAPER_PAGES_DIR}/{item_slug(paper)}.bib")
+        actions.append(f'<button class="btn btn--ghost btn--sm bibtex-btn" data-bibtex-src="{bib_url}">Copy BibTeX</button>')
+        actions.append(f'<a href="{bib_url}" class="btn btn--ghost btn--sm" download>Download .bib</a>')
+    actions.append('<a href="papers.html" class="btn btn--ghost btn--sm">All publications</a>')
+    actions_html = '<div class="paper-card__actions">' + "".join(actions) + '</div>'
+    
+    related_html = ""
+    if related:
+        items = "".join(
+            f'''
+            <li class="paper-detail__related-item"><a href="{PAPER_PAGES_DIR}/{escape_html(other["slug"])}.html">{escape_html(other["title"] or "Untitled")}</a> <span class="paper-detail__related-venue">{escape_html(other["venue"])} {other["year"]}</span></li>'''
+            for other in related
+        )
+        related_html = f'''
+          <h2 class="paper-detail__heading">Related papers</h2>
+          <ul class="paper-detail__related">{items}
+          </ul>'''
+    
+    bibtex_html = ""
+    if bibtex:
+        bibtex_html = f'''
+          <h2 class="paper-detail__heading">BibTeX</h2>
+          <pre class="paper-detail__bibtex"><code>{escape_html(bibtex)}</code></pre>'''
     
     page_content = f'''
       <!-- Page Header -->
       <section class="page-header">
         <div class="container">
-          <h1 class="page-title reveal">Publications</h1>
-          <p class="text-secondary reveal">Research papers and preprints</p>
+          <h1 class="page-title reveal">{title}</h1>
+          <p class="paper-card__authors reveal">{authors_str}</p>
+          <p class="paper-card__venue reveal">{venue} {year}</p>
         </div>
       </section>
 
-      <!-- Papers List -->
+      <!-- Paper -->
       <section class="section">
-        <div class="container">
-          <div class="papers-list">
-            {cards_html}
-          </div>
+        <div class="container paper-detail">
+          <img src="{escape_html(image)}" alt="{title} figure" class="paper-detail__image">
+          <h2 class="paper-detail__heading">Abstract</h2>
+          <p class="paper-detail__abstract">{abstract}</p>
+          {tags_html}
+          {actions_html}{related_html}{bibtex_html}
         </div>
       </section>'''
     
-    html = get_page_header()
-    html = html.replace(
+    description = escape_html(paper.get("_body", "")[:155])
+    html = get_page_header().replace(
         '<meta name="author" content="Achraf Hsain">',
-        '<meta name="description" content="Publications by Achraf Hsain - Research papers in machine learning, reinforcement learning, and robotics.">\n  <meta name="author" content="Achraf Hsain">'
+        f'<title>{title} - Achraf Hsain</title>\n  <meta name="description" content="{description}">\n  <meta name="author" content="Achraf Hsain">'
     )
-    html = html.replace('<title>', '<title>Publications - Achraf Hsain</title>\n  <!-- <title>')
-    html = html.replace('</head>', '-->\n</head>')
     html += page_content
     html += get_page_footer()
+    return rebase_urls(html, "../")
+
+
+def render_paper_detail_file(work):
+    path, paper, related = work
+    return path, render_paper_detail(paper, related)
+
+
+def write_text_file(entry):
+    path, text = entry
+    return write_if_changed(path, text)
+
+
+def build_paper_details(papers, jobs=None):
+    """Write papers/<slug>.html for every paper, re-rendering only changed items.
     
-    # Fix the title hack
-    html = html.replace('<title>Publications - Achraf Hsain</title>\n  <!-- <title>', '<title>Publications - Achraf Hsain</title>')
-    html = html.replace('-->\n</head>', '</head>')
+    A page also re-renders when its list of related papers changes, or when
+    the file is no longer the one written here: export post-processing
+    (--optimize-css, --fingerprint, ...) rewrites pages in place and must
+    start again from a freshly rendered page, not one pointing at assets it
+    has since replaced.
+    """
+    print("Building paper detail pages...")
+    jobs = jobs or BUILD_JOBS
+    related_stats.update(cached=0, computed=0)
+    related = related_papers(papers)
+    pages_dir = OUTPUT_DIR / PAPER_PAGES_DIR
+    manifest_path = CACHE_DIR / f"paper-pages-{output_cache_key()}.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
     
-    output_path = OUTPUT_DIR / "papers.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    # Template edits must invalidate every page, not just changed papers
+    template_hash = hashlib.sha256(
+        (get_page_header() + get_page_footer()).encode("utf-8")
+    ).hexdigest()
     
-    print(f"  Written to {output_path}")
+    current = {}
+    pending = []
+    for paper in papers:
+        slug = item_slug(paper)
+        if slug in current:
+            print(f"  Warning: duplicate slug '{slug}', skipping {paper.get('_filename')}")
+            continue
+        related_key = hashlib.sha256(json.dumps(related.get(slug, []), sort_keys=True).encode("utf-8")).hexdigest()
+        fingerprint = f"{DETAIL_RENDER_VERSION}:{template_hash}:{item_fingerprint(paper)}:{related_key}"
+        current[slug] = fingerprint
+        try:
+            stat = (pages_dir / f"{slug}.html").stat()
+        except OSError:
+            pending.append((slug, paper))
+            continue
+        if manifest.get(slug) != [fingerprint, stat.st_size, stat.st_mtime_ns]:
+            pending.append((slug, paper))
+    
+    # Pages are written as soon as they are rendered, while later ones are still rendering
+    work = [(pages_dir / f"{slug}.html", paper, related.get(slug, [])) for slug, paper in pending]
+    with contextlib.ExitStack() as stack:
+        renderers = None
+        if len(pending) >= PARALLEL_MIN_ITEMS and jobs > 1:
+            renderers = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+        writers = stack.enter_context(ThreadPoolExecutor(PIPELINE_IO_THREADS))
+        run_pipeline(
+            work,
+            (render_paper_detail_file, renderers, jobs if renderers else 1),
+            (write_text_file, writers, PIPELINE_IO_THREADS),
+        )
+    
+    removed = 0
+    for slug in manifest.keys() - current.keys():
+        (pages_dir / f"{slug}.html").unlink(missing_ok=True)
+        removed += 1
+    
+    # Record each page as it is on disk now, to notice when something else rewrites it
+    for slug, fingerprint in current.items():
+        stat = (pages_dir / f"{slug}.html").stat()
+        current[slug] = [fingerprint, stat.st_size, stat.st_mtime_ns]
+    atomic_write(manifest_path, json.dumps(current, indent=2, sort_keys=True).encode("utf-8"))
+    print(f"  Detail pages: {len(pending)} rendered, {len(current) - len(pending)} unchanged, {removed} removed")
+    backend = "scipy" if sparse is not None else "python"
+    print(f"  Related papers ({backend}): {related_stats['computed']} term vectors computed, {related_stats['cached']} cached")
 
 
-def build_projects_page():
-    """Build the projects.html page from content files."""
-    print("Building projects.html...")
+def render_bibtex_files(papers):
+    """Return {path: text} for papers/<slug>.bib per paper and the aggregated papers.bib."""
+    files = {}
+    entries = []
+    for paper in papers:
+        bibtex = str(paper.get("bibtex", "")).strip()
+        bib_path = f"{PAPER_PAGES_DIR}/{item_slug(paper)}.bib"
+        if not bibtex or bib_path in files:
+            continue
+        files[bib_path] = bibtex + "\n"
+        entries.append(bibtex)
+    files["papers.bib"] = "\n\n".join(entries) + "\n" if entries else ""
+    return files
+
+
+def build_bibtex_files(papers):
+    """Write papers/<slug>.bib per paper and the aggregated papers.bib, skipping unchanged files."""
+    print("Building BibTeX files...")
+    files = render_bibtex_files(papers)
+    with ThreadPoolExecutor(PIPELINE_IO_THREADS) as writers:
+        written = sum(run_pipeline(
+            ((OUTPUT_DIR / path, text) for path, text in files.items()),
+            (write_text_file, writers, PIPELINE_IO_THREADS),
+        ))
     
-    projects = load_content_files("projects")
-    if not projects:
-        print("  No project content files found in content/projects/")
+    removed = 0
+    pages_dir = OUTPUT_DIR / PAPER_PAGES_DIR
+    if pages_dir.exists():
+        for bib_path in pages_dir.glob("*.bib"):
+            if f"{PAPER_PAGES_DIR}/{bib_path.name}" not in files:
+                bib_path.unlink()
+                removed += 1
+    
+    print(f"  BibTeX files: {written} written, {removed} removed")
+
+
+# =============================================================================
+# JSON and Atom Feeds
+# =============================================================================
+
+def paper_feed_item(paper):
+    """Return the public JSON representation of a paper."""
+    slug = item_slug(paper)
+    item = {
+        "id": f"{SITE_URL}{PAPER_PAGES_DIR}/{slug}.html",
+        "slug": slug,
+        "title": paper.get("title", "Untitled"),
+        "authors": paper.get("authors", []),
+        "venue": paper.get("venue", ""),
+        "year": paper.get("year", ""),
+        "date": paper_date(paper).strftime("%Y-%m-%d"),
+        "url": f"{SITE_URL}{PAPER_PAGES_DIR}/{slug}.html",
+        "abstract": paper.get("_body", ""),
+        "tags": paper.get("tags", []),
+        "featured": bool(paper.get("featured", False)),
+    }
+    for key in ("arxiv", "pdf", "code"):
+        if paper.get(key):
+            item[key] = paper[key]
+    if paper.get("image"):
+        item["image"] = SITE_URL + paper["image"]
+    if paper.get("bibtex"):
+        item["bibtex_url"] = f"{SITE_URL}{PAPER_PAGES_DIR}/{slug}.bib"
+    return item
+
+
+def project_feed_item(project):
+    """Return the public JSON representation of a project."""
+    slug = item_slug(project)
+    item = {
+        "id": f"{SITE_URL}projects.html#{slug}",
+        "slug": slug,
+        "title": project.get("title", "Untitled"),
+        "description": project.get("_body") or project.get("description", ""),
+        "url": f"{SITE_URL}projects.html",
+        "tags": project.get("tags", []),
+        "featured": bool(project.get("featured", False)),
+    }
+    for key in ("demo", "github", "date"):
+        if project.get(key):
+            item[key] = project[key]
+    if project.get("image"):
+        item["image"] = SITE_URL + project["image"]
+    return item
+
+
+def feed_page_name(name, number):
+    """Return the filename of page number of a paged JSON feed."""
+    return f"{name}.json" if number == 1 else f"{name}-{number}.json"
+
+
+def render_json_feed(name, title, items, page_size=FEED_PAGE_SIZE, max_items=FEED_MAX_ITEMS):
+    """Return {filename: text} for <name>.json, <name>-2.json, ... holding at most max_items."""
+    items = items[:max_items]
+    pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+    page_name = lambda number: feed_page_name(name, number)
+    
+    files = {}
+    for number, page_items in enumerate(pages, start=1):
+        feed = {
+            "version": 1,
+            "title": title,
+            "home_page_url": SITE_URL,
+            "feed_url": SITE_URL + page_name(number),
+            "page": number,
+            "pages": len(pages),
+            "total_items": len(items),
+            "items": page_items,
+        }
+        if number < len(pages):
+            feed["next_url"] = SITE_URL + page_name(number + 1)
+        files[page_name(number)] = json.dumps(feed, indent=2, ensure_ascii=False) + "\n"
+    return files
+
+
+def render_atom_feed(papers, max_entries=ATOM_MAX_ENTRIES):
+    """Return feed.xml listing the most recent papers."""
+    entries = []
+    for paper in sort_papers(papers)[:max_entries]:
+        item = paper_feed_item(paper)
+        authors = item["authors"] if isinstance(item["authors"], list) else [item["authors"]]
+        authors_xml = "".join(
+            f"\n    <author><name>{escape_html(author)}</name></author>" for author in authors
+        )
+        categories_xml = "".join(
+            f'\n    <category term="{escape_html(tag)}"/>' for tag in item["tags"]
+        )
+        entries.append(f'''  <entry>
+    <id>{escape_html(item["id"])}</id>
+    <title>{escape_html(item["title"])}</title>
+    <link href="{escape_html(item["url"])}"/>
+    <updated>{item["date"]}T00:00:00Z</updated>{authors_xml}{categories_xml}
+    <summary>{escape_html(item["abstract"])}</summary>
+  </entry>''')
+    
+    # Derive <updated> from content so unchanged catalogs produce identical feeds
+    updated = max((paper_date(p) for p in papers), default=datetime(1900, 1, 1))
+    feed = f'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <id>{SITE_URL}</id>
+  <title>Publications - {SITE_AUTHOR}</title>
+  <link href="{SITE_URL}"/>
+  <link rel="self" href="{SITE_URL}feed.xml"/>
+  <updated>{updated.strftime("%Y-%m-%d")}T00:00:00Z</updated>
+  <author><name>{SITE_AUTHOR}</name></author>
+{chr(10).join(entries)}
+</feed>
+'''
+    return feed
+
+
+# Paged JSON feeds written by render_feeds()
+JSON_FEED_NAMES = ("papers", "projects")
+
+
+def render_feeds(papers, projects):
+    """Return {filename: text} for papers.json, projects.json (and their pages) and feed.xml."""
+    files = render_json_feed("papers", f"Publications - {SITE_AUTHOR}", [paper_feed_item(p) for p in papers])
+    files.update(render_json_feed("projects", f"Projects - {SITE_AUTHOR}", [project_feed_item(p) for p in projects]))
+    files["feed.xml"] = render_atom_feed(papers)
+    return files
+
+
+def build_feeds(papers=None, projects=None):
+    """Write papers.json, projects.json and feed.xml from sorted (or freshly loaded) content."""
+    print("Building feeds...")
+    papers = load_sorted_content("papers") if papers is None else papers
+    projects = load_sorted_content("projects") if projects is None else projects
+    
+    files = render_feeds(papers, projects)
+    written = sum(write_if_changed(OUTPUT_DIR / filename, text) for filename, text in files.items())
+    
+    # Drop pages left over from a larger catalog
+    for name in JSON_FEED_NAMES:
+        number = 2
+        while feed_page_name(name, number) in files:
+            number += 1
+        while (OUTPUT_DIR / feed_page_name(name, number)).exists():
+            (OUTPUT_DIR / feed_page_name(name, number)).unlink()
+            number += 1
+    print(f"  {written} feed files written, others unchanged")
+
+
+# =============================================================================
+# Performance Budgets
+# =============================================================================
+
+ASSET_TYPES = {
+    ".html": "html",
+    ".css": "css",
+    ".js": "js",
+    ".woff2": "font", ".woff": "font", ".ttf": "font", ".otf": "font",
+    ".png": "image", ".jpg": "image", ".jpeg": "image", ".gif": "image",
+    ".svg": "image", ".webp": "image", ".avif": "image", ".ico": "image",
+}
+
+# Resources the browser fetches while loading a page; <a href> is navigation, not weight
+PAGE_RESOURCE_PATTERN = re.compile(r'<(?:link|script|img|source|use)\b[^>]*>', re.IGNORECASE)
+RESOURCE_URL_PATTERN = re.compile(r'\s(?:href|src)="([^"]+)"', re.IGNORECASE)
+NON_FETCHING_LINK_RELS = {"alternate", "canonical", "preconnect", "dns-prefetch", "prefetch", "next", "prev"}
+CSS_URL_PATTERN = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)|@import\s+[\'"]([^\'"]+)[\'"]')
+
+
+def transfer_size(path):
+    """Return the bytes sent for a file, preferring precompressed .br/.gz siblings."""
+    for suffix in (".br", ".gz"):
+        compressed = path.with_name(path.name + suffix)
+        if compressed.exists():
+            return compressed.stat().st_size
+    return path.stat().st_size
+
+
+def resolve_local_url(url, base_dir):
+    """Map a relative URL to a file under OUTPUT_DIR, or None for external/absent targets.
+    
+    URLs under CDN_BASE_URL count as local, since they serve the same files.
+    """
+    if CDN_BASE_URL and url.startswith(CDN_BASE_URL):
+        url = "/" + unquote(url[len(CDN_BASE_URL):])
+    if re.match(r"[a-z][a-z0-9+.-]*:|//|#", url, re.IGNORECASE):
+        return None
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    if not url:
+        return None
+    path = (OUTPUT_DIR / url.lstrip("/")) if url.startswith("/") else (base_dir / url)
+    path = Path(os.path.normpath(path))
+    return path if path.is_file() else None
+
+
+def collect_page_resources(page_path):
+    """Return the set of local files a page loads, following url()/@import in its CSS."""
+    html = page_path.read_text(encoding="utf-8")
+    pending = []
+    for css in re.findall(r"<style[^>]*>(.*?)</style>", html, re.DOTALL):
+        for url, imported in CSS_URL_PATTERN.findall(css):
+            pending.append(resolve_local_url(url or imported, page_path.parent))
+    for tag in PAGE_RESOURCE_PATTERN.findall(html):
+        rel = re.search(r'\srel="([^"]*)"', tag)
+        if rel and set(rel.group(1).lower().split()) & NON_FETCHING_LINK_RELS:
+            continue
+        for url in RESOURCE_URL_PATTERN.findall(tag):
+            pending.append(resolve_local_url(url, page_path.parent))
+    resources = set()
+    while pending:
+        path = pending.pop()
+        if path is None or path in resources or path == page_path:
+            continue
+        resources.add(path)
+        if path.suffix == ".css":
+            css = path.read_text(encoding="utf-8", errors="replace")
+            for url, imported in CSS_URL_PATTERN.findall(css):
+                pending.append(resolve_local_url(url or imported, path.parent))
+    return resources
+
+
+def site_pages():
+    """Return every HTML page of the site, generated and static."""
+    pages = sorted(OUTPUT_DIR.glob("*.html"))
+    pages += sorted((OUTPUT_DIR / PAPER_PAGES_DIR).glob("*.html"))
+    return pages
+
+
+def check_budgets(budgets=PERFORMANCE_BUDGETS):
+    """Measure every page against its budgets. Returns a list of (page, kind, size, limit) violations."""
+    print("Checking performance budgets...")
+    violations = []
+    for page_path in site_pages():
+        page = page_path.relative_to(OUTPUT_DIR).as_posix()
+        limits = dict(budgets.get("default", {}))
+        limits.update(budgets.get("pages", {}).get(page, {}))
+        
+        sizes = {"html": transfer_size(page_path)}
+        for resource in collect_page_resources(page_path):
+            kind = ASSET_TYPES.get(resource.suffix.lower(), "other")
+            sizes[kind] = sizes.get(kind, 0) + transfer_size(resource)
+        sizes["total"] = sum(sizes.values())
+        
+        page_violations = [
+            (page, kind, sizes.get(kind, 0), limit)
+            for kind, limit in limits.items()
+            if sizes.get(kind, 0) > limit
+        ]
+        if page_violations:
+            breakdown = ", ".join(f"{kind} {size / 1024:.1f} KB" for kind, size in sorted(sizes.items()))
+            print(f"  {page}: {breakdown}")
+            for _, kind, size, limit in page_violations:
+                print(f"    OVER BUDGET: {kind} {size / 1024:.1f} KB > {limit / 1024:.1f} KB")
+        violations.extend(page_violations)
+    
+    if not violations:
+        print("  All pages within budget")
+    return violations
+
+
+def load_budgets(path):
+    """Merge a JSON budget file over PERFORMANCE_BUDGETS."""
+    with open(path, "r", encoding="utf-8") as f:
+        overrides = json.load(f)
+    budgets = {
+        "default": {**PERFORMANCE_BUDGETS["default"], **overrides.get("default", {})},
+        "pages": {**PERFORMANCE_BUDGETS["pages"], **overrides.get("pages", {})},
+    }
+    return budgets
+
+
+# =============================================================================
+# Site Export
+# =============================================================================
+
+def output_is_source():
+    """Return True when the build writes into the source tree itself."""
+    return OUTPUT_DIR.resolve() == SOURCE_DIR.resolve()
+
+
+def export_file(source):
+    """Copy one source file into OUTPUT_DIR unless its copy has the same size and mtime."""
+    if not source.is_file():
+        return False
+    dest = OUTPUT_DIR / source.relative_to(SOURCE_DIR)
+    try:
+        stat, dest_stat = source.stat(), dest.stat()
+        if (stat.st_size, stat.st_mtime_ns) == (dest_stat.st_size, dest_stat.st_mtime_ns):
+            return False
+    except OSError:
+        pass
+    atomic_write(dest, source.read_bytes())
+    shutil.copystat(source, dest)
+    return True
+
+
+def export_static_site():
+    """Copy hand-written pages and assets into OUTPUT_DIR, skipping unchanged files."""
+    if output_is_source():
+        return
+    print(f"Exporting static files to {OUTPUT_DIR}...")
+    
+    sources = [SOURCE_DIR / name for name in SITE_STATIC_FILES]
+    for directory in SITE_STATIC_DIRS:
+        sources += sorted(path for path in (SOURCE_DIR / directory).rglob("*") if path.is_file())
+    
+    # Source fonts are published as subsetted WOFF2 by self_host_fonts(), never as-is
+    font_sources = {(SOURCE_DIR / font["src"]).resolve() for font in SELF_HOSTED_FONTS}
+    sources = [source for source in sources if source.resolve() not in font_sources]
+    
+    with ThreadPoolExecutor(PIPELINE_IO_THREADS) as copiers:
+        copied = sum(run_pipeline(sources, (export_file, copiers, PIPELINE_IO_THREADS)))
+    print(f"  {copied} files copied, {len(sources) - copied} unchanged")
+
+
+# =============================================================================
+# CSS Optimization
+# =============================================================================
+
+class UsedSelectorCollector(HTMLParser):
+    """Collect the tags, classes, ids and attribute names a page uses."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+        self.attributes = set()
+    
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            self.attributes.add(name)
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+    
+    handle_startendtag = handle_starttag
+
+
+def collect_used_selectors(*html_fragments):
+    """Return the tags, classes, ids and attributes used across HTML fragments."""
+    collector = UsedSelectorCollector()
+    for html in html_fragments:
+        collector.feed(html)
+    collector.close()
+    collector.tags.update({"html", "body", "head"})
+    collector.classes.update(CSS_SAFELIST)
+    return collector
+
+
+def strip_css_comments(css):
+    """Remove /* ... */ comments from CSS."""
+    return re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+
+
+def parse_css_rules(css):
+    """Split CSS into a list of (prelude, body) blocks and (statement, None) at-rules.
+    
+    Bodies of @media/@supports blocks are parsed recursively by purge_css.
+    """
+    css = strip_css_comments(css)
+    rules = []
+    i = 0
+    length = len(css)
+    while i < length:
+        # Scan the prelude up to "{" or a ";" ending a statement at-rule
+        j = i
+        quote = None
+        while j < length:
+            char = css[j]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char in "{;":
+                break
+            j += 1
+        prelude = css[i:j].strip()
+        if j >= length:
+            break
+        if css[j] == ";":
+            if prelude:
+                rules.append((prelude + ";", None))
+            i = j + 1
+            continue
+        
+        # Find the matching closing brace
+        depth = 1
+        k = j + 1
+        quote = None
+        while k < length and depth:
+            char = css[k]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            k += 1
+        rules.append((prelude, css[j + 1:k - 1]))
+        i = k
+    return rules
+
+
+def split_selector_list(selectors):
+    """Split a selector list on top-level commas."""
+    parts = []
+    depth = 0
+    current = ""
+    for char in selectors:
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def selector_is_used(selector, used):
+    """Return True if every class, id, tag and attribute in selector occurs on the page.
+    
+    Pseudo-classes and their arguments are ignored, so :not()/:is() never cause a drop.
+    """
+    # Drop pseudo-elements/classes (with any parenthesised arguments)
+    plain = re.sub(r"::?[a-zA-Z-]+(\((?:[^()]|\([^()]*\))*\))?", " ", selector)
+    attributes = re.findall(r"\[\s*([a-zA-Z_:][-\w:.]*)", plain)
+    plain = re.sub(r"\[[^\]]*\]", " ", plain)
+    
+    if any(name not in used.attributes for name in attributes):
+        return False
+    if any(name not in used.classes for name in re.findall(r"\.(-?[_a-zA-Z][-\w]*)", plain)):
+        return False
+    if any(name not in used.ids for name in re.findall(r"#(-?[_a-zA-Z][-\w]*)", plain)):
+        return False
+    
+    tags = re.findall(r"(?:^|[\s>+~(])([a-zA-Z][a-zA-Z0-9-]*)", plain)
+    return all(tag.lower() in used.tags for tag in tags)
+
+
+def purge_css(css, used):
+    """Return css without the rules whose selectors match nothing in used."""
+    out = []
+    keyframes = []
+    for prelude, body in parse_css_rules(css):
+        if body is None:
+            out.append(prelude)
+        elif prelude.startswith("@"):
+            name = prelude.split(None, 1)[0].lower()
+            if name in ("@media", "@supports", "@layer", "@container"):
+                inner = purge_css(body, used)
+                if inner.strip():
+                    out.append(f"{prelude}{{{inner}}}")
+            elif name.endswith("keyframes"):
+                keyframes.append((prelude, body))
+            else:
+                out.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [sel for sel in split_selector_list(prelude) if selector_is_used(sel, used)]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+    
+    # Keep only animations that a surviving rule still refers to
+    kept = "".join(out)
+    for prelude, body in keyframes:
+        parts = prelude.split(None, 1)
+        if len(parts) == 2 and re.search(r"[\s:,]" + re.escape(parts[1].strip()) + r"\b", kept):
+            out.append(f"{prelude}{{{body}}}")
+    return "".join(out)
+
+
+def minify_css(css):
+    """Collapse whitespace in CSS without changing its meaning."""
+    css = strip_css_comments(css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def above_the_fold(html):
+    """Return the part of a page's body that is visible before scrolling.
+    
+    Approximated as everything up to the end of the first section in <main>
+    (the hero or page header), which covers the nav on every page.
+    """
+    body_start = html.find("<body")
+    main_start = html.find("<main", body_start)
+    if main_start == -1:
+        return html[body_start:body_start + 8000]
+    section_end = html.find("</section>", main_start)
+    if section_end == -1:
+        return html[body_start:main_start + 8000]
+    return html[body_start:section_end + len("</section>")]
+
+
+def optimize_css(pages=None):
+    """Write a purged site stylesheet and inline each page's critical CSS into its <head>."""
+    print("Optimizing CSS...")
+    pages = pages if pages is not None else site_pages()
+    stylesheet_paths = [OUTPUT_DIR / path for path in SITE_STYLESHEETS]
+    full_css = "\n".join(path.read_text(encoding="utf-8") for path in stylesheet_paths if path.exists())
+    htmls = {page: page.read_text(encoding="utf-8") for page in pages}
+    
+    site_css = minify_css(purge_css(full_css, collect_used_selectors(*htmls.values())))
+    digest = hashlib.sha256(site_css.encode("utf-8")).hexdigest()[:10]
+    site_css_path = OUTPUT_DIR / "styles" / f"site.{digest}.css"
+    write_if_changed(site_css_path, site_css)
+    for stale in (OUTPUT_DIR / "styles").glob("site.*.css"):
+        if stale != site_css_path:
+            stale.unlink()
+    
+    local_stylesheets = set(SITE_STYLESHEETS)
+    link_pattern = re.compile(r'[ \t]*<link rel="stylesheet" href="([^"]+)"[^>]*>\n?')
+    for page, html in htmls.items():
+        prefix = posixpath.relpath(".", page.parent.relative_to(OUTPUT_DIR).as_posix())
+        prefix = "" if prefix == "." else prefix + "/"
+        
+        def is_local(match):
+            href = match.group(1).split("?", 1)[0]
+            return href.startswith(prefix) and href[len(prefix):] in local_stylesheets
+        
+        links = [m for m in link_pattern.finditer(html) if is_local(m)]
+        if not links:
+            continue
+        
+        critical = minify_css(purge_css(full_css, collect_used_selectors(above_the_fold(html))))
+        href = f"{prefix}styles/{site_css_path.name}"
+        replacement = (
+            f"  <style>{critical}</style>\n"
+            f'  <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'  <noscript><link rel="stylesheet" href="{href}"></noscript>\n'
+        )
+        for match in reversed(links[1:]):
+            html = html[:match.start()] + html[match.end():]
+        html = html[:links[0].start()] + replacement + html[links[0].end():]
+        write_if_changed(page, html)
+    
+    print(f"  {site_css_path.relative_to(OUTPUT_DIR)}: {len(full_css) / 1024:.1f} KB -> {len(site_css) / 1024:.1f} KB for {len(htmls)} pages")
+
+
+# =============================================================================
+# Self-Hosted Fonts
+# =============================================================================
+
+GOOGLE_FONTS_PATTERN = re.compile(
+    r'[ \t]*<link rel="preconnect" href="https://fonts\.(?:googleapis|gstatic)\.com"[^>]*>\n'
+    r'|[ \t]*<link href="https://fonts\.googleapis\.com/css2\?([^"]*)" rel="stylesheet">\n?'
+)
+
+
+class TextCollector(HTMLParser):
+    """Collect the visible text of a page (everything outside <script>/<style>)."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chars = set()
+        self.skip = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self.skip += 1
+        for name, value in attrs:
+            if name in ("alt", "title", "placeholder", "value", "aria-label") and value:
+                self.chars.update(value)
+    
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self.skip:
+            self.skip -= 1
+    
+    def handle_data(self, data):
+        if not self.skip:
+            self.chars.update(data)
+
+
+def collect_site_text(pages):
+    """Return every character the site can display, as a sorted string."""
+    collector = TextCollector()
+    for page in pages:
+        collector.feed(page.read_text(encoding="utf-8"))
+    chars = collector.chars
+    # Printable ASCII is always kept: scripts such as typing.js write text at runtime
+    chars.update(chr(code) for code in range(0x20, 0x7F))
+    for script in sorted((OUTPUT_DIR / "scripts").glob("*.js")):
+        chars.update(char for char in script.read_text(encoding="utf-8") if ord(char) > 0x7F)
+    return "".join(sorted(char for char in chars if char.isprintable()))
+
+
+def subset_font(src, text):
+    """Return WOFF2 bytes of src reduced to the glyphs needed for text, via the cache."""
+    key_source = hashlib.sha256(src.read_bytes()).hexdigest() + hashlib.sha256(text.encode("utf-8")).hexdigest()
+    key = hashlib.sha256(key_source.encode()).hexdigest()
+    cached = BUILD_CACHE.get("fonts", key)
+    if cached is not None:
+        return cached
+    
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    font = font_subset.load_font(str(src), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font_subset.save_font(font, buffer, options)
+    data = buffer.getvalue()
+    BUILD_CACHE.put("fonts", key, data)
+    return data
+
+
+def font_setup_error():
+    """Return why --self-host-fonts cannot run here, or None when it can."""
+    if font_subset is None:
+        return "--self-host-fonts needs fontTools (pip install fonttools brotli)"
+    missing = [font["src"] for font in SELF_HOSTED_FONTS if not (SOURCE_DIR / font["src"]).is_file()]
+    if missing:
+        return (f"--self-host-fonts needs the font files listed in SELF_HOSTED_FONTS; "
+                f"missing {', '.join(missing)}")
+    return None
+
+
+def self_host_fonts(pages=None):
+    """Replace the Google Fonts stylesheet with subsetted, self-hosted WOFF2 files."""
+    print("Self-hosting fonts...")
+    error = font_setup_error()
+    if error:
+        raise ValueError(error)
+    
+    pages = pages if pages is not None else site_pages()
+    text = collect_site_text(pages)
+    fonts_dir = OUTPUT_DIR / "assets" / "fonts"
+    
+    faces = []
+    for font in SELF_HOSTED_FONTS:
+        data = subset_font(SOURCE_DIR / font["src"], text)
+        name = f"{Path(font['src']).stem}.{hashlib.sha256(data).hexdigest()[:10]}.woff2"
+        write_if_changed_bytes(fonts_dir / name, data)
+        faces.append((font, f"assets/fonts/{name}"))
+    
+    kept = {path for _, path in faces}
+    for stale in fonts_dir.glob("*.woff2"):
+        if f"assets/fonts/{stale.name}" not in kept:
+            stale.unlink()
+    
+    rewritten = 0
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        requested = [m.group(1) for m in GOOGLE_FONTS_PATTERN.finditer(html) if m.group(1)]
+        if not requested:
+            continue
+        families = {unquote(f.split(":", 1)[0]).replace("+", " ") for f in re.findall(r"family=([^&]+)", requested[0])}
+        
+        prefix = posixpath.relpath(".", page.parent.relative_to(OUTPUT_DIR).as_posix())
+        prefix = "" if prefix == "." else prefix + "/"
+        preloads = []
+        rules = []
+        for font, path in faces:
+            if font["family"] not in families:
+                continue
+            rules.append(
+                f"@font-face{{font-family:'{font['family']}';font-style:{font.get('style', 'normal')};"
+                f"font-weight:{font['weight']};font-display:{FONT_DISPLAY};"
+                f"src:url({prefix}{path}) format('woff2')}}"
+            )
+            if font.get("preload"):
+                preloads.append(f'  <link rel="preload" href="{prefix}{path}" as="font" type="font/woff2" crossorigin>\n')
+        
+        head = "".join(preloads) + f"  <style>{''.join(rules)}</style>\n"
+        first = GOOGLE_FONTS_PATTERN.search(html)
+        html = html[:first.start()] + head + GOOGLE_FONTS_PATTERN.sub("", html[first.start():])
+        rewritten += write_if_changed(page, html)
+    
+    total = sum((fonts_dir / Path(path).name).stat().st_size for _, path in faces)
+    print(f"  {len(faces)} fonts subset to {len(text)} characters ({total / 1024:.1f} KB), {rewritten} pages rewritten")
+
+
+# =============================================================================
+# SVG Sprite
+# =============================================================================
+
+INLINE_SVG_PATTERN = re.compile(r"<svg\b([^>]*)>(.*?)</svg>", re.DOTALL | re.IGNORECASE)
+SVG_VIEWBOX_PATTERN = re.compile(r'\sviewBox="([^"]*)"')
+
+
+def minify_svg_markup(markup):
+    """Drop comments and collapse whitespace in SVG markup."""
+    markup = re.sub(r"<!--.*?-->", "", markup, flags=re.DOTALL)
+    return re.sub(r">\s+<", "><", " ".join(markup.split())).strip()
+
+
+def build_svg_sprite(pages=None):
+    """Combine the icons into one fingerprinted sprite and point inline SVGs at it.
+    
+    An inline SVG is replaced when its contents match an icon file or appear
+    more than once across the pages. The <svg> element keeps its own size,
+    class and stroke/fill attributes, so icons render exactly as before.
+    """
+    print("Building SVG sprite...")
+    pages = pages if pages is not None else site_pages()
+    icons_dir = OUTPUT_DIR / SVG_ICONS_DIR
+    
+    # Minified contents -> (symbol id, viewBox)
+    symbols = {}
+    for path in sorted(icons_dir.glob("*.svg")):
+        match = INLINE_SVG_PATTERN.search(path.read_text(encoding="utf-8"))
+        viewbox = SVG_VIEWBOX_PATTERN.search(match.group(1)) if match else None
+        if viewbox and not is_fingerprinted(path):
+            symbols.setdefault(minify_svg_markup(match.group(2)), (f"icon-{path.stem}", viewbox.group(1)))
+    
+    htmls = {page: page.read_text(encoding="utf-8") for page in pages}
+    repeated = collections.Counter()
+    for html in htmls.values():
+        for match in INLINE_SVG_PATTERN.finditer(html):
+            viewbox = SVG_VIEWBOX_PATTERN.search(match.group(1))
+            if viewbox:
+                repeated[(minify_svg_markup(match.group(2)), viewbox.group(1))] += 1
+    for (inner, viewbox), count in sorted(repeated.items()):
+        if count > 1 and inner not in symbols:
+            symbols[inner] = (f"icon-{hashlib.sha256(inner.encode('utf-8')).hexdigest()[:8]}", viewbox)
+    
+    body = "".join(
+        f'<symbol id="{symbol_id}" viewBox="{viewbox}">{inner}</symbol>'
+        for inner, (symbol_id, viewbox) in sorted(symbols.items(), key=lambda item: item[1][0])
+    )
+    sprite = f'<svg xmlns="http://www.w3.org/2000/svg">{body}</svg>\n'
+    digest = hashlib.sha256(sprite.encode("utf-8")).hexdigest()[:10]
+    sprite_path = icons_dir / f"{SVG_SPRITE_NAME}.{digest}.svg"
+    write_if_changed(sprite_path, sprite)
+    for stale in icons_dir.glob(f"{SVG_SPRITE_NAME}.*.svg"):
+        if stale != sprite_path:
+            stale.unlink()
+    
+    replaced = rewritten = 0
+    for page, html in htmls.items():
+        href = posixpath.relpath(sprite_path.relative_to(OUTPUT_DIR).as_posix(), page.parent.relative_to(OUTPUT_DIR).as_posix())
+        
+        def use_symbol(match):
+            nonlocal replaced
+            symbol = symbols.get(minify_svg_markup(match.group(2)))
+            if symbol is None:
+                return match.group(0)
+            replaced += 1
+            return f'<svg{match.group(1)}><use href="{href}#{symbol[0]}"></use></svg>'
+        
+        rewritten += write_if_changed(page, INLINE_SVG_PATTERN.sub(use_symbol, html))
+    print(f"  {sprite_path.relative_to(OUTPUT_DIR)}: {len(symbols)} symbols, {replaced} inline SVGs replaced in {rewritten} pages")
+
+
+# =============================================================================
+# Asset Fingerprinting and Hosting Headers
+# =============================================================================
+
+def is_fingerprinted(path):
+    """Return True for files named <stem>.<10 hex digits>.<ext>."""
+    return bool(FINGERPRINT_PATTERN.search(Path(path).name))
+
+
+def fingerprinted_url(url, base_dir, mapping):
+    """Return url pointing at the fingerprinted copy of its target, or url unchanged."""
+    target = mapping.get(resolve_local_url(url, base_dir))
+    if target is None:
+        return url
+    path = target.relative_to(OUTPUT_DIR).as_posix()
+    if url.startswith("/"):
+        return "/" + path
+    return posixpath.relpath(path, base_dir.relative_to(OUTPUT_DIR).as_posix())
+
+
+def rewrite_css_urls(css, base_dir, mapping):
+    """Point the url()/@import references of a stylesheet at fingerprinted copies."""
+    def replace(match):
+        url = match.group(1) or match.group(2)
+        return match.group(0).replace(url, fingerprinted_url(url, base_dir, mapping))
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def rewrite_page_urls(html, base_dir, mapping):
+    """Point a page's resource tags and inline styles at fingerprinted copies."""
+    def replace_tag(match):
+        tag = match.group(0)
+        for url in RESOURCE_URL_PATTERN.findall(tag):
+            tag = tag.replace(f'"{url}"', f'"{fingerprinted_url(url, base_dir, mapping)}"')
+        return tag
+    
+    html = PAGE_RESOURCE_PATTERN.sub(replace_tag, html)
+    return re.sub(
+        r"(<style[^>]*>)(.*?)(</style>)",
+        lambda m: m.group(1) + rewrite_css_urls(m.group(2), base_dir, mapping) + m.group(3),
+        html, flags=re.DOTALL,
+    )
+
+
+def fingerprint_assets(pages=None):
+    """Copy every asset the pages load to a content-hashed name and point the pages at it.
+    
+    Originals stay in place for links from outside the site; only the copies
+    are referenced by the built pages and cached as immutable.
+    """
+    print("Fingerprinting assets...")
+    pages = pages if pages is not None else site_pages()
+    static_dirs = [Path(os.path.normpath(OUTPUT_DIR / directory)) for directory in SITE_STATIC_DIRS]
+    resources = set()
+    for page in pages:
+        resources |= collect_page_resources(page)
+    # Stylesheets go last so their url()s can point at already hashed images and fonts
+    sources = sorted(
+        (path for path in resources
+         if not is_fingerprinted(path) and any(directory in path.parents for directory in static_dirs)),
+        key=lambda path: (path.suffix == ".css", path.as_posix()),
+    )
+    
+    mapping = {}
+    for source in sources:
+        data = source.read_bytes()
+        if source.suffix == ".css":
+            data = rewrite_css_urls(data.decode("utf-8"), source.parent, mapping).encode("utf-8")
+        target = source.with_name(f"{source.stem}.{hashlib.sha256(data).hexdigest()[:10]}{source.suffix}")
+        write_if_changed_bytes(target, data)
+        mapping[source] = target
+    
+    # Drop copies of earlier versions; generated files without an original (site.*.css, fonts) are left alone
+    kept = set(mapping.values())
+    stale = 0
+    for directory in static_dirs:
+        for path in sorted(directory.rglob("*")):
+            match = FINGERPRINT_PATTERN.search(path.name)
+            if not match or path in kept:
+                continue
+            original = path.with_name(path.name[:match.start()] + path.name[match.start() + 11:])
+            if original.is_file():
+                path.unlink()
+                stale += 1
+    
+    rewritten = 0
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        rewritten += write_if_changed(page, rewrite_page_urls(html, page.parent, mapping))
+    print(f"  {len(mapping)} assets fingerprinted, {stale} stale copies removed, {rewritten} pages rewritten")
+
+
+def output_inventory():
+    """Return every published file under OUTPUT_DIR as sorted POSIX paths."""
+    inventory = []
+    for path in OUTPUT_DIR.rglob("*"):
+        name = path.relative_to(OUTPUT_DIR).as_posix()
+        if path.is_file() and not any(part.startswith(".") for part in name.split("/")):
+            inventory.append(name)
+    return sorted(inventory)
+
+
+def page_preload_links(page):
+    """Return Link header values preloading a page's stylesheets, preloaded fonts and hero image."""
+    html = page.read_text(encoding="utf-8")
+    links = []
+    
+    def add(url, attributes):
+        path = resolve_local_url(url, page.parent)
+        if path is None:
+            return
+        if CDN_BASE_URL and url.startswith(CDN_BASE_URL):
+            # Must match the page's own request, which is CORS for SRI-checked stylesheets
+            target = cdn_url(path)
+            if attributes == "as=style":
+                attributes += "; crossorigin"
+        else:
+            target = "/" + quote(path.relative_to(OUTPUT_DIR).as_posix())
+        value = f"<{target}>; rel=preload; {attributes}"
+        if value not in links:
+            links.append(value)
+    
+    for tag in re.findall(r"<link\b[^>]*>", html[:html.find("</head>")]):
+        rel = re.search(r'\srel="([^"]*)"', tag)
+        href = re.search(r'\shref="([^"]+)"', tag)
+        kind = re.search(r'\sas="([^"]*)"', tag)
+        if not (rel and href):
+            continue
+        rel = set(rel.group(1).lower().split())
+        kind = kind.group(1) if kind else None
+        if "stylesheet" in rel or ("preload" in rel and kind == "style"):
+            add(href.group(1), "as=style")
+        elif "preload" in rel and kind == "font":
+            font_type = re.search(r'\stype="([^"]*)"', tag)
+            add(href.group(1), f'as=font; type="{font_type.group(1) if font_type else "font/woff2"}"; crossorigin')
+    
+    hero = re.search(r"<img\b[^>]*>", above_the_fold(html))
+    if hero and 'loading="lazy"' not in hero.group(0):
+        src = re.search(r'\ssrc="([^"]+)"', hero.group(0))
+        if src:
+            add(src.group(1), "as=image")
+    return links
+
+
+def build_headers_file():
+    """Write OUTPUT_DIR/_headers from the output inventory.
+    
+    Fingerprinted files are cached for a year, HTML always revalidates, and
+    each page announces its critical CSS, fonts and hero image with Link: preload.
+    """
+    print(f"Writing {HEADERS_FILE}...")
+    lines = ["# Generated by build.py from the output inventory; do not edit"]
+    counts = {CACHE_CONTROL_IMMUTABLE: 0, CACHE_CONTROL_HTML: 0, CACHE_CONTROL_DEFAULT: 0}
+    for name in output_inventory():
+        if name == HEADERS_FILE:
+            continue
+        if is_fingerprinted(name):
+            cache_control = CACHE_CONTROL_IMMUTABLE
+        elif name.endswith(".html") or name == SERVICE_WORKER_FILE:
+            cache_control = CACHE_CONTROL_HTML
+        else:
+            cache_control = CACHE_CONTROL_DEFAULT
+        counts[cache_control] += 1
+        
+        headers = [("Cache-Control", cache_control)]
+        if name.endswith(".html"):
+            headers += [("Link", value) for value in page_preload_links(OUTPUT_DIR / name)]
+        urls = ["/" + quote(name)]
+        if posixpath.basename(name) == "index.html":
+            urls.insert(0, "/" + quote(name[:-len("index.html")]))
+        for url in urls:
+            lines.append(url)
+            lines += [f"  {header}: {value}" for header, value in headers]
+    
+    changed = write_if_changed(OUTPUT_DIR / HEADERS_FILE, "\n".join(lines) + "\n")
+    print(f"  {counts[CACHE_CONTROL_IMMUTABLE]} immutable, {counts[CACHE_CONTROL_HTML]} HTML, "
+          f"{counts[CACHE_CONTROL_DEFAULT]} other files{'' if changed else ' (unchanged)'}")
+
+
+def parse_headers_file(text):
+    """Parse a _headers file into a list of (path pattern, [(name, value), ...]) rules."""
+    rules = []
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            rules.append((line.strip(), []))
+        elif rules:
+            name, sep, value = line.strip().partition(":")
+            if sep:
+                rules[-1][1].append((name.strip(), value.strip()))
+    return rules
+
+
+def headers_for_path(rules, url_path):
+    """Return the headers that apply to url_path; "*" in a rule matches any characters.
+    
+    As on the hosts, every matching rule contributes and repeated headers are joined.
+    """
+    headers = {}
+    for pattern, rule_headers in rules:
+        if not re.fullmatch(".*".join(re.escape(part) for part in pattern.split("*")), url_path):
+            continue
+        for name, value in rule_headers:
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return headers
+
+
+# =============================================================================
+# Asset CDN and Subresource Integrity
+# =============================================================================
+
+# Links that are not page resources, or that browsers only accept from the page's own origin
+CDN_EXCLUDED_LINK_RELS = NON_FETCHING_LINK_RELS | {"manifest"}
+
+
+def cdn_url(path):
+    """Return the CDN URL of a file under OUTPUT_DIR."""
+    return CDN_BASE_URL + quote(path.relative_to(OUTPUT_DIR).as_posix())
+
+
+def sri_hash(path):
+    """Return the integrity attribute value for a file."""
+    digest = hashlib.new(SRI_ALGORITHM, path.read_bytes()).digest()
+    return f"{SRI_ALGORITHM}-{base64.b64encode(digest).decode('ascii')}"
+
+
+def needs_integrity(tag):
+    """Return True for <script src> and stylesheet (or style/script preload) <link> tags."""
+    if tag[:7].lower() == "<script":
+        return True
+    rel = re.search(r'\srel="([^"]*)"', tag)
+    kind = re.search(r'\sas="([^"]*)"', tag)
+    rels = set(rel.group(1).lower().split()) if rel else set()
+    return "stylesheet" in rels or "modulepreload" in rels or ("preload" in rels and kind and kind.group(1) in ("style", "script"))
+
+
+def rewrite_for_cdn(pages=None):
+    """Load the pages' assets from CDN_BASE_URL and pin scripts and stylesheets with SRI hashes.
+    
+    Navigation links, feeds and <use> references (SVG refuses cross-origin
+    sprites) keep pointing at the site. Stylesheets are published with their
+    relative url()s, so fonts and images they load come from the CDN as well.
+    """
+    print(f"Pointing assets at {CDN_BASE_URL}...")
+    pages = pages if pages is not None else site_pages()
+    static_dirs = [Path(os.path.normpath(OUTPUT_DIR / directory)) for directory in SITE_STATIC_DIRS]
+    hashes = {}
+    counts = {"urls": 0, "integrity": 0}
+    
+    def asset_url(url, base_dir):
+        path = resolve_local_url(url, base_dir)
+        if path is None or not any(directory in path.parents for directory in static_dirs):
+            return url, None
+        suffix = re.search(r"[?#].*$", url)
+        counts["urls"] += 1
+        return cdn_url(path) + (suffix.group(0) if suffix else ""), path
+    
+    def replace_tag(match, base_dir):
+        tag = match.group(0)
+        rel = re.search(r'\srel="([^"]*)"', tag)
+        if tag[:4].lower() == "<use" or (rel and set(rel.group(1).lower().split()) & CDN_EXCLUDED_LINK_RELS):
+            return tag
+        for url in RESOURCE_URL_PATTERN.findall(tag):
+            new_url, path = asset_url(url, base_dir)
+            tag = tag.replace(f'"{url}"', f'"{new_url}"')
+            if path is None or not needs_integrity(tag):
+                continue
+            if path not in hashes:
+                hashes[path] = sri_hash(path)
+            # Re-runs over already rewritten pages refresh the hash rather than keep a stale one
+            tag = re.sub(r'\sintegrity="[^"]*"', "", tag)
+            attributes = f' integrity="{hashes[path]}"'
+            if not re.search(r"\scrossorigin\b", tag):
+                attributes += ' crossorigin="anonymous"'
+            end = len(tag) - (2 if tag.endswith("/>") else 1)
+            tag = tag[:end].rstrip() + attributes + tag[end:]
+            counts["integrity"] += 1
+        return tag
+    
+    def replace_css_url(match, base_dir):
+        url = match.group(1) or match.group(2)
+        return match.group(0).replace(url, asset_url(url, base_dir)[0])
+    
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(CDN_BASE_URL))
+    preconnect = f'<link rel="preconnect" href="{origin}" crossorigin>'
+    rewritten = 0
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        new_html = PAGE_RESOURCE_PATTERN.sub(lambda m: replace_tag(m, page.parent), html)
+        new_html = re.sub(
+            r"(<style[^>]*>)(.*?)(</style>)",
+            lambda m: m.group(1) + CSS_URL_PATTERN.sub(lambda u: replace_css_url(u, page.parent), m.group(2)) + m.group(3),
+            new_html, flags=re.DOTALL,
+        )
+        if new_html != html and preconnect not in new_html:
+            # Open the connection to the CDN before the first stylesheet is discovered
+            index = new_html.find("<link")
+            if index != -1:
+                new_html = new_html[:index] + preconnect + "\n  " + new_html[index:]
+        rewritten += write_if_changed(page, new_html)
+    print(f"  {counts['urls']} asset URLs rewritten, {counts['integrity']} integrity hashes, {rewritten} pages changed")
+
+
+# =============================================================================
+# Service Worker
+# =============================================================================
+
+SERVICE_WORKER_SCRIPT = """// Generated by build.py; do not edit
+const VERSION = "__VERSION__";
+const PRECACHE = "precache-" + VERSION;
+const PAGES = "pages";
+const FINGERPRINTED = /\\.[0-9a-f]{10}\\.[A-Za-z0-9.]+$/;
+// Served from the precache even when not fingerprinted: a new version of any
+// of them changes VERSION, so the precache is replaced rather than kept stale
+const PRECACHED = new Set(__PRECACHED__);
+
+self.addEventListener("install", (event) => {
+  event.waitUntil((async () => {
+    const response = await fetch("precache-manifest." + VERSION + ".json", { cache: "no-cache" });
+    const manifest = await response.json();
+    await (await caches.open(PRECACHE)).addAll(manifest.assets);
+    await (await caches.open(PAGES)).addAll(manifest.pages);
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil((async () => {
+    for (const name of await caches.keys()) {
+      if (name.startsWith("precache-") && name !== PRECACHE) {
+        await caches.delete(name);
+      }
+    }
+    await self.clients.claim();
+  })());
+});
+
+// Answer from the cache at once and refresh the cached copy in the background
+async function staleWhileRevalidate(event, key) {
+  const cache = await caches.open(PAGES);
+  const cached = await cache.match(key, { ignoreSearch: true });
+  const network = fetch(event.request).then((response) => {
+    if (response.ok) {
+      return cache.put(key, response.clone()).then(() => response);
+    }
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+}
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request, { ignoreSearch: true });
+  if (cached) {
+    return cached;
+  }
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(PRECACHE);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  const scope = self.registration.scope;
+  if (request.method !== "GET" || !request.url.startsWith(scope)) {
+    return;
+  }
+  let path = request.url.slice(scope.length).split(/[?#]/)[0];
+  if (path === "" || path.endsWith("/")) {
+    path += "index.html";
+  }
+  if (request.mode === "navigate" || path.endsWith(".html")) {
+    event.respondWith(staleWhileRevalidate(event, path));
+  } else if (PRECACHED.has(path) || FINGERPRINTED.test(path) || path.startsWith("assets/icons/")) {
+    event.respondWith(cacheFirst(request));
+  }
+});
+"""
+
+
+def precache_assets(pages):
+    """Return the stylesheets, scripts, fonts and icons the service worker precaches.
+    
+    With a CDN the pages load their stylesheets, scripts and fonts from
+    another origin, which the worker does not intercept, so only icons are kept.
+    """
+    assets = set()
+    for page in [] if CDN_BASE_URL else pages:
+        assets |= {
+            path for path in collect_page_resources(page)
+            if ASSET_TYPES.get(path.suffix.lower()) in ("css", "js", "font")
+        }
+    assets |= {path for path in (OUTPUT_DIR / "assets" / "icons").rglob("*") if path.is_file()}
+    return sorted(assets)
+
+
+def build_service_worker(pages=None):
+    """Write sw.js and its precache manifest, and register the worker on every page.
+    
+    The manifest is named after a hash of the precached files, so it and sw.js
+    only change (and browsers only re-install) when that inventory changes.
+    """
+    print("Writing service worker...")
+    pages = pages if pages is not None else site_pages()
+    core_pages = [name for name in SERVICE_WORKER_PAGES if (OUTPUT_DIR / name).is_file()]
+    assets = precache_assets(OUTPUT_DIR / name for name in core_pages)
+    
+    asset_urls = [quote(path.relative_to(OUTPUT_DIR).as_posix()) for path in assets]
+    inventory = [f"{url} {hashlib.sha256(path.read_bytes()).hexdigest()}" for url, path in zip(asset_urls, assets)]
+    inventory += [f"page {name}" for name in core_pages]
+    version = hashlib.sha256("\n".join(inventory).encode("utf-8")).hexdigest()[:10]
+    
+    manifest_path = OUTPUT_DIR / f"precache-manifest.{version}.json"
+    manifest = {"version": version, "assets": asset_urls, "pages": [quote(name) for name in core_pages]}
+    changed = write_if_changed(manifest_path, json.dumps(manifest, indent=2) + "\n")
+    worker = SERVICE_WORKER_SCRIPT.replace("__VERSION__", version).replace("__PRECACHED__", json.dumps(asset_urls))
+    write_if_changed(OUTPUT_DIR / SERVICE_WORKER_FILE, worker)
+    for stale in OUTPUT_DIR.glob("precache-manifest.*.json"):
+        if stale != manifest_path:
+            stale.unlink()
+    
+    registered = 0
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        if "serviceWorker.register" in html or "</body>" not in html:
+            continue
+        src = posixpath.relpath(SERVICE_WORKER_FILE, page.parent.relative_to(OUTPUT_DIR).as_posix())
+        script = f'  <script>if ("serviceWorker" in navigator) navigator.serviceWorker.register("{src}");</script>\n'
+        index = html.rfind("</body>")
+        registered += write_if_changed(page, html[:index] + script + html[index:])
+    
+    status = "new version" if changed else "unchanged"
+    print(f"  {manifest_path.name}: {len(asset_urls)} assets, {len(core_pages)} pages ({status}), registered on {registered} pages")
+
+
+# =============================================================================
+# Deploy Manifest
+# =============================================================================
+
+def hash_output_files(names):
+    """Return {name: {"sha256", "size"}} for files under OUTPUT_DIR.
+    
+    Hashes are reused from the previous run while a file's size and mtime are
+    unchanged, so large image trees are not re-read on every build.
+    """
+    cache_path = CACHE_DIR / f"deploy-hashes-{output_cache_key()}.json"
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = {}
+    
+    files = {}
+    stats = {}
+    for name in names:
+        stat = (OUTPUT_DIR / name).stat()
+        key = [stat.st_size, stat.st_mtime_ns]
+        entry = cached.get(name)
+        if entry and entry[:2] == key:
+            digest = entry[2]
+        else:
+            digest = hashlib.sha256((OUTPUT_DIR / name).read_bytes()).hexdigest()
+        stats[name] = key + [digest]
+        files[name] = {"sha256": digest, "size": stat.st_size}
+    
+    atomic_write(cache_path, json.dumps(stats, sort_keys=True).encode("utf-8"))
+    return files
+
+
+def diff_manifests(previous, current):
+    """Return the added, changed and deleted paths between two manifest file maps."""
+    return {
+        "added": sorted(current.keys() - previous.keys()),
+        "changed": sorted(
+            name for name in current.keys() & previous.keys()
+            if current[name]["sha256"] != previous[name].get("sha256")
+        ),
+        "deleted": sorted(previous.keys() - current.keys()),
+    }
+
+
+def deployed_manifest_path():
+    """Return where --mark-deployed records the manifest of OUTPUT_DIR's last deploy."""
+    return CACHE_DIR / f"deployed-manifest-{output_cache_key()}.json"
+
+
+def mark_deployed():
+    """Record OUTPUT_DIR's deploy-manifest.json as live. Returns the exit code.
+    
+    Run by the deploy step once the upload succeeded, so the next build's
+    delta is taken against what the site actually serves.
+    """
+    manifest_path = OUTPUT_DIR / DEPLOY_MANIFEST
+    try:
+        data = manifest_path.read_bytes()
+        json.loads(data)
+    except (OSError, ValueError):
+        print(f"Error: no readable {manifest_path}; build with --output {OUTPUT_DIR} first")
+        return 2
+    atomic_write(deployed_manifest_path(), data)
+    print(f"Recorded {manifest_path} as deployed")
+    return 0
+
+
+def deploy_delta_path():
+    """Return where the deploy delta for OUTPUT_DIR goes without --delta."""
+    return CACHE_DIR / f"deploy-delta-{output_cache_key()}.json"
+
+
+def build_deploy_manifest(deployed_manifest=None, delta_path=None):
+    """Write deploy-manifest.json for OUTPUT_DIR and the delta against the last deploy.
+    
+    The baseline is deployed_manifest when given (e.g. the manifest fetched
+    from the live site), otherwise the manifest last recorded with
+    --mark-deployed. Without either, every file counts as added. The delta
+    goes to delta_path, or deploy_delta_path(), never into OUTPUT_DIR.
+    """
+    print("Writing deploy manifest...")
+    manifest_path = OUTPUT_DIR / DEPLOY_MANIFEST
+    # Earlier builds wrote the delta into OUTPUT_DIR; don't let it get published
+    (OUTPUT_DIR / "deploy-delta.json").unlink(missing_ok=True)
+    base_path = Path(deployed_manifest) if deployed_manifest else deployed_manifest_path()
+    try:
+        previous = json.loads(base_path.read_text(encoding="utf-8")).get("files", {})
+        base = str(base_path)
+    except (OSError, ValueError):
+        if deployed_manifest:
+            print(f"  Warning: could not read {deployed_manifest}; treating every file as added")
+        else:
+            print("  No deploy recorded yet (--mark-deployed); treating every file as added")
+        previous, base = {}, None
+    
+    files = hash_output_files([name for name in output_inventory() if name != DEPLOY_MANIFEST])
+    delta = diff_manifests(previous, files)
+    upload = delta["added"] + delta["changed"]
+    delta["upload_bytes"] = sum(files[name]["size"] for name in upload)
+    delta["base"] = base
+    
+    write_if_changed(manifest_path, json.dumps({"version": 1, "files": files}, indent=2, sort_keys=True) + "\n")
+    delta_path = Path(delta_path) if delta_path else deploy_delta_path()
+    delta_path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(delta_path, json.dumps(delta, indent=2, sort_keys=True) + "\n")
+    total = sum(entry["size"] for entry in files.values())
+    print(f"  {len(files)} files ({total / 1024:.1f} KB); {len(delta['added'])} added, "
+          f"{len(delta['changed'])} changed, {len(delta['deleted'])} deleted "
+          f"({delta['upload_bytes'] / 1024:.1f} KB to upload)")
+    print(f"  Delta: {delta_path}")
+
+
+# =============================================================================
+# Site Archive
+# =============================================================================
+
+def archive_entry(name, data):
+    """Return (method, crc32, size, payload) for one zip entry.
+    
+    Already-compressed formats are stored; anything else is deflated unless
+    that does not make it smaller.
+    """
+    crc = zlib.crc32(data)
+    if posixpath.splitext(name)[1].lower() not in ARCHIVE_STORED_SUFFIXES:
+        key_source = f"{zlib.ZLIB_RUNTIME_VERSION}:{ARCHIVE_COMPRESS_LEVEL}:".encode("utf-8") + data
+        key = hashlib.sha256(key_source).hexdigest()
+        payload = BUILD_CACHE.get("deflate", key)
+        if payload is None:
+            compressor = zlib.compressobj(ARCHIVE_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+            BUILD_CACHE.put("deflate", key, payload)
+        if len(payload) < len(data):
+            return 8, crc, len(data), payload
+    return 0, crc, len(data), data
+
+
+class SiteArchive:
+    """The files written under root, kept as written until the zip is written.
+    
+    Post-processing steps rewrite many pages, so only the last version of a
+    file is compressed, once, by write(). Entries are laid out in name order
+    with fixed timestamps and permissions, so identical outputs always give a
+    byte-identical archive.
+    """
+    
+    def __init__(self, root):
+        self.root = Path(os.path.abspath(root))
+        self.entries = {}
+        self.lock = threading.Lock()
+    
+    def add(self, path, data):
+        try:
+            name = Path(os.path.abspath(path)).relative_to(self.root).as_posix()
+        except ValueError:
+            return  # Caches and other files outside the site
+        with self.lock:
+            self.entries[name] = data
+    
+    def take(self):
+        """Return the entries added so far and forget them (used by stage workers)."""
+        with self.lock:
+            entries, self.entries = self.entries, {}
+        return entries
+    
+    def merge(self, entries):
+        with self.lock:
+            self.entries.update(entries)
+    
+    def write(self, archive_path, names):
+        """Write the entries for names to archive_path. Returns how many had to be read from disk.
+        
+        Files the build did not write this run (skipped stages, unchanged copies) are read once.
+        Entries are compressed concurrently, zlib releasing the GIL.
+        """
+        def entry(name):
+            data = self.entries.get(name)
+            return archive_entry(name, data if data is not None else (self.root / name).read_bytes())
+        
+        with ThreadPoolExecutor(PIPELINE_IO_THREADS) as compressors:
+            entries = run_pipeline(names, (entry, compressors, PIPELINE_IO_THREADS))
+        read = sum(1 for name in names if name not in self.entries)
+        mod_time, mod_date = zip_dos_datetime(ARCHIVE_DATE_TIME)
+        tmp_path = archive_path.with_name(f".{archive_path.name}.{os.getpid()}.tmp")
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        central = []
+        with open(tmp_path, "wb") as f:
+            for name, (method, crc, size, payload) in zip(names, entries):
+                offset = f.tell()
+                if offset + len(payload) > 0xFFFFFFFF:
+                    raise ValueError("site archives over 4 GB are not supported")
+                encoded = name.encode("utf-8")
+                fields = (20, 0x0800, method, mod_time, mod_date, crc, len(payload), size, len(encoded))
+                f.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, *fields, 0) + encoded)
+                f.write(payload)
+                central.append(
+                    struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, 0x0314, *fields, 0, 0, 0, 0, 0o100644 << 16, offset)
+                    + encoded
+                )
+            
+            directory_offset = f.tell()
+            for record in central:
+                f.write(record)
+            directory_size = f.tell() - directory_offset
+            count = len(central)
+            if count > 0xFFFF:
+                # Zip64 end records carry the entry count; the classic one is saturated
+                f.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 0x032D, 45, 0, 0, count, count, directory_size, directory_offset))
+                f.write(struct.pack("<IIQI", 0x07064B50, 0, directory_offset + directory_size, 1))
+                count = 0xFFFF
+            f.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, directory_size, directory_offset, 0))
+        os.replace(tmp_path, archive_path)
+        return read
+
+
+def zip_dos_datetime(date_time):
+    """Return the (time, date) words of a zip header for a (Y, M, D, h, m, s) tuple."""
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def write_site_archive(archive_path):
+    """Write every published file under OUTPUT_DIR to a reproducible zip at archive_path."""
+    print("Writing site archive...")
+    archive_path = Path(archive_path)
+    archive = SITE_ARCHIVE if SITE_ARCHIVE is not None else SiteArchive(OUTPUT_DIR)
+    target = Path(os.path.abspath(archive_path))
+    names = [name for name in output_inventory() if Path(os.path.abspath(OUTPUT_DIR / name)) != target]
+    read = archive.write(archive_path, names)
+    stored = sum(1 for name in names if posixpath.splitext(name)[1].lower() in ARCHIVE_STORED_SUFFIXES)
+    print(f"  {archive_path}: {len(names)} files ({archive_path.stat().st_size / 1024:.1f} KB), "
+          f"{stored} stored uncompressed, {read} read back from disk")
+
+
+# =============================================================================
+# Build Functions
+# =============================================================================
+
+def render_paper_shards(papers, card_store=None, shard_size=VIRTUAL_LIST_SHARD_SIZE):
+    """Split paper cards into shards for the virtualized listing.
+    
+    Returns (first, files): the first shard's cards, rendered into papers.html,
+    and {path: json} for the rest. Returns None when the listing is not virtualized.
+    """
+    if not VIRTUAL_LIST_ENABLED or len(papers) <= shard_size:
+        return None
+    cards = render_cards_cached("paper", papers, generate_paper_card, card_store)
+    first = "\n".join(cards[:shard_size])
+    
+    files = {}
+    for number, start in enumerate(range(shard_size, len(cards), shard_size), start=2):
+        compact = [re.sub(r">\s+<", "><", card.strip()) for card in cards[start:start + shard_size]]
+        text = json.dumps({"cards": compact}, ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+        files[f"{VIRTUAL_LIST_DIR}/papers-{number}.{digest}.json"] = text
+    return first, files
+
+
+def write_paper_shards(shards):
+    """Write shard files and delete shards left over from earlier builds."""
+    files = shards[1] if shards else {}
+    for path, text in files.items():
+        write_if_changed(OUTPUT_DIR / path, text)
+    for stale in (OUTPUT_DIR / VIRTUAL_LIST_DIR).glob("papers-*.json"):
+        if f"{VIRTUAL_LIST_DIR}/{stale.name}" not in files:
+            stale.unlink()
+    if shards:
+        print(f"  Virtualized listing: {len(files)} shards of {VIRTUAL_LIST_SHARD_SIZE} cards after the first")
+
+
+def render_papers_page(papers, card_store=None, shards=None):
+    """Return the papers.html page for already-sorted papers.
+    
+    With shards from render_paper_shards(), only the first shard is rendered
+    and scripts/virtual-list.js fetches the rest as the visitor scrolls.
+    """
+    list_attributes = ""
+    if not papers:
+        cards_html = '<p class="text-secondary">No publications yet. Check back soon!</p>'
+    elif shards:
+        first, files = shards
+        cards_html = (
+            '<div class="papers-list__shard">\n'
+            f'{prioritize_first_image(first)}\n'
+            '            </div>'
+        )
+        list_attributes = f' data-virtual-list data-shards="{escape_html(json.dumps(list(files)))}"'
+    else:
+        cards_html = "\n".join(render_cards_cached("paper", papers, generate_paper_card, card_store))
+        cards_html = prioritize_first_image(cards_html)
+    
+    page_content = f'''
+      <!-- Page Header -->
+      <section class="page-header">
+        <div class="container">
+          <h1 class="page-title reveal">Publications</h1>
+          <p class="text-secondary reveal">Research papers and preprints</p>
+        </div>
+      </section>
+
+      <!-- Papers List -->
+      <section class="section">
+        <div class="container">
+          <div class="papers-list"{list_attributes}>
+            {cards_html}
+          </div>
+        </div>
+      </section>'''
+    
+    html = get_page_header()
+    html = html.replace(
+        '<meta name="author" content="Achraf Hsain">',
+        '<meta name="description" content="Publications by Achraf Hsain - Research papers in machine learning, reinforcement learning, and robotics.">\n  <meta name="author" content="Achraf Hsain">'
+    )
+    html = html.replace('<title>', '<title>Publications - Achraf Hsain</title>\n  <!-- <title>')
+    html = html.replace('</head>', '-->\n</head>')
+    html += page_content
+    html += get_page_footer()
+    
+    # Fix the title hack
+    html = html.replace('<title>Publications - Achraf Hsain</title>\n  <!-- <title>', '<title>Publications - Achraf Hsain</title>')
+    html = html.replace('-->\n</head>', '</head>')
+    if shards:
+        html = html.replace('</head>', '  <script src="scripts/virtual-list.js?v=1" defer></script>\n</head>', 1)
+    return html
+
+
+def build_papers_page(papers=None):
+    """Build the papers.html page from sorted papers, loading them when not given."""
+    print("Building papers.html...")
+    
+    papers = load_sorted_content("papers") if papers is None else papers
+    if not papers:
+        print("  No paper content files found in content/papers/")
         print("  Using placeholder message.")
+    else:
+        print(f"  Found {len(papers)} papers")
+    
+    shards = render_paper_shards(papers)
+    write_paper_shards(shards)
+    
+    output_path = OUTPUT_DIR / "papers.html"
+    atomic_write(output_path, render_papers_page(papers, shards=shards).encode("utf-8"))
+    
+    print(f"  Written to {output_path}")
+
+
+def render_projects_page(projects, card_store=None):
+    """Return the projects.html page for already-sorted projects."""
+    if not projects:
         cards_html = '<p class="text-secondary">No projects yet. Check back soon!</p>'
     else:
-        projects = sort_projects(projects)
-        cards_html = "\n".join(generate_project_card(p) for p in projects)
-        print(f"  Found {len(projects)} projects")
+        cards_html = "\n".join(render_cards_cached("project", projects, generate_project_card, card_store))
+        cards_html = prioritize_first_image(cards_html)
     
     page_content = f'''
       <!-- Page Header -->
@@ -578,10 +3436,22 @@ def build_projects_page():
     # Fix the title hack
     html = html.replace('<title>Projects - Achraf Hsain</title>\n  <!-- <title>', '<title>Projects - Achraf Hsain</title>')
     html = html.replace('-->\n</head>', '</head>')
+    return html
+
+
+def build_projects_page(projects=None):
+    """Build the projects.html page from sorted projects, loading them when not given."""
+    print("Building projects.html...")
+    
+    projects = load_sorted_content("projects") if projects is None else projects
+    if not projects:
+        print("  No project content files found in content/projects/")
+        print("  Using placeholder message.")
+    else:
+        print(f"  Found {len(projects)} projects")
     
     output_path = OUTPUT_DIR / "projects.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    atomic_write(output_path, render_projects_page(projects).encode("utf-8"))
     
     print(f"  Written to {output_path}")
 
@@ -650,92 +3520,1140 @@ A comprehensive collection of custom OpenAI Gym environments designed for reinfo
     
     print("  Created sample content files in content/papers/ and content/projects/")
 
-
-def build_featured_index():
-    """Update the featured section in index.html with content from markdown files."""
-    print("Updating featured items in index.html...")
-    
-    # Load papers and projects
-    papers = load_content_files("papers")
-    projects = load_content_files("projects")
-    
-    # Get featured items
+
+def select_featured(papers, projects):
+    """Return the featured papers and projects shown on index.html."""
     featured_papers = [p for p in papers if p.get("featured", False)]
     featured_projects = [p for p in projects if p.get("featured", False)]
     
-    # Sort them
-    featured_papers = sort_papers(featured_papers)[:2]  # Max 2 featured papers
-    featured_projects = sort_projects(featured_projects)[:2]  # Max 2 featured projects
-    
-    print(f"  Found {len(featured_papers)} featured papers and {len(featured_projects)} featured projects")
-    
-    # Read current index.html
-    index_path = OUTPUT_DIR / "index.html"
-    if not index_path.exists():
-        print("  Warning: index.html not found, skipping featured update")
-        return
+    featured_papers = sort_papers(featured_papers)[:FEATURED_MAX_ITEMS]
+    featured_projects = sort_projects(featured_projects)[:FEATURED_MAX_ITEMS]
+    return featured_papers, featured_projects
+
+
+def render_featured_index(content, papers, projects, card_store=None, featured=None):
+    """Return index.html content with its featured sections replaced, plus status messages.
     
-    with open(index_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    featured, a (papers, projects) pair, skips select_featured() when the
+    caller already has the featured items (e.g. from the catalog).
+    """
+    featured_papers, featured_projects = featured or select_featured(papers, projects)
+    messages = []
     
     # Generate featured papers HTML
     if featured_papers:
         papers_html = ""
         for paper in featured_papers:
-            papers_html += generate_paper_card(paper)
+            papers_html += render_card_cached("paper", paper, generate_paper_card, card_store)
         
         # Find and replace the papers section
         # Look for the pattern between "Recent Publications" heading and "View all publications" link
-        import re
         papers_pattern = r'(<h3 class="section-subtitle reveal">Recent Publications</h3>\s*<div class="stack--xl reveal-stagger mb-12">)(.*?)(</div>\s*<div class="mb-12">\s*<a href="papers\.html")'
         
-        replacement = r'\1' + papers_html + r'\3'
-        new_content = re.sub(papers_pattern, replacement, content, flags=re.DOTALL)
+        new_content, found = re.subn(papers_pattern, lambda m: m.group(1) + papers_html + m.group(3), content, flags=re.DOTALL)
         
-        if new_content != content:
+        if found:
             content = new_content
-            print("  Updated featured papers section")
+            messages.append("Updated featured papers section")
         else:
-            print("  Warning: Could not find featured papers section to update")
+            messages.append("Warning: Could not find featured papers section to update")
     
     # Generate featured projects HTML
     if featured_projects:
         projects_html = ""
         for project in featured_projects:
-            projects_html += generate_project_card(project)
+            projects_html += render_card_cached("project", project, generate_project_card, card_store)
         
         # Find and replace the projects section
         projects_pattern = r'(<h3 class="section-subtitle reveal">Projects</h3>\s*<div class="grid grid--2cols reveal-stagger">)(.*?)(</div>\s*<div class="mt-8">\s*<a href="projects\.html")'
         
-        replacement = r'\1' + projects_html + r'\3'
-        new_content = re.sub(projects_pattern, replacement, content, flags=re.DOTALL)
+        new_content, found = re.subn(projects_pattern, lambda m: m.group(1) + projects_html + m.group(3), content, flags=re.DOTALL)
         
-        if new_content != content:
+        if found:
             content = new_content
-            print("  Updated featured projects section")
+            messages.append("Updated featured projects section")
         else:
-            print("  Warning: Could not find featured projects section to update")
+            messages.append("Warning: Could not find featured projects section to update")
+    
+    return content, messages
+
+
+def build_featured_index(papers=None, projects=None):
+    """Update the featured section in index.html with content from markdown files."""
+    print("Updating featured items in index.html...")
+    
+    # With --catalog the featured query is answered from its index, not by scanning every item
+    if CATALOG:
+        featured_papers, featured_projects = CATALOG.featured("papers"), CATALOG.featured("projects")
+    else:
+        papers = load_content_files("papers") if papers is None else papers
+        projects = load_content_files("projects") if projects is None else projects
+        featured_papers, featured_projects = select_featured(papers, projects)
+    print(f"  Found {len(featured_papers)} featured papers and {len(featured_projects)} featured projects")
+    
+    # Read current index.html
+    index_path = OUTPUT_DIR / "index.html"
+    if not index_path.exists():
+        print("  Warning: index.html not found, skipping featured update")
+        return
+    
+    with open(index_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    
+    content, messages = render_featured_index(content, papers, projects, featured=(featured_papers, featured_projects))
+    for message in messages:
+        print(f"  {message}")
     
     # Write updated index.html
-    with open(index_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    atomic_write(index_path, content.encode("utf-8"))
     
     print("  Written updated index.html")
 
 
+# =============================================================================
+# BibTeX Import
+# =============================================================================
+
+BIBTEX_ENTRY_START = re.compile(r"\s*@\s*([A-Za-z]+)\s*([{(])")
+BIBTEX_FIELD_NAME = re.compile(r"\s*,?\s*([A-Za-z][\w:.+-]*)\s*=\s*")
+BIBTEX_BARE_VALUE = re.compile(r"[^\s,#{}()\"]+")
+BIBTEX_PLAIN_VALUE = re.compile(r'\{([^{}\\]*)\}|"([^"{}\\]*)"')  # No nesting or escapes
+BIBTEX_SPACE = re.compile(r"\s*")
+BIBTEX_CONCAT = re.compile(r"\s*#")
+BIBTEX_DELIMITER = re.compile(r'\\.|[{}"]', re.S)
+BIBTEX_NAME_SEPARATOR = re.compile(r"[{}]|\s+and\s+", re.I)
+BIBTEX_LIST_SEPARATOR = re.compile(r"[{}]|\s*[,;]\s*")
+BIBTEX_COMMA = re.compile(r"[{}]|\s*,\s*")
+BIBTEX_ACCENT = re.compile(r"\\([`'^\"~=.])\s*\{?([A-Za-z])\}?")
+BIBTEX_ESCAPE = re.compile(r"\\([&%$#_{}])")
+BIBTEX_COMMAND = re.compile(r"\\[A-Za-z]+\s*")  # \emph, \textit, ...: keep only their argument
+BIBTEX_MARKUP = str.maketrans({"{": None, "}": None, "~": " ", '"': "'"})
+BIBTEX_ACCENTS = {"`": "\u0300", "'": "\u0301", "^": "\u0302", '"': "\u0308", "~": "\u0303", "=": "\u0304", ".": "\u0307"}
+BIBTEX_MONTHS = {
+    name: number
+    for number, name in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)
+}
+BIBTEX_SKIPPED_TYPES = {"string", "comment", "preamble"}
+BIBTEX_VENUE_FIELDS = ("booktitle", "journal", "journaltitle", "school", "institution", "publisher", "howpublished")
+ARXIV_ID = re.compile(r"arxiv(?:\.org/(?:abs|pdf)/|\s*:\s*|\s+)(\d{4}\.\d{4,5}|[a-z.-]+/\d{7})", re.I)
+
+
+def iter_bibtex_entries(lines, max_entry_bytes=BIBTEX_MAX_ENTRY_BYTES):
+    """Yield the raw text of each entry in a stream of BibTeX lines.
+    
+    Only the entry being read is held in memory: it starts at a line beginning
+    with @ and ends once its delimiters balance. Entries that never close or
+    exceed max_entry_bytes are yielded as None.
+    """
+    entry, size, depth, pair = [], 0, 0, "{}"
+    for line in lines:
+        start = BIBTEX_ENTRY_START.match(line) if "@" in line else None
+        if entry and start and line.startswith("@"):
+            # A new entry before the last one closed: the last one was broken
+            yield None
+            entry = []
+        if not entry:
+            if not start:
+                continue  # Text between entries is a comment
+            size, depth = 0, 0
+            pair = "{}" if start.group(2) == "{" else "()"
+        
+        size += len(line)
+        if size > max_entry_bytes:
+            if entry:
+                yield None
+            entry, depth = [], 0
+            continue
+        entry.append(line)
+        
+        counted = line.replace("\\{", "").replace("\\}", "") if "\\" in line else line
+        depth += counted.count(pair[0]) - counted.count(pair[1])
+        if depth <= 0:
+            yield "".join(entry).strip()
+            entry = []
+    if entry:
+        yield None
+
+
+def bibtex_value_end(text, pos):
+    """Return the index of the delimiter closing the {...} or "..." value at pos, or -1."""
+    closer = text[pos]
+    depth = 0
+    for match in BIBTEX_DELIMITER.finditer(text, pos + 1):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            if depth == 0:
+                return match.start() if closer == "{" else -1
+            depth -= 1
+        elif token == '"' and closer == '"' and depth == 0:
+            return match.start()
+    return -1
+
+
+def read_bibtex_parts(text, pos, macros):
+    """Read the #-concatenated field value at pos. Returns (parts, end) or (None, pos).
+    
+    Parts are (text, kind) pairs, kind being "literal" for {...}, "..." and
+    numbers, "macro" for expanded @string macros and "bare" for undefined ones.
+    """
+    parts = []
+    while True:
+        pos = BIBTEX_SPACE.match(text, pos).end()
+        if pos >= len(text):
+            return None, pos
+        plain = BIBTEX_PLAIN_VALUE.match(text, pos)
+        if plain:
+            parts.append((plain.group(1) if plain.group(1) is not None else plain.group(2), "literal"))
+            pos = plain.end()
+        elif text[pos] in '{"':
+            end = bibtex_value_end(text, pos)
+            if end < 0:
+                return None, pos
+            parts.append((text[pos + 1:end], "literal"))
+            pos = end + 1
+        else:
+            # Numbers and @string macros; undefined macros (month names) stay as written
+            match = BIBTEX_BARE_VALUE.match(text, pos)
+            if not match:
+                return None, pos
+            name = match.group()
+            if name.lower() in macros:
+                parts.append((macros[name.lower()], "macro"))
+            else:
+                parts.append((name, "literal" if name.isdigit() else "bare"))
+            pos = match.end()
+        
+        concat = BIBTEX_CONCAT.match(text, pos)
+        if not concat:
+            return parts, pos
+        pos = concat.end()
+
+
+def read_bibtex_value(text, pos, macros):
+    """Read the #-concatenated field value at pos. Returns (value, end) or (None, pos)."""
+    parts, pos = read_bibtex_parts(text, pos, macros)
+    return ("".join(part for part, _ in parts) if parts is not None else None), pos
+
+
+def iter_bibtex_fields(text, macros):
+    """Parse one raw entry into (type, key, fields) as parse_bibtex_entry() does.
+    
+    fields maps each name to (parts, start, end): the read_bibtex_parts() of its
+    value and where that value is written in text.
+    """
+    start = BIBTEX_ENTRY_START.match(text)
+    if not start:
+        return None
+    entry_type = start.group(1).lower()
+    if entry_type in ("comment", "preamble"):
+        return entry_type, None, {}
+    if entry_type == "string":
+        pos, key = start.end(), None
+    else:
+        comma = text.find(",", start.end())
+        if comma < 0:
+            return None
+        pos, key = comma + 1, text[start.end():comma].strip()
+    
+    fields = {}
+    while True:
+        match = BIBTEX_FIELD_NAME.match(text, pos)
+        if not match:
+            break
+        value_start = BIBTEX_SPACE.match(text, match.end()).end()
+        parts, pos = read_bibtex_parts(text, value_start, macros)
+        if parts is None:
+            return None
+        fields[match.group(1).lower()] = (parts, value_start, pos)
+    return entry_type, key, fields
+
+
+def parse_bibtex_entry(text, macros=None):
+    """Parse one raw entry into (type, key, fields), or None when it is malformed.
+    
+    @string entries have no key; their fields are the macros they define.
+    """
+    parsed = iter_bibtex_fields(text, {} if macros is None else macros)
+    if parsed is None:
+        return None
+    entry_type, key, fields = parsed
+    return entry_type, key, {name: "".join(part for part, _ in value[0]) for name, value in fields.items()}
+
+
+def expand_bibtex_macros(text, macros):
+    """Return an entry with its @string macros written out, so it stands alone.
+    
+    Only values that use a defined macro are rewritten, as one {...} value
+    (undefined macros such as month names stay bare, joined with #). All
+    other text is kept byte for byte.
+    """
+    parsed = iter_bibtex_fields(text, macros) if macros else None
+    if parsed is None:
+        return text
+    pieces, pos = [], 0
+    for parts, start, end in parsed[2].values():
+        if not any(kind == "macro" for _, kind in parts):
+            continue
+        values = []
+        for part, kind in parts:
+            if kind == "bare":
+                values.append(part)
+            elif values and values[-1].startswith("{"):
+                values[-1] = values[-1][:-1] + part + "}"
+            else:
+                values.append("{" + part + "}")
+        pieces.extend((text[pos:start], " # ".join(values)))
+        pos = end
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+
+def split_bibtex_value(value, separator):
+    """Split a field on a separator pattern, ignoring separators inside braces."""
+    if "{" not in value:
+        return separator.split(value)
+    parts, depth, start = [], 0, 0
+    for match in separator.finditer(value):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif depth == 0:
+            parts.append(value[start:match.start()])
+            start = match.end()
+    parts.append(value[start:])
+    return parts
+
+
+def clean_bibtex_text(value):
+    """Turn LaTeX-flavoured field text into plain text."""
+    if "\\" in value:
+        value = BIBTEX_ACCENT.sub(
+            lambda m: unicodedata.normalize("NFC", m.group(2) + BIBTEX_ACCENTS[m.group(1)]), value
+        )
+        value = BIBTEX_ESCAPE.sub(r"\1", value)
+        value = BIBTEX_COMMAND.sub("", value)
+    if "--" in value:
+        value = value.replace("---", "\u2014").replace("--", "\u2013")
+    return " ".join(value.translate(BIBTEX_MARKUP).split())
+
+
+def bibtex_author_name(name):
+    """Return "First Last" for a BibTeX "Last, First" or "Last, Jr, First" name."""
+    parts = [clean_bibtex_text(part) for part in split_bibtex_value(name.strip(), BIBTEX_COMMA)]
+    if len(parts) == 2:
+        return f"{parts[1]} {parts[0]}".strip()
+    if len(parts) == 3:
+        return f"{parts[2]} {parts[0]} {parts[1]}".strip()
+    return " ".join(parts)
+
+
+def bibtex_date(fields, year):
+    """Return an ISO date from the date or year/month/day fields, or None."""
+    match = re.match(r"\d{4}-\d{2}(-\d{2})?", fields.get("date", "").strip())
+    if match:
+        return match.group() if match.group(1) else match.group() + "-01"
+    month = fields.get("month", "").strip().lower()
+    month = BIBTEX_MONTHS.get(clean_bibtex_text(month)[:3]) or (int(month) if month.isdigit() else None)
+    if not year or not month or not 1 <= month <= 12:
+        return None
+    day = fields.get("day", "").strip()
+    day = int(day) if day.isdigit() and 1 <= int(day) <= 31 else 1
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def bibtex_to_paper(entry_type, key, fields, raw):
+    """Map a parsed entry to paper frontmatter. Returns (data, abstract)."""
+    data = {"slug": item_slug({"slug": key}), "title": clean_bibtex_text(fields.get("title", key))}
+    
+    authors = fields.get("author") or fields.get("editor")
+    if authors:
+        names = [bibtex_author_name(name) for name in split_bibtex_value(authors, BIBTEX_NAME_SEPARATOR)]
+        data["authors"] = [name for name in names if name and name.lower() != "others"]
+    
+    venue = next((fields[name] for name in BIBTEX_VENUE_FIELDS if fields.get(name)), "")
+    if venue:
+        data["venue"] = clean_bibtex_text(venue)
+    
+    year = re.search(r"\d{4}", fields.get("year") or fields.get("date", ""))
+    year = int(year.group()) if year else None
+    if year:
+        data["year"] = year
+    date = bibtex_date(fields, year)
+    if date:
+        data["date"] = date
+    
+    prefix = (fields.get("archiveprefix") or fields.get("eprinttype") or "").lower()
+    if prefix == "arxiv" and fields.get("eprint"):
+        data["arxiv"] = f"https://arxiv.org/abs/{fields['eprint'].strip()}"
+    else:
+        match = ARXIV_ID.search(" ".join(fields.get(name, "") for name in ("url", "eprint", "journal", "note")))
+        if match:
+            data["arxiv"] = f"https://arxiv.org/abs/{match.group(1)}"
+    url = fields.get("url", "").strip()
+    if url.lower().endswith(".pdf") and "arxiv" not in data:
+        data["pdf"] = url
+    
+    keywords = split_bibtex_value(fields.get("keywords", ""), BIBTEX_LIST_SEPARATOR)
+    tags = [clean_bibtex_text(tag) for tag in keywords]
+    if any(tags):
+        data["tags"] = [tag for tag in tags if tag]
+    
+    data["bibtex"] = raw
+    return data, clean_bibtex_text(fields.get("abstract", ""))
+
+
+def format_frontmatter(data, body=""):
+    """Serialize item data as a markdown file that parse_frontmatter() reads back."""
+    lines = ["---"]
+    for key, value in data.items():
+        if isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f'  - "{item}"' for item in value)
+        elif isinstance(value, bool):
+            lines.append(f"{key}: {'true' if value else 'false'}")
+        elif isinstance(value, (int, float)):
+            lines.append(f"{key}: {value}")
+        elif "\n" in value:
+            lines.append(f"{key}: |")
+            lines.extend(f"  {line}" if line.strip() else "" for line in value.split("\n"))
+        else:
+            lines.append(f'{key}: "{value}"')
+    lines.append("---")
+    return "\n".join(lines) + "\n" + body + "\n"
+
+
+def paper_identity(title, year):
+    """Return a short hash identifying a paper by normalized title and year."""
+    normalized = re.sub(r"[\W_]+", "", str(title).lower())
+    return hashlib.sha1(f"{normalized}:{year}".encode("utf-8")).digest()[:12]
+
+
+def write_new_file(path, text):
+    """Create a file, returning False instead of overwriting one that exists."""
+    try:
+        with open(path, "x", encoding="utf-8") as f:
+            f.write(text)
+    except FileExistsError:
+        return False
+    return True
+
+
+def convert_bibtex_entries(raws, macros):
+    """Convert raw entries to (slug, identity, file text), or None where malformed.
+    
+    Runs in worker processes during an import.
+    """
+    results = []
+    for raw in raws:
+        parsed = parse_bibtex_entry(raw, macros)
+        if parsed is None:
+            results.append(None)
+            continue
+        data, abstract = bibtex_to_paper(*parsed, expand_bibtex_macros(raw, macros))
+        identity = paper_identity(data["title"], data.get("year", ""))
+        results.append((data["slug"], identity, format_frontmatter(data, abstract)))
+    return results
+
+
+def import_bibtex(bib_path, jobs=None, batch_size=BIBTEX_IMPORT_BATCH, writers=BIBTEX_IMPORT_WRITERS):
+    """Import every entry of a BibTeX file as content/papers/<slug>.md. Returns the exit code.
+    
+    Entries are converted a batch at a time on `jobs` worker processes, then
+    deduplicated in file order against the slugs and title/year hashes of
+    existing and earlier papers, and written on a thread pool. At most a few
+    batches are in flight, so memory stays bounded however large the file is.
+    """
+    jobs = jobs or BUILD_JOBS
+    bib_path = Path(bib_path)
+    if not bib_path.is_file():
+        print(f"Error: {bib_path} does not exist")
+        return 2
+    print(f"Importing papers from {bib_path}...")
+    started = time.perf_counter()
+    
+    papers_dir = CONTENT_DIR / "papers"
+    papers_dir.mkdir(parents=True, exist_ok=True)
+    slugs = {path.stem for path in papers_dir.glob("*.md")}
+    identities = set()
+    for paper in load_content_files("papers"):
+        slugs.add(item_slug(paper))
+        identities.add(paper_identity(paper.get("title", ""), paper.get("year", "")))
+    
+    counts = {"imported": 0, "duplicates": 0, "malformed": 0, "skipped": 0}
+    macros = {}
+    
+    def write_batch(results):
+        files = []
+        for result in results:
+            if result is None:
+                counts["malformed"] += 1
+                continue
+            slug, identity, text = result
+            if slug in slugs or identity in identities:
+                counts["duplicates"] += 1
+                continue
+            slugs.add(slug)
+            identities.add(identity)
+            files.append((papers_dir / f"{slug}.md", text))
+        for written in writer.map(lambda job: write_new_file(*job), files):
+            counts["imported" if written else "duplicates"] += 1
+    
+    def convert_batch(raws):
+        if workers:
+            pending.append(workers.submit(convert_bibtex_entries, raws, dict(macros)))
+            while len(pending) > jobs:
+                write_batch(pending.popleft().result())
+        else:
+            write_batch(convert_bibtex_entries(raws, macros))
+    
+    pending = collections.deque()
+    raws = []
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(open(bib_path, "r", encoding="utf-8", errors="replace"))
+        writer = stack.enter_context(ThreadPoolExecutor(writers))
+        workers = stack.enter_context(ProcessPoolExecutor(jobs)) if jobs > 1 else None
+        for raw in iter_bibtex_entries(f):
+            if raw is None:
+                counts["malformed"] += 1
+                continue
+            entry_type = BIBTEX_ENTRY_START.match(raw).group(1).lower()
+            if entry_type in BIBTEX_SKIPPED_TYPES:
+                # @string macros apply to the entries after them, so they are read here
+                parsed = parse_bibtex_entry(raw, macros) if entry_type == "string" else None
+                if parsed:
+                    macros.update(parsed[2])
+                counts["skipped"] += 1
+                continue
+            raws.append(raw)
+            if len(raws) >= batch_size:
+                convert_batch(raws)
+                raws = []
+        if raws:
+            convert_batch(raws)
+        while pending:
+            write_batch(pending.popleft().result())
+    
+    print(f"  {counts['imported']} papers imported, {counts['duplicates']} duplicates skipped")
+    if counts["malformed"] or counts["skipped"]:
+        print(f"  {counts['malformed']} malformed entries, {counts['skipped']} @string/@comment/@preamble blocks")
+    print(f"  Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+# =============================================================================
+# Build Pipeline
+# =============================================================================
+
+class Stage:
+    """One step of the build pipeline.
+    
+    inputs name what the stage reads, so it can be skipped when none of them
+    changed: "content:<type>" (content/<type>/*.md), "files:<glob>" (source
+    files), "setting:<NAME>" (a module setting) and "code" (build.py, which
+    holds the templates). outputs are globs under OUTPUT_DIR; a stage also
+    re-runs when they were edited or deleted. after names stages whose
+    outputs it reads. run(content) gets {"papers": [...], "projects": [...]},
+    already sorted for listing.
+    """
+    
+    def __init__(self, name, run, inputs=(), outputs=(), after=()):
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+
+
+# Registered stages; registration order is a valid run order and the log order
+BUILD_STAGES = {}
+
+
+def register_stage(name, run, inputs=(), outputs=(), after=()):
+    """Add a stage to the pipeline. Stages it runs after must be registered first."""
+    unknown = [dependency for dependency in after if dependency not in BUILD_STAGES]
+    if unknown:
+        raise ValueError(f"Stage '{name}' runs after unknown stage(s): {', '.join(unknown)}")
+    BUILD_STAGES[name] = Stage(name, run, inputs, outputs, after)
+
+
+CARD_IMAGE_INPUTS = "files:assets/images/**/*"  # Card markup carries image sizes
+
+register_stage(
+    "papers", lambda content: build_papers_page(content["papers"]),
+    inputs=("content:papers", "code", CARD_IMAGE_INPUTS, "setting:VIRTUAL_LIST_ENABLED"),
+    outputs=("papers.html", f"{VIRTUAL_LIST_DIR}/*.json"),
+)
+register_stage(
+    "paper-details", lambda content: build_paper_details(content["papers"]),
+    inputs=("content:papers", "code"),
+    outputs=(f"{PAPER_PAGES_DIR}/*.html",),
+)
+register_stage(
+    "bibtex", lambda content: build_bibtex_files(content["papers"]),
+    inputs=("content:papers", "code"),
+    outputs=(f"{PAPER_PAGES_DIR}/*.bib", "papers.bib"),
+)
+register_stage(
+    "projects", lambda content: build_projects_page(content["projects"]),
+    inputs=("content:projects", "code", CARD_IMAGE_INPUTS),
+    outputs=("projects.html",),
+)
+register_stage(
+    "featured", lambda content: build_featured_index(content["papers"], content["projects"]),
+    inputs=("content:papers", "content:projects", "code", CARD_IMAGE_INPUTS),
+    outputs=("index.html",),
+)
+register_stage(
+    "feeds", lambda content: build_feeds(content["papers"], content["projects"]),
+    inputs=("content:papers", "content:projects", "code"),
+    outputs=("papers*.json", "projects*.json", "feed.xml"),
+)
+
+# Stages per build flag
+STAGE_GROUPS = {
+    "papers": ("papers", "paper-details", "bibtex"),
+    "projects": ("projects",),
+}
+
+# Content handed to stage worker processes by init_stage_worker()
+stage_content = {}
+
+
+def files_signature(base, pattern):
+    """Hash the names, sizes and mtimes of the files matching pattern under base."""
+    entries = []
+    for path in sorted(base.glob(pattern)):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if not path.is_dir():
+            entries.append((path.relative_to(base).as_posix(), stat.st_size, stat.st_mtime_ns))
+    return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+def input_signature(spec, memo):
+    """Return the current signature of one stage input, memoized for the run."""
+    if spec not in memo:
+        kind, _, arg = spec.partition(":")
+        if kind == "content":
+            memo[spec] = files_signature(CONTENT_DIR / arg, "*.md")
+        elif kind == "files":
+            memo[spec] = files_signature(SOURCE_DIR, arg)
+        elif kind == "setting":
+            memo[spec] = repr(globals()[arg])
+        elif kind == "code":
+            memo[spec] = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        else:
+            raise ValueError(f"Unknown stage input '{spec}'")
+    return memo[spec]
+
+
+def output_signature(stage):
+    return hashlib.sha256(
+        "".join(files_signature(OUTPUT_DIR, pattern) for pattern in stage.outputs).encode("utf-8")
+    ).hexdigest()
+
+
+def run_stage(stage, content):
+    """Run one stage with its output captured. Returns a result dict.
+    
+    Exceptions are caught and returned, so one failing stage does not stop the others.
+    """
+    before = dict(card_cache_stats)
+    cache_before = collections.Counter(BUILD_CACHE.stats)
+    buffer = io.StringIO()
+    error = None
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            stage.run(content)
+    except Exception:
+        error = traceback.format_exc()
+    return {
+        "output": buffer.getvalue(),
+        "error": error,
+        "seconds": time.perf_counter() - started,
+        "hits": card_cache_stats["hits"] - before["hits"],
+        "misses": card_cache_stats["misses"] - before["misses"],
+        "cache": dict(BUILD_CACHE.stats - cache_before),
+    }
+
+
+def init_stage_worker(settings, content):
+    """Give a worker process the parent's build settings and loaded content."""
+    global OUTPUT_DIR, CARD_CACHE_ENABLED, VIRTUAL_LIST_ENABLED, BUILD_JOBS, SITE_ARCHIVE, BUILD_CACHE, CATALOG
+    OUTPUT_DIR, CARD_CACHE_ENABLED, VIRTUAL_LIST_ENABLED, archiving, cache_dir, catalog = settings
+    # The stage pool already uses every job; a pool per worker would start jobs x jobs processes
+    BUILD_JOBS = 1
+    SITE_ARCHIVE = SiteArchive(OUTPUT_DIR) if archiving else None
+    BUILD_CACHE = BuildCache(cache_dir)
+    # SQLite connections cannot cross processes; the parent has already synced the catalog
+    CATALOG = ContentCatalog() if catalog else None
+    stage_content.update(content)
+
+
+def run_stage_in_worker(name):
+    result = run_stage(BUILD_STAGES[name], stage_content)
+    if SITE_ARCHIVE is not None:
+        # Hand the entries written here to the parent's archive
+        result["archived"] = SITE_ARCHIVE.take()
+    return result
+
+
+def run_stages(names=None, jobs=None, force=False):
+    """Run stages as a DAG, skipping those whose inputs and outputs are unchanged.
+    
+    A stage starts as soon as the stages it runs after have finished; runnable
+    stages share a process pool. Content is loaded once, and only if a stage
+    has to run. Logs are printed per stage in registration order, and the
+    state and timings of each stage are kept in .build-cache/. Returns the
+    names of the stages that failed.
+    """
+    jobs = jobs or BUILD_JOBS
+    stages = [stage for stage in BUILD_STAGES.values() if names is None or stage.name in names]
+    selected = {stage.name for stage in stages}
+    state_path = CACHE_DIR / f"stages-{output_cache_key()}.json"
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    
+    memo = {}
+    outputs = {}  # Output signature of each finished (or unselected) stage
+    results = {}
+    
+    def signature(stage):
+        parts = [input_signature(spec, memo) for spec in stage.inputs]
+        for dependency in stage.after:
+            if dependency not in outputs:
+                outputs[dependency] = output_signature(BUILD_STAGES[dependency])
+            parts.append(outputs[dependency])
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+    
+    def up_to_date(stage, inputs):
+        previous = state.get(stage.name, {})
+        return not force and previous.get("inputs") == inputs and previous.get("outputs") == output_signature(stage)
+    
+    # Stages with no dependencies can be checked before loading anything
+    ready = [stage for stage in stages if not selected & set(stage.after)]
+    for stage in ready:
+        inputs = signature(stage)
+        if up_to_date(stage, inputs):
+            results[stage.name] = {"skipped": True}
+            outputs[stage.name] = state[stage.name]["outputs"]
+    if all(stage.name in results for stage in stages):
+        print(f"Stages: all {len(stages)} up to date")
+        return []
+    
+    kinds = {spec.partition(":")[2] for stage in stages for spec in stage.inputs if spec.startswith("content:")}
+    content = {kind: load_sorted_content(kind) if kind in kinds else [] for kind in CATALOG_KINDS}
+    
+    # The daemon keeps rendered cards in its own memory, which worker processes cannot fill
+    runnable = len(stages) - sum(1 for result in results.values() if result.get("skipped"))
+    parallel = (
+        jobs > 1 and runnable > 1 and CARD_MEMORY_CACHE is None
+        and sum(len(items) for items in content.values()) >= PARALLEL_MIN_ITEMS
+    )
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if parallel:
+            settings = (
+                OUTPUT_DIR, CARD_CACHE_ENABLED, VIRTUAL_LIST_ENABLED,
+                SITE_ARCHIVE is not None, BUILD_CACHE.root, CATALOG is not None,
+            )
+            pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=min(jobs, runnable), initializer=init_stage_worker, initargs=(settings, content)
+            ))
+        
+        waiting = [stage for stage in stages if stage.name not in results]
+        running = {}
+        while waiting or running:
+            for stage in list(waiting):
+                if any(dep in selected and dep not in results for dep in stage.after):
+                    continue
+                waiting.remove(stage)
+                failed_dependencies = [dep for dep in stage.after if results.get(dep, {}).get("error")]
+                if failed_dependencies:
+                    results[stage.name] = {"error": f"not run: {', '.join(failed_dependencies)} failed\n"}
+                    continue
+                inputs = signature(stage)
+                if stage.after and up_to_date(stage, inputs):
+                    results[stage.name] = {"skipped": True}
+                    outputs[stage.name] = state[stage.name]["outputs"]
+                    continue
+                if pool:
+                    future = pool.submit(run_stage_in_worker, stage.name)
+                else:
+                    future = Future()
+                    future.set_result(run_stage(stage, content))
+                running[future] = (stage, inputs)
+            if not running:
+                continue
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, inputs = running.pop(future)
+                result = results[stage.name] = future.result()
+                if pool:
+                    card_cache_stats["hits"] += result["hits"]
+                    card_cache_stats["misses"] += result["misses"]
+                    BUILD_CACHE.stats.update(result["cache"])
+                    if SITE_ARCHIVE is not None:
+                        SITE_ARCHIVE.merge(result.get("archived", {}))
+                if result["error"]:
+                    state.pop(stage.name, None)
+                    continue
+                outputs[stage.name] = output_signature(stage)
+                state[stage.name] = {"inputs": inputs, "outputs": outputs[stage.name], "seconds": result["seconds"]}
+    
+    failed = []
+    timings = []
+    for stage in stages:
+        result = results[stage.name]
+        if result.get("skipped"):
+            timings.append(f"{stage.name} up to date")
+            continue
+        sys.stdout.write(result.get("output", ""))
+        if result["error"]:
+            print(f"  Error: stage '{stage.name}' failed")
+            print("    " + result["error"].rstrip().replace("\n", "\n    "))
+            failed.append(stage.name)
+        else:
+            timings.append(f"{stage.name} {result['seconds'] * 1000:.0f} ms")
+    mode = "in parallel" if parallel else "sequentially"
+    print(f"Stages ({mode}): {', '.join(timings)}; {(time.perf_counter() - started) * 1000:.0f} ms total")
+    
+    try:
+        atomic_write(state_path, json.dumps(state, indent=2, sort_keys=True).encode("utf-8"))
+    except OSError as e:
+        print(f"  Warning: could not write stage state ({e})")
+    return failed
+
+
+# =============================================================================
+# In-Memory Rendering and Preview Server
+# =============================================================================
+
+def render_site(card_store=None):
+    """Run the load/sort/render pipeline and return {path: bytes} without writing to disk.
+    
+    index.html is read from OUTPUT_DIR so its featured sections can be filled in.
+    """
+    store = {} if card_store is None else card_store
+    papers = sort_papers(load_content_files("papers"))
+    projects = sort_projects(load_content_files("projects"))
+    
+    shards = render_paper_shards(papers, store)
+    files = {
+        "papers.html": render_papers_page(papers, store, shards),
+        "projects.html": render_projects_page(projects, store),
+    }
+    if shards:
+        files.update(shards[1])
+    related = related_papers(papers)
+    for paper in papers:
+        detail_path = f"{PAPER_PAGES_DIR}/{item_slug(paper)}.html"
+        if detail_path not in files:
+            files[detail_path] = render_paper_detail(paper, related.get(item_slug(paper), []))
+    files.update(render_bibtex_files(papers))
+    files.update(render_feeds(papers, projects))
+    
+    index_path = OUTPUT_DIR / "index.html"
+    if index_path.exists():
+        index_html = index_path.read_text(encoding="utf-8")
+        files["index.html"], _ = render_featured_index(index_html, papers, projects, store)
+    
+    return {path: text.encode("utf-8") for path, text in files.items()}
+
+
+def content_signature():
+    """Return a cheap fingerprint (path, size, mtime) of every input render_site reads."""
+    paths = sorted(CONTENT_DIR.glob("*/*.md"))
+    paths.append(OUTPUT_DIR / "index.html")
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((path.as_posix(), stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def strong_etag(body):
+    """Return a strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """Evaluate an If-None-Match header against an ETag (weak comparison, per RFC 9110)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class PreviewSite:
+    """Rendered pages and static files held in memory for the preview server.
+    
+    Pages are re-rendered lazily: at most once per reload_interval a request
+    checks content_signature(), and only a changed signature triggers render_site().
+    """
+    
+    def __init__(self, root=None, reload_interval=SERVER_RELOAD_INTERVAL):
+        self.root = Path(root or OUTPUT_DIR)
+        self.reload_interval = reload_interval
+        self.pages = {}
+        self.static = {}
+        self.card_store = {}
+        self.signature = None
+        self.checked_at = 0.0
+        self.lock = None
+        self.header_rules = []
+        self.header_rules_etag = None
+    
+    async def refresh(self):
+        """Re-render pages if content changed since the last check."""
+        now = time.monotonic()
+        if self.signature is not None and now - self.checked_at < self.reload_interval:
+            return
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if self.signature is not None and time.monotonic() - self.checked_at < self.reload_interval:
+                return
+            signature = await asyncio.to_thread(content_signature)
+            if signature != self.signature:
+                started = time.perf_counter()
+                rendered = await asyncio.to_thread(render_site, self.card_store)
+                self.pages = {path: (body, strong_etag(body)) for path, body in rendered.items()}
+                self.signature = signature
+                print(f"  Rendered {len(self.pages)} files in {(time.perf_counter() - started) * 1000:.0f} ms")
+            self.checked_at = time.monotonic()
+    
+    def static_file(self, path):
+        """Return (body, etag) for a file under root, re-reading it only when it changes.
+        
+        Missing files are remembered too (every request looks up _headers),
+        until the next check reload_interval later.
+        """
+        now = time.monotonic()
+        cached = self.static.get(path)
+        if cached and now - cached[0] < self.reload_interval:
+            return cached[2]
+        file_path = self.root / path
+        try:
+            stat = file_path.stat()
+        except OSError:
+            stat = None
+        if stat is None or not file_path.is_file():
+            self.static[path] = (now, None, None)
+            return None
+        key = (stat.st_size, stat.st_mtime_ns)
+        if cached and cached[1] == key:
+            entry = cached[2]
+        else:
+            body = file_path.read_bytes()
+            entry = (body, strong_etag(body))
+        self.static[path] = (now, key, entry)
+        return entry
+    
+    def lookup(self, path):
+        """Return (body, etag) for a site path, preferring freshly rendered pages."""
+        return self.pages.get(path) or self.static_file(path)
+    
+    def hosting_headers(self, *url_paths):
+        """Return the _headers rules under root for the first URL path any rule matches."""
+        entry = self.static_file(HEADERS_FILE)
+        if entry is None:
+            return {}
+        if entry[1] != self.header_rules_etag:
+            self.header_rules = parse_headers_file(entry[0].decode("utf-8"))
+            self.header_rules_etag = entry[1]
+        for url_path in url_paths:
+            headers = headers_for_path(self.header_rules, url_path)
+            if headers:
+                return headers
+        return {}
+    
+    async def respond(self, method, target, headers):
+        """Return (status, headers, body) for a request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b"Method Not Allowed\n"
+        
+        path = posixpath.normpath("/" + unquote(urlsplit(target).path)).lstrip("/")
+        if urlsplit(target).path.endswith("/") or path in ("", "."):
+            path = posixpath.join(path, "index.html") if path not in ("", ".") else "index.html"
+        if any(part.startswith(".") for part in path.split("/")) or path == HEADERS_FILE:
+            return 404, {"Content-Type": "text/plain"}, b"Not Found\n"
+        
+        await self.refresh()
+        entry = self.lookup(path)
+        status = 200
+        if entry is None and "." not in posixpath.basename(path):
+            for candidate in (path + "/index.html", path + ".html"):
+                entry = self.lookup(candidate)
+                if entry is not None:
+                    path = candidate
+                    break
+        if entry is None:
+            status = 404
+            entry = self.lookup("404.html")
+            path = "404.html"
+            if entry is None:
+                return 404, {"Content-Type": "text/plain"}, b"Not Found\n"
+        
+        body, etag = entry
+        response_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        # Honor the build's _headers file the way the production host would
+        for name, value in self.hosting_headers(urlsplit(target).path, "/" + path).items():
+            for existing in [key for key in response_headers if key.lower() == name.lower()]:
+                del response_headers[existing]
+            response_headers[name] = value
+        if status == 200 and etag_matches(headers.get("if-none-match", ""), etag):
+            return 304, response_headers, b""
+        
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/json", "application/xml", "application/javascript"):
+            content_type += "; charset=utf-8"
+        response_headers["Content-Type"] = content_type
+        return status, response_headers, body
+
+
+HTTP_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+async def handle_preview_connection(site, reader, writer):
+    """Serve HTTP/1.1 requests (with keep-alive) on one connection."""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                method, target, version = None, "/", "HTTP/1.0"
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            
+            connection = headers.get("connection", "").lower()
+            keep_alive = (version == "HTTP/1.1" and connection != "close") or connection == "keep-alive"
+            if method is None:
+                status, response_headers, body = 400, {"Content-Type": "text/plain"}, b"Bad Request\n"
+                keep_alive = False
+            elif "content-length" in headers or "transfer-encoding" in headers:
+                # Request bodies are never expected; drop the connection instead of parsing them
+                status, response_headers, body = 405, {"Allow": "GET, HEAD"}, b"Method Not Allowed\n"
+                keep_alive = False
+            else:
+                status, response_headers, body = await site.respond(method, target, headers)
+            
+            response_headers["Content-Length"] = str(len(body))
+            response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+            head_lines = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}"]
+            head_lines += [f"{name}: {value}" for name, value in response_headers.items()]
+            writer.write(("\r\n".join(head_lines) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD" and status != 304:
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_preview_server(host=SERVER_HOST, port=SERVER_PORT, site=None):
+    """Start the preview server and return (server, site) without blocking."""
+    site = site or PreviewSite()
+    await site.refresh()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_preview_connection(site, reader, writer), host, port
+    )
+    return server, site
+
+
+def serve(host=SERVER_HOST, port=SERVER_PORT, root=None):
+    """Serve the site from memory until interrupted."""
+    async def run():
+        server, _ = await start_preview_server(host, port, PreviewSite(root))
+        print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
 # =============================================================================
 # Main
 # =============================================================================
 
-def main():
+def build_arg_parser():
+    """Return the command-line parser shared by main() and the build daemon."""
     parser = argparse.ArgumentParser(
         description="Build static pages from markdown content"
     )
     parser.add_argument("--papers", action="store_true", help="Build only papers page")
     parser.add_argument("--projects", action="store_true", help="Build only projects page")
     parser.add_argument("--init", action="store_true", help="Create sample content files")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every card, ignoring the card cache")
+    parser.add_argument("--check-budgets", action="store_true", help="Only check page-weight budgets")
+    parser.add_argument("--budgets", metavar="FILE", help="JSON file overriding PERFORMANCE_BUDGETS")
+    parser.add_argument("--no-budgets", action="store_true", help="Skip the page-weight budget check")
+    parser.add_argument("--serve", action="store_true", help="Serve the site from memory with live re-rendering")
+    parser.add_argument("--host", default=SERVER_HOST, help="Preview server host")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Preview server port")
+    parser.add_argument("--daemon", action="store_true", help="Keep content warm and accept rebuilds on a Unix socket")
+    parser.add_argument("--rebuild", action="store_true", help="Ask a running daemon to build (other flags are forwarded)")
+    parser.add_argument("--stop-daemon", action="store_true", help="Stop a running build daemon")
+    parser.add_argument("--output", metavar="DIR", help="Write the complete site to DIR instead of in place")
+    parser.add_argument("--optimize-css", action="store_true", help="Purge unused CSS and inline critical CSS (needs --output)")
+    parser.add_argument("--self-host-fonts", action="store_true", help="Subset and self-host web fonts (needs --output)")
+    parser.add_argument("--fingerprint", action="store_true", help="Reference assets by content-hashed names (needs --output)")
+    parser.add_argument("--svg-sprite", action="store_true", help="Reference icons from one SVG sprite (needs --output)")
+    parser.add_argument("--service-worker", action="store_true", help="Generate an offline-capable service worker (needs --output)")
+    parser.add_argument("--archive", metavar="FILE", help="Also write the site to a reproducible zip (needs --output)")
+    parser.add_argument("--cdn-base", metavar="URL", help="Load assets from this CDN base URL, with SRI hashes (needs --output)")
+    parser.add_argument("--deployed-manifest", metavar="FILE", help="Compute the deploy delta against this manifest instead of the last one marked deployed")
+    parser.add_argument("--delta", metavar="FILE", help="Write the deploy delta here (outside --output) instead of the build cache")
+    parser.add_argument("--mark-deployed", action="store_true", help="Record the --output DIR deploy manifest as live, after a successful deploy")
+    parser.add_argument("--virtualize", action="store_true", help="Render papers.html as a virtualized list fed by JSON shards")
+    parser.add_argument("--catalog", action="store_true", help="Read content through the SQLite catalog in .build-cache/")
+    parser.add_argument("--query", nargs="+", metavar="FILTER", help="Query the catalog: kind=, featured=, tag=, author=, year=, limit=")
+    parser.add_argument("--import-bib", metavar="FILE", help="Import the entries of a BibTeX file into content/papers/")
+    parser.add_argument("--cache-dir", metavar="DIR", help="Content-addressed cache directory, shareable between builds (default: $BUILD_CACHE_DIR or .build-cache)")
+    parser.add_argument("--jobs", type=int, default=BUILD_JOBS, help="Worker processes for per-item pages")
+    return parser
+
+
+def run_build(args):
+    """Run one build for parsed arguments and return the process exit code."""
+    global CARD_CACHE_ENABLED, BUILD_JOBS, OUTPUT_DIR, VIRTUAL_LIST_ENABLED, CATALOG, SITE_ARCHIVE, CDN_BASE_URL, BUILD_CACHE
     
-    args = parser.parse_args()
+    CARD_CACHE_ENABLED = not args.no_cache
+    VIRTUAL_LIST_ENABLED = args.virtualize
+    OUTPUT_DIR = Path(args.output) if args.output else SOURCE_DIR
+    CDN_BASE_URL = args.cdn_base.rstrip("/") + "/" if args.cdn_base else None
+    BUILD_JOBS = max(1, args.jobs)
+    card_cache_stats.update(hits=0, misses=0)
+    BUILD_CACHE = BuildCache(args.cache_dir or BUILD_CACHE_DIR)
     
     print("=" * 60)
     print("Academic Portfolio Static Site Generator")
@@ -743,21 +4661,272 @@ def main():
     
     if args.init:
         create_sample_content()
-        return
+        return 0
+    if args.mark_deployed:
+        if output_is_source():
+            print("Error: --mark-deployed records an exported site's manifest; use it with --output DIR")
+            return 2
+        return mark_deployed()
+    
+    budgets = load_budgets(args.budgets) if args.budgets else PERFORMANCE_BUDGETS
+    if args.check_budgets:
+        return 1 if check_budgets(budgets) else 0
+    
+    for flag in ("optimize_css", "self_host_fonts", "svg_sprite", "fingerprint", "cdn_base", "service_worker"):
+        if getattr(args, flag) and output_is_source():
+            print(f"Error: --{flag.replace('_', '-')} rewrites hand-written pages; use it with --output DIR")
+            return 2
+    if args.self_host_fonts and font_setup_error():
+        print(f"Error: {font_setup_error()}")
+        return 2
+    if args.cdn_base and urlsplit(args.cdn_base).scheme not in ("http", "https"):
+        print(f"Error: --cdn-base needs an absolute http(s) URL, got '{args.cdn_base}'")
+        return 2
+    if args.archive and output_is_source():
+        print("Error: --archive packs an exported site; use it with --output DIR")
+        return 2
+    if args.delta and (output_is_source() or Path(args.delta).resolve().is_relative_to(OUTPUT_DIR.resolve())):
+        print("Error: --delta is read by the deploy step; use it with --output DIR and write it outside DIR")
+        return 2
+    # Every file the build writes from here on is compressed into the archive as it is written
+    SITE_ARCHIVE = SiteArchive(OUTPUT_DIR) if args.archive else None
+    export_static_site()
+    
+    if args.catalog:
+        CATALOG = ContentCatalog()
+        updated, removed, unchanged = CATALOG.sync()
+        print(f"Catalog: {updated} items updated, {removed} removed, {unchanged} unchanged")
     
     # Build specific or all pages
     if args.papers:
-        build_papers_page()
+        stages = STAGE_GROUPS["papers"]
     elif args.projects:
-        build_projects_page()
+        stages = STAGE_GROUPS["projects"]
     else:
-        build_papers_page()
-        build_projects_page()
-        build_featured_index()
+        stages = None
+    try:
+        failed = run_stages(stages, force=args.no_cache)
+    finally:
+        if CATALOG is not None:
+            CATALOG.close()
+            CATALOG = None
+    if failed:
+        print("=" * 60)
+        print(f"Build failed: {', '.join(failed)}")
+        print("=" * 60)
+        return 1
+    
+    if args.self_host_fonts:
+        self_host_fonts()
+    if args.optimize_css:
+        optimize_css()
+    if args.svg_sprite:
+        build_svg_sprite()
+    if args.fingerprint:
+        fingerprint_assets()
+    if args.cdn_base:
+        rewrite_for_cdn()
+    if args.service_worker:
+        build_service_worker()
+    if not output_is_source():
+        build_headers_file()
+        build_deploy_manifest(args.deployed_manifest, args.delta)
+    
+    if CARD_CACHE_ENABLED:
+        print(f"Card cache: {card_cache_stats['hits']} reused, {card_cache_stats['misses']} rendered")
+    if BUILD_CACHE.stats:
+        print(f"Build cache ({BUILD_CACHE.root}): {BUILD_CACHE.summary()} hits")
+    evicted = BUILD_CACHE.prune()
+    if evicted:
+        print(f"  Evicted {evicted} cache entries")
+    
+    if not (args.papers or args.projects or args.no_budgets):
+        violations = check_budgets(budgets)
+        if violations:
+            print("=" * 60)
+            print(f"Build failed: {len(violations)} performance budget(s) exceeded")
+            print("=" * 60)
+            return 1
+    
+    if args.archive:
+        write_site_archive(args.archive)
+        SITE_ARCHIVE = None
     
     print("=" * 60)
     print("Build complete!")
     print("=" * 60)
+    return 0
+
+
+# =============================================================================
+# Build Daemon
+# =============================================================================
+
+class SocketLineWriter(io.TextIOBase):
+    """Text stream that forwards each complete line to a client as a JSON message."""
+    
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = ""
+        self.connected = True
+    
+    def write(self, text):
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            self.send({"out": line})
+        return len(text)
+    
+    def flush(self):
+        if self.buffer:
+            self.send({"out": self.buffer})
+            self.buffer = ""
+    
+    def send(self, message):
+        if not self.connected:
+            return
+        try:
+            self.sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        except OSError:
+            # The client went away; finish the build anyway so outputs stay consistent
+            self.connected = False
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    """Run one build per connection, streaming its output back to the client."""
+    
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            request = {}
+        out = SocketLineWriter(self.connection)
+        
+        if request.get("command") == "stop":
+            out.send({"out": "Daemon stopping"})
+            out.send({"exit": 0})
+            # shutdown() waits for serve_forever() to return, so it must run on another thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        
+        argv = [str(arg) for arg in request.get("args", [])]
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+            try:
+                args = build_arg_parser().parse_args(argv)
+                if args.daemon or args.serve or args.rebuild or args.stop_daemon:
+                    print("Error: daemon requests can only run builds")
+                    code = 2
+                else:
+                    code = run_build(args)
+            except SystemExit as e:  # argparse errors and --help
+                code = e.code if isinstance(e.code, int) else 2
+            except Exception as e:
+                print(f"Error: build failed: {e!r}")
+                code = 1
+            print(f"(daemon build took {(time.perf_counter() - started) * 1000:.0f} ms)")
+        out.flush()
+        out.send({"exit": code})
+
+
+def run_daemon(socket_path=DAEMON_SOCKET):
+    """Serve rebuild requests until stopped, keeping parsed content and caches warm."""
+    global CARD_MEMORY_CACHE
+    
+    if socket_path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(socket_path))
+            print(f"Error: a build daemon is already listening on {socket_path}")
+            return 1
+        except OSError:
+            socket_path.unlink()  # Left behind by a daemon that did not exit cleanly
+    
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    CARD_MEMORY_CACHE = {}
+    
+    # Warm the caches before the first request arrives
+    load_content_files("papers")
+    load_content_files("projects")
+    get_page_header()
+    get_page_footer()
+    
+    print(f"Build daemon listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        # Requests are handled one at a time: builds share module-level state
+        with socketserver.UnixStreamServer(str(socket_path), BuildRequestHandler) as server:
+            server.serve_forever(poll_interval=0.2)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def daemon_build_args(argv):
+    """Return the arguments of a --rebuild to forward, with DAEMON_PATH_OPTIONS values made absolute."""
+    forwarded = []
+    takes_path = False
+    for arg in argv:
+        option, separator, value = arg.partition("=")
+        if takes_path:
+            arg = os.path.abspath(arg)
+        elif separator and option in DAEMON_PATH_OPTIONS:
+            arg = f"{option}={os.path.abspath(value)}"
+        takes_path = arg in DAEMON_PATH_OPTIONS
+        if arg != "--rebuild":
+            forwarded.append(arg)
+    return forwarded
+
+
+def send_daemon_request(request, socket_path=DAEMON_SOCKET):
+    """Send a request to the build daemon, echoing its output. Returns the exit code."""
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(socket_path))
+    except OSError:
+        print(f"Error: no build daemon on {socket_path}; start one with: python build.py --daemon")
+        return 2
+    
+    with sock, sock.makefile("rwb") as stream:
+        stream.write((json.dumps(request) + "\n").encode("utf-8"))
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if "out" in message:
+                print(message["out"], flush=True)
+            if "exit" in message:
+                return message["exit"]
+    print("Error: build daemon closed the connection")
+    return 1
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    global VIRTUAL_LIST_ENABLED
+    
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    
+    if args.rebuild:
+        sys.exit(send_daemon_request({"args": daemon_build_args(sys.argv[1:])}))
+    if args.stop_daemon:
+        sys.exit(send_daemon_request({"command": "stop"}))
+    if args.daemon:
+        sys.exit(run_daemon())
+    if args.query:
+        sys.exit(run_catalog_query(args.query))
+    if args.import_bib:
+        sys.exit(import_bibtex(args.import_bib, max(1, args.jobs)))
+    if args.serve:
+        VIRTUAL_LIST_ENABLED = args.virtualize
+        serve(args.host, args.port, args.output)
+        return
+    
+    sys.exit(run_build(args))
 
 
 if __name__ == "__main__":
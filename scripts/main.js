@@ -90,15 +90,12 @@
      Card Click Handler
      ========================================================================== */
 
+  // Delegated, so cards added later (virtual-list.js) work without rebinding
   function initCardClicks() {
-    document.querySelectorAll('.card--clickable').forEach(function(card) {
-      const dataLink = card.getAttribute('data-link');
-      if (!dataLink) return;
-
-      card.addEventListener('click', function(e) {
-        if (e.target.closest('a, button')) return;
-        window.open(dataLink, '_blank', 'noopener,noreferrer');
-      });
+    document.addEventListener('click', function(e) {
+      const card = e.target.closest('.card--clickable[data-link]');
+      if (!card || e.target.closest('a, button')) return;
+      window.open(card.getAttribute('data-link'), '_blank', 'noopener,noreferrer');
     });
   }
 
@@ -107,18 +104,51 @@
      ========================================================================== */
 
   function initBibtexCopy() {
-    document.querySelectorAll('[data-bibtex]').forEach(function(btn) {
-      btn.addEventListener('click', function(e) {
-        e.preventDefault();
-        e.stopPropagation();
-        
-        const bibtex = btn.getAttribute('data-bibtex');
-        
-        navigator.clipboard.writeText(bibtex).then(function() {
-          const original = btn.textContent;
-          btn.textContent = 'Copied!';
-          setTimeout(function() { btn.textContent = original; }, 2000);
+    const bibtexCache = {};
+
+    function fetchBibtex(url) {
+      if (!bibtexCache[url]) {
+        bibtexCache[url] = fetch(url).then(function(response) {
+          if (!response.ok) throw new Error('BibTeX request failed: ' + response.status);
+          return response.text();
+        });
+        bibtexCache[url].catch(function() { delete bibtexCache[url]; });
+      }
+      return bibtexCache[url];
+    }
+
+    function copyText(textPromise) {
+      // ClipboardItem accepts a promise, which keeps the click's user activation
+      // alive while the citation is still being fetched (required by Safari).
+      if (window.ClipboardItem && navigator.clipboard.write) {
+        const blob = textPromise.then(function(text) {
+          return new Blob([text], { type: 'text/plain' });
         });
+        return navigator.clipboard.write([new ClipboardItem({ 'text/plain': blob })]);
+      }
+      return textPromise.then(function(text) {
+        return navigator.clipboard.writeText(text);
+      });
+    }
+
+    function flash(btn, message) {
+      const original = btn.textContent;
+      btn.textContent = message;
+      setTimeout(function() { btn.textContent = original; }, 2000);
+    }
+
+    document.addEventListener('click', function(e) {
+      const btn = e.target.closest('[data-bibtex-src], [data-bibtex]');
+      if (!btn) return;
+      e.preventDefault();
+
+      const src = btn.getAttribute('data-bibtex-src');
+      const bibtex = src ? fetchBibtex(src) : Promise.resolve(btn.getAttribute('data-bibtex'));
+
+      copyText(bibtex).then(function() {
+        flash(btn, 'Copied!');
+      }, function() {
+        flash(btn, 'Copy failed');
       });
     });
   }
@@ -0,0 +1,125 @@
+/* ==========================================================================
+   Virtual List
+   Streams a long listing in from JSON shards and keeps only the shards near
+   the viewport in the DOM (python build.py --virtualize)
+   ========================================================================== */
+
+(function() {
+  'use strict';
+
+  // Shards further than this from the viewport are swapped for empty spacers
+  const KEEP_MARGIN = '2000px 0px';
+  // The next shard is fetched once the end of the list is this close
+  const FETCH_MARGIN = '1000px 0px';
+
+  class VirtualList {
+    constructor(container) {
+      this.container = container;
+      this.pending = JSON.parse(container.getAttribute('data-shards') || '[]');
+      this.shardClass = container.firstElementChild ? container.firstElementChild.className : '';
+      this.detached = new WeakMap();
+      this.loading = false;
+
+      if (!('IntersectionObserver' in window)) {
+        this.loadAll();
+        return;
+      }
+
+      this.keepObserver = new IntersectionObserver(this.onKeepChange.bind(this), {
+        rootMargin: KEEP_MARGIN
+      });
+      Array.from(container.children).forEach(shard => this.keepObserver.observe(shard));
+
+      this.sentinel = document.createElement('div');
+      this.sentinel.setAttribute('aria-hidden', 'true');
+      container.after(this.sentinel);
+      this.fetchObserver = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+          this.loadNext();
+        }
+      }, { rootMargin: FETCH_MARGIN });
+      this.fetchObserver.observe(this.sentinel);
+    }
+
+    fetchShard(url) {
+      return fetch(url).then(response => {
+        if (!response.ok) throw new Error('Shard request failed: ' + response.status);
+        return response.json();
+      }).then(data => {
+        const shard = document.createElement('div');
+        shard.className = this.shardClass;
+        shard.innerHTML = data.cards.join('');
+        this.reveal(shard);
+        this.container.appendChild(shard);
+        return shard;
+      });
+    }
+
+    loadNext() {
+      if (this.loading || !this.pending.length) return;
+      this.loading = true;
+      const url = this.pending.shift();
+
+      this.fetchShard(url).then(shard => {
+        this.loading = false;
+        this.keepObserver.observe(shard);
+        // Re-observing re-checks the sentinel, which may still be in range
+        this.fetchObserver.unobserve(this.sentinel);
+        if (this.pending.length) {
+          this.fetchObserver.observe(this.sentinel);
+        }
+      }, () => {
+        this.pending.unshift(url);
+        this.loading = false;
+      });
+    }
+
+    loadAll() {
+      if (!this.pending.length) return;
+      this.fetchShard(this.pending.shift()).then(() => this.loadAll(), () => {});
+    }
+
+    onKeepChange(entries) {
+      entries.forEach(entry => {
+        const shard = entry.target;
+        if (entry.isIntersecting) {
+          this.attach(shard);
+        } else if (!shard.contains(document.activeElement)) {
+          this.detach(shard);
+        }
+      });
+    }
+
+    detach(shard) {
+      if (this.detached.has(shard)) return;
+      const height = shard.getBoundingClientRect().height;
+      this.detached.set(shard, shard.innerHTML);
+      shard.style.height = height + 'px';
+      shard.textContent = '';
+    }
+
+    attach(shard) {
+      if (!this.detached.has(shard)) return;
+      shard.innerHTML = this.detached.get(shard);
+      this.detached.delete(shard);
+      shard.style.height = '';
+      this.reveal(shard);
+    }
+
+    // Cards inserted after load are not watched by scroll-reveal.js, so show them as-is
+    reveal(shard) {
+      shard.querySelectorAll('.reveal').forEach(el => {
+        el.classList.add('is-revealed');
+      });
+    }
+  }
+
+  document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('[data-virtual-list]').forEach(container => {
+      new VirtualList(container);
+    });
+  });
+
+  window.VirtualList = VirtualList;
+
+})();
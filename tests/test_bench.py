@@ -0,0 +1,16 @@
+import sys
+
+import pytest
+
+import bench
+import build
+
+
+def test_missing_baseline_fails_the_comparison(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(build, "BUILD_CACHE", build.BUILD_CACHE)
+    monkeypatch.setattr(build, "BUILD_CACHE_DIR", build.BUILD_CACHE_DIR)
+    monkeypatch.setattr(sys, "argv", ["bench.py", "--baseline", str(tmp_path / "missing.json"), "--no-save"])
+    with pytest.raises(SystemExit) as exit_info:
+        bench.main()
+    assert exit_info.value.code == 2
+    assert "Error: no baseline" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import build
+
+
+def parse(text, macros=None):
+    return build.parse_bibtex_entry(text, macros)
+
+
+def test_nested_braces_and_escapes():
+    entry_type, key, fields = parse(
+        "@article{doe2024,\n"
+        "  title = {The {LSTM} and {\\\"O}ther {Nested {Braces}}},\n"
+        '  note = "Say {"}hi{"} \\} ok",\n'
+        "}"
+    )
+    assert (entry_type, key) == ("article", "doe2024")
+    assert fields["title"] == "The {LSTM} and {\\\"O}ther {Nested {Braces}}"
+    assert fields["note"] == 'Say {"}hi{"} \\} ok'
+
+
+def test_string_macros_and_concatenation():
+    macros = {}
+    macros.update(parse('@string{nips = "Advances in Neural Information Processing Systems"}')[2])
+    _, _, fields = parse(
+        "@inproceedings{x,\n"
+        "  booktitle = NIPS # { 37},\n"
+        '  title = "Part" # { one} # "," # 2,\n'
+        "  month = jan,\n"
+        "}",
+        macros,
+    )
+    assert fields["booktitle"] == "Advances in Neural Information Processing Systems 37"
+    assert fields["title"] == "Part one,2"
+    assert fields["month"] == "jan"
+
+
+def test_malformed_entries():
+    assert parse("@article{x, title = {unclosed") is None
+    assert parse("@article{nokey}") is None
+
+
+def test_expand_macros_keeps_other_text_byte_for_byte():
+    macros = {"nips": "Advances in {NeurIPS}"}
+    raw = (
+        "@inproceedings{x,\n"
+        "  title = {A---B \\emph{c}},\n"
+        "  booktitle = nips,\n"
+        "  month = jan # { and } # nips,\n"
+        "}"
+    )
+    expanded = build.expand_bibtex_macros(raw, macros)
+    assert expanded == (
+        "@inproceedings{x,\n"
+        "  title = {A---B \\emph{c}},\n"
+        "  booktitle = {Advances in {NeurIPS}},\n"
+        "  month = jan # { and Advances in {NeurIPS}},\n"
+        "}"
+    )
+    assert parse(expanded)[2]["booktitle"] == "Advances in {NeurIPS}"
+    assert build.expand_bibtex_macros(raw, {}) == raw
+
+
+def test_imported_entry_round_trips_through_frontmatter():
+    macros = {"icml": "International Conference on Machine Learning"}
+    raw = "@inproceedings{roe2023,\n  title = {Fast---and Slow},\n  booktitle = icml,\n  year = 2023,\n}"
+    [(slug, _, text)] = build.convert_bibtex_entries([raw], macros)
+    data, _ = build.parse_frontmatter(text)
+    assert slug == "roe2023"
+    assert data["title"] == "Fast\u2014and Slow"
+    assert data["venue"] == "International Conference on Machine Learning"
+    assert data["bibtex"] == raw.replace("icml", "{International Conference on Machine Learning}")
+
+
+def test_iter_bibtex_entries_splits_stream():
+    lines = [
+        "% comment\n",
+        "@string{a = {x}}\n",
+        "@article{one,\n",
+        "  title = {T {nested}},\n",
+        "}\n",
+        "@article{broken,\n",
+        "@misc{two, note = {n}}\n",
+    ]
+    entries = list(build.iter_bibtex_entries(lines))
+    assert entries[0] == "@string{a = {x}}"
+    assert entries[1].startswith("@article{one,") and entries[1].endswith("}")
+    assert entries[2] is None
+    assert entries[3] == "@misc{two, note = {n}}"
@@ -0,0 +1,23 @@
+import build
+
+
+def test_over_budget_pages_get_a_breakdown(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(build, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(build, "CDN_BASE_URL", None)
+    html = '<link rel="stylesheet" href="style.css"><link rel="canonical" href="big.png"><img src="big.png"><a href="other.html">'
+    (tmp_path / "index.html").write_text(html, encoding="utf-8")
+    (tmp_path / "other.html").write_text("<p>small</p>", encoding="utf-8")
+    (tmp_path / "style.css").write_text("body { background: url(bg.png) }" + " " * 4000, encoding="utf-8")
+    (tmp_path / "style.css.gz").write_bytes(b"x" * 512)  # Precompressed: this is what is sent
+    (tmp_path / "bg.png").write_bytes(b"x" * 1024)
+    (tmp_path / "big.png").write_bytes(b"x" * 3072)
+    budgets = {"default": {"image": 2048, "css": 1024}, "pages": {"other.html": {"html": 8}}}
+    
+    violations = build.check_budgets(budgets)
+    
+    assert violations == [("index.html", "image", 4096, 2048), ("other.html", "html", 12, 8)]
+    out = capsys.readouterr().out
+    total = len(html) + 512 + 4096
+    assert f"  index.html: css 0.5 KB, html {len(html) / 1024:.1f} KB, image 4.0 KB, total {total / 1024:.1f} KB" in out
+    assert "    OVER BUDGET: image 4.0 KB > 2.0 KB" in out
+    assert "OVER BUDGET: css" not in out
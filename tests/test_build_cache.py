@@ -0,0 +1,50 @@
+import os
+import time
+
+import pytest
+
+import build
+
+KEY = "ab" + "0" * 62
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = build.BuildCache(tmp_path)
+    assert cache.get("cards", KEY) is None
+    cache.put("cards", KEY, b"<article>")
+    assert cache.get("cards", KEY) == b"<article>"
+    assert cache.summary() == "cards 1/2"
+
+
+def test_rejects_unknown_namespaces_and_keys(tmp_path):
+    cache = build.BuildCache(tmp_path)
+    with pytest.raises(ValueError):
+        cache.put("elsewhere", KEY, b"x")
+    with pytest.raises(ValueError):
+        cache.put("cards", "../../etc", b"x")
+
+
+def test_prune_only_touches_own_entries(tmp_path):
+    cache = build.BuildCache(tmp_path, max_bytes=0)
+    cache.put("cards", KEY, b"x" * 10)
+    old_tmp = tmp_path / "cards" / "ab" / f".{KEY}.{'1' * 12}.tmp"
+    old_tmp.write_bytes(b"partial")
+    stale = time.time() - 7200
+    os.utime(old_tmp, (stale, stale))
+    
+    # Unrelated files in a shared directory that happen to match */??/*
+    strangers = [
+        tmp_path / "cards" / "ab" / "notes.txt",
+        tmp_path / "cards" / "ab" / ("cd" + "0" * 62),
+        tmp_path / "cards" / "zz" / ("zz" + "0" * 62),
+        tmp_path / "project" / "ab" / KEY,
+        tmp_path / "stages-abc.json",
+    ]
+    for path in strangers:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"keep me")
+    
+    assert cache.prune() == 2
+    assert not cache.path("cards", KEY).exists()
+    assert not old_tmp.exists()
+    assert all(path.exists() for path in strangers)
@@ -0,0 +1,37 @@
+import os
+import time
+
+import build
+
+DAY = 86400
+
+
+def render(item):
+    return f"<article>{item['title']}</article>" + " " * 1000
+
+
+def test_card_cache_evicts_old_then_least_recently_used_cards(tmp_path, monkeypatch):
+    cache = build.BuildCache(tmp_path, max_bytes=2500, max_age_days=30)
+    monkeypatch.setattr(build, "BUILD_CACHE", cache)
+    monkeypatch.setattr(build, "CARD_CACHE_ENABLED", True)
+    monkeypatch.setattr(build, "CARD_MEMORY_CACHE", None)
+    monkeypatch.setattr(build, "card_cache_stats", {"hits": 0, "misses": 0})
+    items = [{"title": f"Paper {number}", "_filename": f"paper-{number}"} for number in range(4)]
+    for item in items:
+        build.render_card_cached("paper", item, render)
+    assert build.card_cache_stats == {"hits": 0, "misses": 4}
+    
+    entries = {path.read_text(encoding="utf-8")[:len("<article>Paper 0")]: path for path in cache.own_files()}
+    now = time.time()
+    for title, age_days in (("<article>Paper 0", 40), ("<article>Paper 1", 5), ("<article>Paper 2", 1), ("<article>Paper 3", 10)):
+        os.utime(entries[title], (now - age_days * DAY, now - age_days * DAY))
+    build.render_card_cached("paper", items[3], render)  # A hit counts as use: Paper 3 is now the freshest
+    
+    # Paper 0 is past max_age_days; of the rest, the least recently used goes until two fit
+    assert cache.prune() == 2
+    assert [entries[f"<article>Paper {number}"].exists() for number in range(4)] == [False, False, True, True]
+    
+    build.card_cache_stats.update(hits=0, misses=0)
+    html = [build.render_card_cached("paper", item, render) for item in items]
+    assert html == [render(item) for item in items]
+    assert build.card_cache_stats == {"hits": 2, "misses": 2}
@@ -0,0 +1,28 @@
+import build
+
+
+def write_paper(directory, number, title):
+    (directory / f"paper-{number:02}.md").write_text(
+        f"---\ntitle: \"{title}\"\ndate: 2024-01-{number:02}\n---\n\nAbstract {number}.\n", encoding="utf-8",
+    )
+
+
+def test_editing_one_file_reparses_only_that_file(tmp_path, monkeypatch):
+    papers = tmp_path / "content" / "papers"
+    papers.mkdir(parents=True)
+    count = build.PARALLEL_MIN_ITEMS * 3
+    for number in range(1, count + 1):
+        write_paper(papers, number, f"Paper {number}")
+    monkeypatch.setattr(build, "CONTENT_DIR", tmp_path / "content")
+    monkeypatch.setattr(build, "BUILD_CACHE", build.BuildCache(tmp_path / "cache"))
+    monkeypatch.setattr(build, "parsed_content_cache", {})
+    assert len(build.load_content_files("papers")) == count
+    
+    # A fresh process: nothing parsed in memory, only the build cache is warm
+    monkeypatch.setattr(build, "BUILD_CACHE", build.BuildCache(tmp_path / "cache"))
+    monkeypatch.setattr(build, "parsed_content_cache", {})
+    write_paper(papers, 7, "Paper seven, revised")
+    items = {item["_filename"]: item for item in build.load_content_files("papers")}
+    assert build.BUILD_CACHE.summary() == f"frontmatter {count - 1}/{count}"
+    assert items["paper-07"]["title"] == "Paper seven, revised"
+    assert items["paper-08"]["_body"].strip() == "Abstract 8."
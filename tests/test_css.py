@@ -0,0 +1,43 @@
+import re
+from pathlib import Path
+
+import build
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def purge(css, html):
+    return build.purge_css(css, build.collect_used_selectors(html))
+
+
+def test_safelisted_classes_survive_purging():
+    css = ".is-open{display:block}.nav__link--active{color:red}.typing-cursor--blink{opacity:0}.unused{color:blue}"
+    assert purge(css, "<nav class='nav'></nav>") == (
+        ".is-open{display:block}.nav__link--active{color:red}.typing-cursor--blink{opacity:0}"
+    )
+
+
+def test_safelist_keeps_keyframes_of_safelisted_rules():
+    css = (
+        ".typing-cursor--blink{animation:blink 1s infinite}"
+        "@keyframes blink{50%{opacity:0}}"
+        "@keyframes unused{to{opacity:1}}"
+    )
+    assert purge(css, "<p></p>") == ".typing-cursor--blink{animation:blink 1s infinite}@keyframes blink{50%{opacity:0}}"
+
+
+def test_purge_drops_unused_selectors_and_keeps_used_ones():
+    css = "@media (min-width:40em){.card,.missing{margin:0}}#hero p{x:1}a[href]:hover{y:2}.gone>b{z:3}"
+    html = '<div id="hero" class="card"><p><a href="#">x</a></p></div>'
+    assert purge(css, html) == "@media (min-width:40em){.card{margin:0}}#hero p{x:1}a[href]:hover{y:2}"
+
+
+def test_safelist_covers_every_class_scripts_add():
+    added = set()
+    for script in (REPO_DIR / "scripts").glob("*.js"):
+        text = script.read_text(encoding="utf-8")
+        for arguments in re.findall(r"classList\.(?:add|toggle)\(([^)]*)\)", text):
+            added.update(re.findall(r"['\"]([\w-]+)['\"]", arguments))
+        added.update(re.findall(r"className\s*=\s*['\"]([\w-]+)['\"]", text))
+    assert added
+    assert added <= build.CSS_SAFELIST
@@ -0,0 +1,14 @@
+import os
+
+import build
+
+
+def test_rebuild_forwards_absolute_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    forwarded = build.daemon_build_args(
+        ["--rebuild", "--output", "dist", "--archive=out/site.zip", "--jobs", "2", "--delta", "/srv/delta.json", "--fingerprint"]
+    )
+    assert forwarded == [
+        "--output", os.path.join(tmp_path, "dist"), f"--archive={tmp_path / 'out' / 'site.zip'}",
+        "--jobs", "2", "--delta", "/srv/delta.json", "--fingerprint",
+    ]
@@ -0,0 +1,211 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+EXPORT_FLAGS = ["--output", "dist", "--optimize-css", "--fingerprint"]
+RESOURCE_TAG = re.compile(r"<(?:link|script|img|source)\b[^>]*>", re.IGNORECASE)
+RESOURCE_URL = re.compile(r'\s(?:href|src)="([^"]+)"', re.IGNORECASE)
+
+
+@pytest.fixture
+def site(tmp_path):
+    """A copy of the site sources to build in, with its own build cache."""
+    shutil.copytree(
+        REPO_DIR, tmp_path / "site",
+        ignore=shutil.ignore_patterns(
+            ".git", ".build-cache", ".pytest_cache", "__pycache__", "dist", "tests", "website-rl-*", "*.zip",
+        ),
+    )
+    return tmp_path / "site"
+
+
+def build(site, *args):
+    env = dict(os.environ, BUILD_CACHE_DIR=".build-cache")
+    result = subprocess.run(
+        [sys.executable, "build.py", *args], cwd=site, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def missing_resources(dist, cdn_base=None):
+    """Return (page, url) for every stylesheet, script or image a page loads that is not in dist."""
+    missing = []
+    for page in sorted(dist.rglob("*.html")):
+        for tag in RESOURCE_TAG.findall(page.read_text(encoding="utf-8")):
+            if re.search(r'\srel="(?:alternate|canonical|preconnect|dns-prefetch|prefetch|next|prev)"', tag):
+                continue
+            for url in RESOURCE_URL.findall(tag):
+                if cdn_base and url.startswith(cdn_base):
+                    target = dist / unquote(url[len(cdn_base):].split("#")[0].split("?")[0])
+                elif re.match(r"[a-z][a-z0-9+.-]*:|//|#", url, re.IGNORECASE):
+                    continue
+                else:
+                    target = page.parent / unquote(url.split("#")[0].split("?")[0])
+                if not target.is_file():
+                    missing.append((page.relative_to(dist).as_posix(), url))
+    return missing
+
+
+def edit_stylesheet(site):
+    with open(site / "styles" / "components.css", "a", encoding="utf-8") as f:
+        f.write("\n.paper-card { outline: 1px solid transparent; }\n")
+
+
+def test_rebuild_after_stylesheet_edit_keeps_links_valid(site):
+    build(site, *EXPORT_FLAGS)
+    assert missing_resources(site / "dist") == []
+    
+    edit_stylesheet(site)
+    build(site, *EXPORT_FLAGS)
+    dist = site / "dist"
+    assert missing_resources(dist) == []
+    assert len(list((dist / "styles").glob("site.*.css"))) == 1
+
+
+def test_fingerprinted_copies_follow_stylesheet_edits(site):
+    build(site, "--output", "dist", "--fingerprint")
+    edit_stylesheet(site)
+    build(site, "--output", "dist", "--fingerprint")
+    dist = site / "dist"
+    assert missing_resources(dist) == []
+    assert len(list((dist / "styles").glob("components.*.css"))) == 1
+    
+    # Preloads announced in _headers point at files that still exist
+    headers = (dist / "_headers").read_text(encoding="utf-8")
+    preloads = re.findall(r"Link: </([^>]+)>; rel=preload", headers)
+    assert preloads
+    assert [url for url in preloads if not (dist / unquote(url)).is_file()] == []
+
+
+def test_cdn_urls_and_integrity_follow_stylesheet_edits(site):
+    cdn_base = "https://cdn.example.com/site/"
+    flags = [*EXPORT_FLAGS, "--cdn-base", cdn_base]
+    build(site, *flags)
+    edit_stylesheet(site)
+    build(site, *flags)
+    dist = site / "dist"
+    assert missing_resources(dist, cdn_base) == []
+    
+    checked = 0
+    for page in dist.rglob("*.html"):
+        for tag in RESOURCE_TAG.findall(page.read_text(encoding="utf-8")):
+            integrity = re.search(r'\sintegrity="sha384-([^"]+)"', tag)
+            if not integrity:
+                continue
+            url = RESOURCE_URL.search(tag).group(1)
+            assert url.startswith(cdn_base)
+            data = (dist / unquote(url[len(cdn_base):])).read_bytes()
+            assert base64.b64encode(hashlib.sha384(data).digest()).decode("ascii") == integrity.group(1)
+            checked += 1
+    assert checked
+
+
+def test_svg_sprite_is_the_same_on_every_export(site):
+    build(site, "--output", "dist", "--svg-sprite")
+    dist = site / "dist"
+    [first] = (dist / "assets" / "icons").glob("sprite.*.svg")
+    sprite = first.read_text(encoding="utf-8")
+    build(site, "--output", "dist", "--svg-sprite")
+    assert list((dist / "assets" / "icons").glob("sprite.*.svg")) == [first]
+    
+    symbols = set(re.findall(r'<symbol id="([\w-]+)"', sprite))
+    for page in dist.rglob("*.html"):
+        for url in re.findall(r'<use href="([^"]+)"', page.read_text(encoding="utf-8")):
+            path, _, symbol = url.partition("#")
+            assert (page.parent / path).resolve() == first.resolve()
+            assert symbol in symbols
+
+
+def test_self_host_fonts_fails_clearly_without_fonts(site):
+    shutil.rmtree(site / "assets" / "fonts", ignore_errors=True)
+    result = subprocess.run(
+        [sys.executable, "build.py", "--output", "dist", "--self-host-fonts"], cwd=site, capture_output=True, text=True,
+    )
+    assert result.returncode == 2
+    assert "Error: --self-host-fonts needs" in result.stdout
+    assert not (site / "dist").exists()
+
+
+def test_deploy_delta_is_against_the_last_marked_deploy(site):
+    dist = site / "dist"
+    read_delta = lambda: json.loads((site / "delta.json").read_text(encoding="utf-8"))
+    build(site, "--output", "dist", "--delta", "delta.json")
+    assert read_delta()["base"] is None
+    assert not (dist / "deploy-delta.json").exists()
+    
+    # Built but never deployed: the next delta still has to upload everything
+    (site / "robots.txt").write_text("User-agent: *\nDisallow: /drafts/\n", encoding="utf-8")
+    build(site, "--output", "dist", "--delta", "delta.json")
+    assert read_delta()["base"] is None
+    assert "robots.txt" in read_delta()["added"]
+    
+    build(site, "--output", "dist", "--mark-deployed")
+    (site / "robots.txt").write_text("User-agent: *\n", encoding="utf-8")
+    build(site, "--output", "dist", "--delta", "delta.json")
+    delta = read_delta()
+    assert delta["base"] is not None
+    assert delta["added"] == [] and delta["deleted"] == []
+    assert "robots.txt" in delta["changed"]
+    
+    # Without --delta it stays in the build cache; it is never written into the output
+    build(site, "--output", "dist")
+    assert list((site / ".build-cache").glob("deploy-delta-*.json"))
+    assert not (dist / "deploy-delta.json").exists()
+    result = subprocess.run(
+        [sys.executable, "build.py", "--output", "dist", "--delta", "dist/delta.json"], cwd=site, capture_output=True, text=True,
+    )
+    assert result.returncode == 2 and "Error: --delta" in result.stdout
+
+
+def test_service_worker_serves_every_precached_asset_from_the_cache(site):
+    build(site, "--output", "dist", "--service-worker")
+    dist = site / "dist"
+    worker = (dist / "sw.js").read_text(encoding="utf-8")
+    version = re.search(r'const VERSION = "([0-9a-f]+)";', worker).group(1)
+    manifest = json.loads((dist / f"precache-manifest.{version}.json").read_text(encoding="utf-8"))
+    precached = json.loads(re.search(r"const PRECACHED = new Set\((.*)\);", worker).group(1))
+    assert any(url.startswith("styles/") for url in manifest["assets"])
+    assert precached == manifest["assets"]
+    assert all((dist / unquote(url)).is_file() for url in precached)
+
+
+def test_daemon_round_trip(site, tmp_path):
+    env = dict(os.environ, BUILD_CACHE_DIR=".build-cache")
+    daemon = subprocess.Popen(
+        [sys.executable, "build.py", "--daemon"], cwd=site, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not (site / ".build-cache" / "build.sock").exists():
+            assert daemon.poll() is None and time.monotonic() < deadline, "daemon did not start"
+            time.sleep(0.05)
+        
+        # Relative paths are resolved where --rebuild runs, whatever the daemon's directory
+        output = build(site, "--rebuild", "--output", "dist", "--archive", "../site.zip")
+        assert "Build complete!" in output and "daemon build took" in output
+        assert (site / "dist" / "papers.html").is_file()
+        assert (tmp_path / "site.zip").is_file()
+        
+        result = subprocess.run(
+            [sys.executable, "build.py", "--rebuild", "--serve"], cwd=site, env=env, capture_output=True, text=True,
+        )
+        assert result.returncode == 2 and "Error: daemon requests can only run builds" in result.stdout
+        
+        assert "Daemon stopping" in build(site, "--stop-daemon")
+        assert daemon.wait(timeout=30) == 0
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+            daemon.wait()
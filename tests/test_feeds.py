@@ -0,0 +1,43 @@
+import json
+import os
+
+import build
+
+
+def papers(count):
+    return build.sort_papers([
+        {"_filename": f"paper-{number:03}", "title": f"Paper {number}", "date": f"2024-01-{number % 28 + 1:02}", "_body": "Abstract."}
+        for number in range(count)
+    ])
+
+
+def test_json_feed_pages_and_cap():
+    items = [{"id": number} for number in range(7)]
+    files = build.render_json_feed("papers", "Papers", items, page_size=3, max_items=5)
+    assert list(files) == ["papers.json", "papers-2.json"]
+    first, second = (json.loads(files[name]) for name in files)
+    assert [item["id"] for item in first["items"]] == [0, 1, 2]
+    assert [item["id"] for item in second["items"]] == [3, 4]
+    assert first["pages"] == second["pages"] == 2 and first["total_items"] == 5
+    assert first["next_url"] == build.SITE_URL + "papers-2.json" and "next_url" not in second
+
+
+def test_unchanged_feeds_are_not_rewritten(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(build, "OUTPUT_DIR", tmp_path)
+    catalog = papers(build.FEED_PAGE_SIZE + 10)
+    build.build_feeds(catalog, [])
+    names = ["feed.xml", "papers.json", "papers-2.json", "projects.json"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(names)
+    assert "4 feed files written" in capsys.readouterr().out
+    for name in names:
+        os.utime(tmp_path / name, ns=(0, 0))
+    
+    build.build_feeds(catalog, [])
+    assert "0 feed files written" in capsys.readouterr().out
+    assert all((tmp_path / name).stat().st_mtime_ns == 0 for name in names)
+    
+    # A smaller catalog fits on one page: the second one is removed
+    build.build_feeds(catalog[:build.FEED_PAGE_SIZE], [])
+    assert not (tmp_path / "papers-2.json").exists()
+    assert json.loads((tmp_path / "papers.json").read_text(encoding="utf-8"))["pages"] == 1
+    assert (tmp_path / "projects.json").stat().st_mtime_ns == 0
@@ -0,0 +1,46 @@
+import struct
+
+import pytest
+
+import build
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def jpeg(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + bytes(9)
+    dht = b"\xff\xc4" + struct.pack(">H", 5) + bytes(3)  # 0xC4 is not a frame marker
+    sof2 = b"\xff\xc2" + struct.pack(">HBHHB", 11, 8, height, width, 1) + bytes(3)
+    return b"\xff\xd8" + app0 + dht + b"\xff\xff" + sof2 + b"\xff\xd9"
+
+
+def webp(chunk, payload):
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.mark.parametrize("data, size", [
+    (png(640, 480), (640, 480)),
+    (b"GIF89a" + struct.pack("<HH", 32, 16) + bytes(8), (32, 16)),
+    (jpeg(1920, 1080), (1920, 1080)),
+    (webp(b"VP8X", bytes(4) + (799).to_bytes(3, "little") + (599).to_bytes(3, "little")), (800, 600)),
+    (webp(b"VP8 ", b"\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 300 | 1 << 14, 200)), (300, 200)),
+    (webp(b"VP8L", b"\x2f" + (99 | 49 << 14).to_bytes(4, "little")), (100, 50)),
+    (b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg" width="24px" height="12.4">', (24, 12)),
+    (b'<svg viewBox="0,0 48 36" xmlns="http://www.w3.org/2000/svg"><path d=""/></svg>', (48, 36)),
+])
+def test_reads_intrinsic_size_from_headers(data, size):
+    assert tuple(build.read_image_size(data)) == size
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not an image at all",
+    b"\xff\xd8\xff\xe0" + struct.pack(">H", 16) + bytes(14),  # JPEG without a frame header
+    webp(b"ALPH", bytes(16)),
+    b'<svg width="100%" height="auto"></svg>',
+])
+def test_unreadable_images_have_no_size(data):
+    assert build.read_image_size(data) is None
@@ -0,0 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import build
+
+
+def test_run_pipeline_keeps_input_order():
+    items = list(range(build.PARALLEL_MIN_ITEMS * 5))
+    with ThreadPoolExecutor(4) as pool:
+        result = build.run_pipeline(items, (lambda x: x * 2, pool, 4), (str, None, 1), chunk_size=3, queue_size=2)
+    assert result == [str(x * 2) for x in items]
+
+
+def test_run_pipeline_inside_running_event_loop():
+    items = list(range(build.PARALLEL_MIN_ITEMS * 2))
+    
+    async def caller():
+        return build.run_pipeline(items, (lambda x: x + 1, None, 2))
+    
+    assert asyncio.run(caller()) == [x + 1 for x in items]
+
+
+def test_run_pipeline_propagates_errors():
+    def fail(x):
+        if x == 5:
+            raise ValueError("boom")
+        return x
+    
+    with pytest.raises(ValueError, match="boom"):
+        build.run_pipeline(range(build.PARALLEL_MIN_ITEMS * 2), (fail, None, 2), chunk_size=1, queue_size=1)
@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+import pytest
+
+import build
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """A site with one paper, rendered by the preview server from tmp_path."""
+    (tmp_path / "content" / "papers").mkdir(parents=True)
+    (tmp_path / "content" / "projects").mkdir()
+    write_paper(tmp_path, "First title")
+    (tmp_path / "robots.txt").write_text("User-agent: *\n", encoding="utf-8")
+    monkeypatch.setattr(build, "CONTENT_DIR", tmp_path / "content")
+    monkeypatch.setattr(build, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(build, "BUILD_CACHE", build.BuildCache(tmp_path / "cache"))
+    monkeypatch.setattr(build, "parsed_content_cache", {})
+    return tmp_path
+
+
+def write_paper(root, title, mtime=None):
+    path = root / "content" / "papers" / "one.md"
+    path.write_text(f"---\ntitle: \"{title}\"\ndate: 2024-01-01\n---\n\nAbstract.\n", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+async def fetch(port, path, **headers):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"GET {path} HTTP/1.1", "Host: localhost", "Connection: close"]
+    lines += [f"{name.replace('_', '-')}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), response_headers, body
+
+
+def test_preview_server_etags_and_reload(root):
+    async def scenario():
+        server, _ = await build.start_preview_server(port=0, site=build.PreviewSite(root, reload_interval=0))
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            status, headers, body = await fetch(port, "/papers.html")
+            assert status == 200 and b"First title" in body
+            etag = headers["ETag"]
+            assert etag.startswith('"') and not etag.startswith("W/")
+            assert (await fetch(port, "/papers.html", if_none_match=etag))[0] == 304
+            assert (await fetch(port, "/papers.html", if_none_match="W/" + etag))[0] == 304
+            
+            static_status, static_headers, static_body = await fetch(port, "/robots.txt")
+            assert static_status == 200 and static_body == b"User-agent: *\n"
+            assert (await fetch(port, "/robots.txt", if_none_match=static_headers["ETag"]))[0] == 304
+            
+            write_paper(root, "Second title", mtime=os.stat(root / "content" / "papers" / "one.md").st_mtime_ns + 10**9)
+            status, headers, body = await fetch(port, "/papers.html", if_none_match=etag)
+            assert status == 200 and b"Second title" in body
+            assert headers["ETag"] != etag
+    
+    asyncio.run(scenario())
+
+
+def test_missing_headers_file_is_remembered_until_the_next_check(root):
+    site = build.PreviewSite(root, reload_interval=3600)
+    assert site.hosting_headers("/robots.txt") == {}
+    (root / "_headers").write_text("/robots.txt\n  X-Robots-Tag: noindex\n", encoding="utf-8")
+    assert site.hosting_headers("/robots.txt") == {}
+    
+    site.reload_interval = 0
+    assert site.hosting_headers("/robots.txt") == {"X-Robots-Tag": "noindex"}
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+import build
+
+WORDS = [f"term{number}" for number in range(60)] + ["common", "everywhere"]
+
+
+def corpus(size, seed=7):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(size):
+        terms = {word: rng.randint(1, 4) for word in rng.sample(WORDS, 12)}
+        terms["common"] = 1
+        documents.append(terms)
+    # Exact duplicates score the same against every paper: ties go to the lower index
+    return documents + documents[:10]
+
+
+def test_postings_cap_only_bounds_very_common_terms():
+    rows, _ = build.tfidf_rows(corpus(150))
+    exact = build.top_similar_python(rows, 3, 0.05, max_postings=len(rows))
+    assert build.top_similar_python(rows, 3, 0.05) == exact
+    capped = build.top_similar_python(rows, 3, 0.05, max_postings=5)
+    assert len(capped) == len(exact) and capped != exact
+
+
+@pytest.mark.skipif(build.sparse is None, reason="needs numpy and scipy")
+@pytest.mark.parametrize("block_cells", [build.RELATED_BLOCK_CELLS, 1000])  # 1000: several row blocks
+def test_sparse_and_python_backends_agree(block_cells, monkeypatch):
+    monkeypatch.setattr(build, "RELATED_BLOCK_CELLS", block_cells)
+    rows, vocabulary_size = build.tfidf_rows(corpus(150))
+    expected = build.top_similar_python(rows, 3, 0.05)
+    result = build.top_similar_sparse(rows, vocabulary_size, 3, 0.05)
+    assert [[other for _, other in matches] for matches in result] == [[other for _, other in matches] for matches in expected]
+    for matches, expected_matches in zip(result, expected):
+        assert [score for score, _ in matches] == pytest.approx([score for score, _ in expected_matches])
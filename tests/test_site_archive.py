@@ -0,0 +1,73 @@
+import os
+import zipfile
+
+import pytest
+
+import build
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "BUILD_CACHE", build.BuildCache(tmp_path / "cache"))
+    root = tmp_path / "dist"
+    (root / "papers").mkdir(parents=True)
+    (root / "index.html").write_text("<p>hello</p>\n" * 200, encoding="utf-8")
+    (root / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4)
+    (root / "papers" / "café.bib").write_text("@misc{x}\n", encoding="utf-8")
+    return root
+
+
+NAMES = ["index.html", "logo.png", "papers/café.bib"]
+
+
+def test_archive_reads_back_with_fixed_metadata(site, tmp_path):
+    archive = build.SiteArchive(site)
+    archive.add(site / "index.html", (site / "index.html").read_bytes())
+    archive.add(tmp_path / "outside.txt", b"ignored")
+    assert archive.write(tmp_path / "site.zip", NAMES) == 2  # Two names read from disk
+    
+    with zipfile.ZipFile(tmp_path / "site.zip") as z:
+        assert z.testzip() is None
+        assert z.namelist() == NAMES
+        for info in z.infolist():
+            assert z.read(info) == (site / info.filename).read_bytes()
+            assert info.date_time == build.ARCHIVE_DATE_TIME
+            assert info.external_attr == 0o100644 << 16
+            assert info.flag_bits & 0x0800  # UTF-8 names
+        assert z.getinfo("index.html").compress_type == zipfile.ZIP_DEFLATED
+        assert z.getinfo("logo.png").compress_type == zipfile.ZIP_STORED
+
+
+def test_archive_bytes_do_not_depend_on_how_entries_arrived(site, tmp_path):
+    first = build.SiteArchive(site)
+    for name in reversed(NAMES):
+        first.add(site / name, (site / name).read_bytes())
+    first.write(tmp_path / "a.zip", NAMES)
+    
+    # Nothing added in memory, and every file touched since
+    for name in NAMES:
+        os.utime(site / name, (1_700_000_000, 1_700_000_000))
+    build.SiteArchive(site).write(tmp_path / "b.zip", NAMES)
+    
+    assert (tmp_path / "a.zip").read_bytes() == (tmp_path / "b.zip").read_bytes()
+    assert (tmp_path / "a.zip").read_bytes()[:4] == b"PK\x03\x04"
+
+
+def test_rewritten_files_are_compressed_once(site, tmp_path):
+    archive = build.SiteArchive(site)
+    for step in range(3):
+        archive.add(site / "index.html", f"<p>step {step}</p>\n".encode("utf-8") * 200)
+    archive.write(tmp_path / "site.zip", ["index.html"])
+    assert build.BUILD_CACHE.summary() == "deflate 0/1"
+    with zipfile.ZipFile(tmp_path / "site.zip") as z:
+        assert z.read("index.html") == b"<p>step 2</p>\n" * 200
+
+
+def test_archive_with_more_than_65535_entries(tmp_path):
+    archive = build.SiteArchive(tmp_path)
+    names = [f"icons/{number:05d}.png" for number in range(70000)]
+    archive.merge({name: b"" for name in names})
+    archive.write(tmp_path / "big.zip", names)
+    with zipfile.ZipFile(tmp_path / "big.zip") as z:
+        assert len(z.infolist()) == 70000
+        assert z.namelist()[-1] == names[-1]
@@ -0,0 +1,13 @@
+import build
+
+
+def test_stage_workers_do_not_start_nested_pools(tmp_path, monkeypatch):
+    for name in ("OUTPUT_DIR", "CARD_CACHE_ENABLED", "VIRTUAL_LIST_ENABLED", "SITE_ARCHIVE", "BUILD_CACHE", "CATALOG"):
+        monkeypatch.setattr(build, name, getattr(build, name))
+    monkeypatch.setattr(build, "BUILD_JOBS", 8)
+    monkeypatch.setattr(build, "stage_content", {})
+    
+    build.init_stage_worker((tmp_path, True, False, False, tmp_path / "cache", False), {"papers": []})
+    assert build.BUILD_JOBS == 1
+    assert build.OUTPUT_DIR == tmp_path
+    assert build.CATALOG is None